@@ -6,6 +6,7 @@ __email__ = "yevhenii+finpull@vasylevskyi.net"
 from .core.scraper import FinancialDataScraper
 from .core.data_models import FinancialData
 from .api import FinancialDataAPI
+from .async_api import AsyncFinancialDataAPI
 
 # Utility exports
 from .utils.compatibility import get_available_features
@@ -16,6 +17,7 @@ __all__ = [
     "FinancialDataScraper",
     "FinancialData",
     "FinancialDataAPI",
+    "AsyncFinancialDataAPI",
     
     # Utilities
     "get_available_features",
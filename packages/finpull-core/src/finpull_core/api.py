@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 
 from .core.scraper import FinancialDataScraper
 from .core.data_models import FinancialData
+from .core.scheduler import RefreshScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class FinancialDataAPI:
             storage_file: Custom storage file path
         """
         self.scraper = FinancialDataScraper(storage_file)
+        self.scheduler: Optional[RefreshScheduler] = None
         logger.info("FinancialDataAPI initialized")
     
     def add_ticker(self, ticker: str) -> Dict[str, Any]:
@@ -87,85 +89,76 @@ class FinancialDataAPI:
             logger.error(f"API get_data error: {e}")
             return {"success": False, "error": str(e)}
     
-    def refresh_data(self, ticker: Optional[str] = None) -> Dict[str, Any]:
+    def refresh_data(self, ticker: Optional[str] = None, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Refresh data for ticker(s)
         
         Args:
             ticker: Specific ticker to refresh (optional, None for all)
+            max_workers: Worker pool size for refreshing all tickers (optional)
             
         Returns:
-            Dictionary with success status and message
+            Dictionary with success status, message and per-ticker details
         """
         try:
-            self.scraper.refresh_data(ticker)
+            report = self.scraper.refresh_data(ticker, max_workers=max_workers)
+            if ticker:
+                result = report.get_result(ticker)
+                if result and not result.success:
+                    return {
+                        "success": False,
+                        "error": result.error,
+                        "ticker": ticker.upper()
+                    }
             message = f"Refreshed {ticker}" if ticker else "Refreshed all data"
             return {
                 "success": True, 
                 "message": message,
-                "ticker": ticker.upper() if ticker else None
+                "ticker": ticker.upper() if ticker else None,
+                **report.to_dict()
             }
         except Exception as e:
             logger.error(f"API refresh_data error: {e}")
             return {"success": False, "error": str(e)}
     
-    def refresh_data_with_progress(self, ticker: Optional[str] = None, progress_callback=None) -> Dict[str, Any]:
+    def refresh_data_with_progress(self, ticker: Optional[str] = None, progress_callback=None,
+                                   max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Refresh data for ticker(s) with progress callback
         
         Args:
             ticker: Specific ticker to refresh (optional, None for all)
             progress_callback: Function to call with progress updates (ticker, status)
+            max_workers: Worker pool size for refreshing all tickers (optional)
             
         Returns:
             Dictionary with success status and progress details
         """
         try:
+            report = self.scraper.refresh_data(ticker, max_workers=max_workers,
+                                               progress_callback=progress_callback)
             if ticker:
-                # Refresh single ticker
-                if progress_callback:
-                    progress_callback(ticker, "loading")
-                
-                self.scraper.refresh_data(ticker)
-                
-                if progress_callback:
-                    progress_callback(ticker, "complete")
-                
+                result = report.get_result(ticker)
+                if result and not result.success:
+                    return {
+                        "success": False,
+                        "error": result.error,
+                        "ticker": ticker.upper()
+                    }
                 return {
                     "success": True, 
                     "message": f"Refreshed {ticker}",
                     "ticker": ticker.upper()
                 }
-            else:
-                # Refresh all tickers
-                ticker_list = self.scraper.get_ticker_list()
-                results = {
-                    "success": True,
-                    "total": len(ticker_list),
-                    "completed": 0,
-                    "failed": 0,
-                    "details": []
-                }
-                
-                for tk in ticker_list:
-                    try:
-                        if progress_callback:
-                            progress_callback(tk, "loading")
-                        
-                        self.scraper.refresh_data(tk)
-                        results["completed"] += 1
-                        results["details"].append({"ticker": tk, "status": "success"})
-                        
-                        if progress_callback:
-                            progress_callback(tk, "complete")
-                    except Exception as e:
-                        results["failed"] += 1
-                        results["details"].append({"ticker": tk, "status": "error", "error": str(e)})
-                        
-                        if progress_callback:
-                            progress_callback(tk, "error")
-                
-                return results
+            
+            results = report.to_dict()
+            results["success"] = True
+            results["details"] = [
+                {"ticker": r.ticker, "status": "success"} if r.success
+                else {"ticker": r.ticker, "status": "error", "error": r.error}
+                for r in report.results
+            ]
+            return results
                 
         except Exception as e:
             logger.error(f"API refresh_data_with_progress error: {e}")
@@ -228,6 +221,33 @@ class FinancialDataAPI:
             logger.error(f"API get_stats error: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_history(self, ticker: str, field: str, start: Optional[str] = None,
+                    end: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the recorded history of a numeric field
+        
+        Args:
+            ticker: Stock ticker symbol
+            field: Numeric field name, e.g. "price" or "pe_ratio"
+            start: Earliest timestamp to include (ISO format, optional)
+            end: Latest timestamp to include (ISO format, optional)
+            
+        Returns:
+            Dictionary with success status and (timestamp, value) points
+        """
+        try:
+            points = self.scraper.get_history(ticker, field, start, end)
+            return {
+                "success": True,
+                "ticker": ticker.upper(),
+                "field": field,
+                "data": [{"timestamp": ts.isoformat(), "value": value} for ts, value in points],
+                "count": len(points)
+            }
+        except Exception as e:
+            logger.error(f"API get_history error for {ticker}: {e}")
+            return {"success": False, "error": str(e), "ticker": ticker.upper()}
+    
     def get_ticker_list(self) -> Dict[str, Any]:
         """
         Get list of tracked tickers
@@ -319,24 +339,26 @@ class FinancialDataAPI:
             "already_exists": []
         }
         
-        for ticker in tickers:
-            try:
-                if self.scraper.has_ticker(ticker):
-                    results["already_exists"].append(ticker.upper())
-                elif self.scraper.add_ticker(ticker):
-                    results["added"].append(ticker.upper())
-                else:
-                    results["already_exists"].append(ticker.upper())
-            except ValueError as e:
-                results["failed"].append({
-                    "ticker": ticker.upper(),
-                    "error": f"Invalid ticker: {str(e)}"
-                })
-            except Exception as e:
-                results["failed"].append({
-                    "ticker": ticker.upper(),
-                    "error": str(e)
-                })
+        # Save once at the end instead of after every ticker
+        with self.scraper.storage.batch():
+            for ticker in tickers:
+                try:
+                    if self.scraper.has_ticker(ticker):
+                        results["already_exists"].append(ticker.upper())
+                    elif self.scraper.add_ticker(ticker):
+                        results["added"].append(ticker.upper())
+                    else:
+                        results["already_exists"].append(ticker.upper())
+                except ValueError as e:
+                    results["failed"].append({
+                        "ticker": ticker.upper(),
+                        "error": f"Invalid ticker: {str(e)}"
+                    })
+                except Exception as e:
+                    results["failed"].append({
+                        "ticker": ticker.upper(),
+                        "error": str(e)
+                    })
         
         results["summary"] = {
             "total": len(tickers),
@@ -345,4 +367,52 @@ class FinancialDataAPI:
             "already_exists_count": len(results["already_exists"])
         }
         
-        return results 
\ No newline at end of file
+        return results
+    
+    def start_scheduler(self, interval_minutes: float = 60, max_rate: Optional[float] = None,
+                        max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Keep data fresh in the background, refreshing each ticker when it is due
+        
+        Args:
+            interval_minutes: Age at which a ticker's data is refreshed
+            max_rate: Tickers refreshed per second at most (optional)
+            max_workers: Refresh worker pool size (optional)
+            
+        Returns:
+            Dictionary with success status and scheduler status
+        """
+        try:
+            if self.scheduler is not None and self.scheduler.is_running():
+                return {"success": False, "error": "Scheduler is already running",
+                        "scheduler": self.scheduler.get_stats()}
+            self.scheduler = RefreshScheduler(self.scraper, interval=interval_minutes * 60,
+                                              max_rate=max_rate, max_workers=max_workers)
+            self.scheduler.start()
+            return {"success": True, "message": "Scheduler started", "scheduler": self.scheduler.get_stats()}
+        except Exception as e:
+            logger.error(f"API start_scheduler error: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def stop_scheduler(self) -> Dict[str, Any]:
+        """
+        Stop the background scheduler after its current run
+        
+        Returns:
+            Dictionary with success status
+        """
+        if self.scheduler is None or not self.scheduler.is_running():
+            return {"success": False, "error": "Scheduler is not running"}
+        self.scheduler.stop()
+        return {"success": True, "message": "Scheduler stopped", "scheduler": self.scheduler.get_stats()}
+    
+    def get_scheduler_status(self) -> Dict[str, Any]:
+        """
+        Get the scheduler queue and run statistics
+        
+        Returns:
+            Dictionary with scheduler statistics
+        """
+        if self.scheduler is None:
+            return {"success": True, "scheduler": None}
+        return {"success": True, "scheduler": self.scheduler.get_stats()}
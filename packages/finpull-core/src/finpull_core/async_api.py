@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from .core.scraper import FinancialDataScraper
+from .core.async_sources import AsyncDataSourceManager
+from .core.negative_cache import TickerNotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFinancialDataAPI:
+
+    def __init__(self, storage_file: Optional[str] = None, max_concurrency: int = 100,
+                 source_concurrency: Optional[Dict[str, int]] = None):
+        """
+        Initialize the async API
+
+        Args:
+            storage_file: Custom storage file path
+            max_concurrency: Maximum number of ticker fetches in flight at once
+            source_concurrency: Per-source limit on in-flight requests
+        """
+        self.scraper = FinancialDataScraper(storage_file)
+        self.data_source = AsyncDataSourceManager(source_concurrency, max_connections=max_concurrency)
+        self.max_concurrency = max(1, max_concurrency)
+        logger.info("AsyncFinancialDataAPI initialized")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Release network resources"""
+        await self.data_source.close()
+
+    async def _gather_bounded(self, coros):
+        """Run coroutines concurrently, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(run(c) for c in coros))
+
+    async def add_ticker(self, ticker: str) -> Dict[str, Any]:
+        """
+        Add ticker and return result
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Dictionary with success status and message/error
+        """
+        if not self.scraper.validate_ticker(ticker):
+            return {
+                "success": False,
+                "error": f"Invalid ticker: '{ticker}' is not a valid ticker symbol",
+                "ticker": ticker.upper()
+            }
+
+        storage = self.scraper.storage
+        if not storage.has_ticker(ticker):
+            try:
+                self.scraper.check_not_found(ticker)
+            except TickerNotFoundError as e:
+                return {"success": False, "error": str(e), "ticker": ticker.upper()}
+
+        with storage.batch():
+            if not storage.add_ticker(ticker):
+                return {
+                    "success": False,
+                    "message": f"{ticker} already exists",
+                    "ticker": ticker.upper()
+                }
+
+            try:
+                data = await self.data_source.fetch_data(ticker)
+                storage.update_cache(ticker, data)
+                return {
+                    "success": True,
+                    "message": f"Added {ticker}",
+                    "ticker": ticker.upper()
+                }
+            except Exception as e:
+                logger.error(f"API add_ticker error for {ticker}: {e}")
+                storage.remove_ticker(ticker)  # Remove if we can't fetch data
+                if isinstance(e, TickerNotFoundError):
+                    self.scraper.negative_cache.add(ticker, str(e))
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "ticker": ticker.upper()
+                }
+
+    async def get_data(self, ticker: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get cached data for specific ticker or all tickers
+
+        Args:
+            ticker: Specific ticker symbol (optional)
+
+        Returns:
+            Dictionary with success status and data
+        """
+        try:
+            if ticker:
+                data = self.scraper.get_ticker_data(ticker)
+                return {
+                    "success": True,
+                    "data": data.to_dict() if data else None,
+                    "ticker": ticker.upper()
+                }
+            data_list = self.scraper.get_all_data()
+            return {
+                "success": True,
+                "data": [d.to_dict() for d in data_list],
+                "count": len(data_list)
+            }
+        except Exception as e:
+            logger.error(f"API get_data error: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def _refresh_one(self, ticker: str) -> Dict[str, Any]:
+        """Refresh a single ticker and return its detail entry"""
+        try:
+            data = await self.data_source.fetch_data(ticker)
+            self.scraper.storage.update_cache(ticker, data)
+            return {"ticker": ticker, "status": "success"}
+        except Exception as e:
+            logger.error(f"Failed to refresh {ticker}: {e}")
+            return {"ticker": ticker, "status": "error", "error": str(e)}
+
+    async def refresh_data(self, ticker: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Refresh data for ticker(s) concurrently
+
+        Args:
+            ticker: Specific ticker to refresh (optional, None for all)
+
+        Returns:
+            Dictionary with success status and per-ticker details
+        """
+        try:
+            if ticker:
+                detail = await self._refresh_one(ticker.upper().strip())
+                if detail["status"] == "error":
+                    return {"success": False, "error": detail["error"], "ticker": ticker.upper()}
+                return {"success": True, "message": f"Refreshed {ticker}", "ticker": ticker.upper()}
+
+            tickers = self.scraper.get_ticker_list()
+            with self.scraper.storage.batch():
+                details = await self._gather_bounded([self._refresh_one(t) for t in tickers])
+            failed = sum(1 for d in details if d["status"] == "error")
+            return {
+                "success": True,
+                "message": "Refreshed all data",
+                "total": len(tickers),
+                "completed": len(tickers) - failed,
+                "failed": failed,
+                "details": details
+            }
+        except Exception as e:
+            logger.error(f"API refresh_data error: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def remove_ticker(self, ticker: str) -> Dict[str, Any]:
+        """
+        Remove ticker from tracking
+
+        Args:
+            ticker: Ticker symbol to remove
+
+        Returns:
+            Dictionary with success status and message
+        """
+        try:
+            self.scraper.remove_ticker(ticker)
+            return {
+                "success": True,
+                "message": f"Removed {ticker}",
+                "ticker": ticker.upper()
+            }
+        except Exception as e:
+            logger.error(f"API remove_ticker error for {ticker}: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scraper statistics
+
+        Returns:
+            Dictionary with statistics
+        """
+        try:
+            return {"success": True, "stats": self.scraper.get_stats()}
+        except Exception as e:
+            logger.error(f"API get_stats error: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def get_ticker_list(self) -> Dict[str, Any]:
+        """
+        Get list of tracked tickers
+
+        Returns:
+            Dictionary with ticker list
+        """
+        tickers = self.scraper.get_ticker_list()
+        return {
+            "success": True,
+            "tickers": tickers,
+            "count": len(tickers)
+        }
+
+    async def batch_add_tickers(self, tickers: List[str]) -> Dict[str, Any]:
+        """
+        Add multiple tickers concurrently
+
+        Args:
+            tickers: List of ticker symbols
+
+        Returns:
+            Dictionary with batch operation results
+        """
+        results = {
+            "success": True,
+            "added": [],
+            "failed": [],
+            "already_exists": []
+        }
+
+        pending = []
+        for ticker in tickers:
+            if self.scraper.has_ticker(ticker):
+                results["already_exists"].append(ticker.upper())
+            else:
+                pending.append(ticker)
+
+        with self.scraper.storage.batch():
+            outcomes = await self._gather_bounded([self.add_ticker(t) for t in pending])
+
+        for ticker, outcome in zip(pending, outcomes):
+            if outcome["success"]:
+                results["added"].append(ticker.upper())
+            elif "error" in outcome:
+                results["failed"].append({"ticker": ticker.upper(), "error": outcome["error"]})
+            else:
+                results["already_exists"].append(ticker.upper())
+
+        results["summary"] = {
+            "total": len(tickers),
+            "added_count": len(results["added"]),
+            "failed_count": len(results["failed"]),
+            "already_exists_count": len(results["already_exists"])
+        }
+
+        return results
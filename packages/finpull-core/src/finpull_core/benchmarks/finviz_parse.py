@@ -0,0 +1,131 @@
+"""
+Finviz parsing micro-benchmark
+
+Parses saved quote pages with every available parser backend and compares the
+per-ticker CPU time against building a full html.parser tree of the page.
+
+Usage:
+    python -m finpull_core.benchmarks.finviz_parse [--fixtures DIR] [--runs 20] [--json]
+
+DIR holds saved quote pages named <TICKER>.html. Without it, synthetic pages
+with the Finviz layout are generated.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..core.finviz_parser import FinvizParser, FIELD_MAPPING, available_backends
+from ..core.replay import synthetic_quote_page
+
+BASELINE = "full-tree"
+
+
+def _parse_full_tree(ticker: str, html: str):
+    """Baseline: a complete html.parser tree of the page, searched for the same elements"""
+    from bs4 import BeautifulSoup
+    from ..core.finviz_parser import _snapshot_metrics
+    from ..core.data_models import FinancialData
+
+    soup = BeautifulSoup(html, "html.parser")
+    data = FinancialData(ticker=ticker.upper())
+    company_tag = soup.find("h2", class_="quote-header_ticker-wrapper_company")
+    if company_tag:
+        data.company_name = company_tag.get_text(strip=True)
+    price_tag = soup.find("strong", class_="quote-price_wrapper_price")
+    if price_tag:
+        data.price = price_tag.get_text(strip=True)
+    sector_div = soup.find("div", class_="flex space-x-0.5 overflow-hidden")
+    if sector_div and sector_div.find_all("a"):
+        data.sector = sector_div.find_all("a")[0].get_text(strip=True)
+    table = soup.find("table", class_="snapshot-table2")
+    if table:
+        metrics = _snapshot_metrics([[c.get_text(strip=True) for c in row.find_all("td")]
+                                     for row in table.find_all("tr")])
+        for finviz_key, data_field in FIELD_MAPPING.items():
+            if finviz_key in metrics:
+                setattr(data, data_field, metrics[finviz_key])
+    return data
+
+
+def load_fixtures(directory: Optional[str] = None, count: int = 10) -> List[Tuple[str, str]]:
+    """Load (ticker, html) pairs from DIR/<TICKER>.html, or generate synthetic pages"""
+    if directory is None:
+        return [(f"SYN{i}", synthetic_quote_page(f"SYN{i}", i)) for i in range(count)]
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                fixtures.append((name[:-5].upper(), f.read()))
+    if not fixtures:
+        raise ValueError(f"No .html fixture pages found in {directory}")
+    return fixtures
+
+
+def run_benchmark(fixtures: List[Tuple[str, str]], runs: int = 20) -> Dict[str, Any]:
+    """
+    Time every backend on the fixture pages
+
+    Returns:
+        Dictionary with per-ticker CPU milliseconds per backend, the speedup over
+        the full-tree baseline, and whether each backend matches the baseline output
+    """
+    parsers = {BASELINE: _parse_full_tree}
+    for backend in available_backends():
+        parsers[backend] = FinvizParser(backend).parse
+
+    expected = {ticker: _parse_full_tree(ticker, html).to_dict() for ticker, html in fixtures}
+    results = {}
+    for name, parse in parsers.items():
+        samples = []
+        for _ in range(runs):
+            start = time.process_time()
+            for ticker, html in fixtures:
+                parse(ticker, html)
+            samples.append((time.process_time() - start) / len(fixtures))
+        matches = all(
+            {k: v for k, v in parse(ticker, html).to_dict().items() if k != 'timestamp'} ==
+            {k: v for k, v in expected[ticker].items() if k != 'timestamp'}
+            for ticker, html in fixtures
+        )
+        results[name] = {'ms_per_ticker': statistics.median(samples) * 1000, 'matches_baseline': matches}
+
+    baseline = results[BASELINE]['ms_per_ticker']
+    for result in results.values():
+        result['speedup'] = baseline / result['ms_per_ticker'] if result['ms_per_ticker'] else None
+
+    return {
+        'fixtures': len(fixtures),
+        'page_kb': statistics.mean(len(html) for _, html in fixtures) / 1024,
+        'runs': runs,
+        'default_backend': FinvizParser().backend,
+        'backends': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Finviz page parsing")
+    parser.add_argument('--fixtures', help="Directory of saved quote pages (<TICKER>.html)")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(load_fixtures(args.fixtures), args.runs)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"{result['fixtures']} pages, {result['page_kb']:.0f} KB average, "
+          f"default backend: {result['default_backend']}")
+    for name, stats in result['backends'].items():
+        note = "" if stats['matches_baseline'] else "  (output differs from baseline)"
+        print(f"  {name:<12} {stats['ms_per_ticker']:8.2f} ms/ticker  {stats['speedup']:5.1f}x{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
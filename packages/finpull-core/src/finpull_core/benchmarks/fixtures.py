@@ -0,0 +1,40 @@
+"""
+Synthetic fixture generator for offline load tests
+
+Writes Finviz quote pages and Yahoo balance sheets in the layout read by
+ReplaySource, so the refresh pipeline can run without network access.
+
+Usage:
+    python -m finpull_core.benchmarks.fixtures DIR [--count 10000] [--filler 10] [--seed 0]
+
+Replay them with:
+    FINPULL_REPLAY_DIR=DIR FINPULL_REPLAY_LATENCY=0.05 finpull refresh
+"""
+
+import sys
+import time
+import argparse
+from typing import List, Optional
+
+from ..core.replay import generate_fixtures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic replay fixtures")
+    parser.add_argument('directory', help="Fixture directory")
+    parser.add_argument('--count', type=int, default=10000, help="Number of tickers")
+    parser.add_argument('--filler', type=int, default=10,
+                        help="Page filler (10 gives ~18 KB pages, 100 gives ~100 KB pages)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-yahoo', action='store_true', help="Only write Finviz pages")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tickers = generate_fixtures(args.directory, args.count, args.seed, args.filler, not args.no_yahoo)
+    print(f"Wrote fixtures for {len(tickers)} tickers ({tickers[0]}..{tickers[-1]}) to "
+          f"{args.directory} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Cold-start import time benchmark
+
+Imports a module in fresh interpreters and fails when the median import time
+exceeds the budget or when heavy optional dependencies are loaded eagerly.
+
+Usage:
+    python -m finpull_core.benchmarks.import_time [--module finpull.__main__] [--budget 0.25]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List, Optional
+
+# Optional dependencies that must only be imported on first use
+HEAVY_MODULES = ('requests', 'bs4', 'yfinance', 'pandas', 'numpy', 'openpyxl', 'tkinter', 'aiohttp', 'sqlite3',
+                 'lxml', 'selectolax')
+
+# Median cold import budget in seconds (overridable with FINPULL_IMPORT_BUDGET)
+DEFAULT_BUDGET = 0.25
+
+_PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def measure_import(module: str = "finpull_core", runs: int = 5) -> Dict[str, Any]:
+    """
+    Measure how long importing a module takes in fresh interpreters
+
+    Args:
+        module: Module to import
+        runs: Number of interpreter launches
+
+    Returns:
+        Dictionary with median/min/max seconds and heavy modules that were loaded
+    """
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    timings = []
+    loaded = set()
+    for _ in range(max(1, runs)):
+        output = subprocess.run([sys.executable, "-c", probe], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        timings.append(sample['elapsed'])
+        loaded.update(sample['loaded'])
+
+    return {
+        'module': module,
+        'runs': len(timings),
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'heavy_modules': sorted(loaded),
+    }
+
+
+def check_budget(result: Dict[str, Any], budget: float) -> List[str]:
+    """Get the list of budget violations for a measurement"""
+    problems = []
+    if result['median'] > budget:
+        problems.append(f"median import time {result['median'] * 1000:.0f}ms exceeds budget of {budget * 1000:.0f}ms")
+    if result['heavy_modules']:
+        problems.append(f"heavy modules imported eagerly: {', '.join(result['heavy_modules'])}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the cold-start import time of FinPull")
+    parser.add_argument('--module', default='finpull_core', help='Module to import (default: finpull_core)')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to launch')
+    parser.add_argument('--budget', type=float,
+                        default=float(os.getenv('FINPULL_IMPORT_BUDGET', DEFAULT_BUDGET)),
+                        help='Median import time budget in seconds')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.module, args.runs)
+    problems = check_budget(result, args.budget)
+
+    if args.json:
+        print(json.dumps({**result, 'budget': args.budget, 'passed': not problems}, indent=2))
+    else:
+        print(f"import {result['module']}: median {result['median'] * 1000:.0f}ms "
+              f"(min {result['min'] * 1000:.0f}ms, max {result['max'] * 1000:.0f}ms, {result['runs']} runs)")
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        if not problems:
+            print(f"OK: within {args.budget * 1000:.0f}ms budget")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
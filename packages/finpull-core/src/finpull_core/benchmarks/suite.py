@@ -0,0 +1,370 @@
+"""
+Benchmark suite for the fetch, parse, storage and export hot paths
+
+Runs every scenario on synthetic data at several universe sizes and writes the
+timings as JSON, so results from two releases can be compared.
+
+Usage:
+    python -m finpull_core.benchmarks.suite [--sizes 100,1000,10000,50000]
+        [--scenarios parse,storage,...] [--output results.json] [--compare baseline.json]
+
+The full package also exposes it as `finpull bench`, which adds the GUI row
+building scenario.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+from .. import __version__
+from ..core.data_models import FinancialData
+from ..utils.compatibility import HAS_OPENPYXL
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+
+# Entries slower than the baseline by more than this factor are reported as regressions
+REGRESSION_THRESHOLD = 1.25
+
+SECTORS = ("Technology", "Healthcare", "Financial", "Energy", "Industrials", "Consumer Cyclical")
+
+# Distinct pages parsed by the parse scenario; larger sizes cycle through them
+PARSE_POOL = 50
+
+# Largest universe the replay scenario writes fixture files for (about 11 KB per ticker)
+REPLAY_MAX_SIZE = 10000
+
+# Converts a FinancialData into the values of one display row
+RowBuilder = Callable[[FinancialData], List[str]]
+
+
+def synthetic_records(count: int, seed: int = 0) -> List[FinancialData]:
+    """Generate FinancialData records with realistic display values"""
+    from ..core.replay import synthetic_ticker
+
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        ticker = synthetic_ticker(i)
+        records.append(FinancialData(
+            ticker=ticker,
+            company_name=f"{ticker} Holdings Inc.",
+            sector=rng.choice(SECTORS),
+            price=f"{rng.uniform(5, 900):.2f}",
+            change_5y=f"{rng.uniform(-80, 400):.2f}%",
+            dividend_yield=f"{rng.uniform(0, 6):.2f}%",
+            dividend_ttm=f"{rng.uniform(0, 5):.2f}",
+            eps_ttm=f"{rng.uniform(-5, 30):.2f}",
+            eps_next_year=f"{rng.uniform(-5, 35):.2f}",
+            eps_next_5y=f"{rng.uniform(-10, 40):.2f}%",
+            revenue=f"{rng.uniform(0.1, 500):.2f}B",
+            revenue_growth_5y=f"{rng.uniform(-20, 60):.2f}%",
+            operating_margin=f"{rng.uniform(-30, 50):.2f}%",
+            profit_margin=f"{rng.uniform(-30, 40):.2f}%",
+            roa=f"{rng.uniform(-10, 30):.2f}%",
+            roe=f"{rng.uniform(-20, 80):.2f}%",
+            roi=f"{rng.uniform(-20, 60):.2f}%",
+            pe_ratio=f"{rng.uniform(3, 120):.2f}" if rng.random() > 0.1 else "N/A",
+            ps_ratio=f"{rng.uniform(0.2, 30):.2f}",
+            pb_ratio=f"{rng.uniform(0.3, 60):.2f}",
+            total_assets=str(rng.uniform(1e8, 3e12)),
+            total_liabilities=str(rng.uniform(1e7, 2e12)),
+            market_cap=f"{rng.uniform(0.05, 3000):.2f}B",
+            volume=f"{rng.randint(10000, 90000000):,}",
+            avg_volume=f"{rng.uniform(0.01, 90):.2f}M",
+            beta=f"{rng.uniform(0.2, 2.5):.2f}",
+        ))
+    return records
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of fn over repeat runs, in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+class BenchmarkSuite:
+    """Runs the benchmark scenarios in a scratch directory"""
+
+    def __init__(self, sizes=DEFAULT_SIZES, repeat: int = 3, row_builder: Optional[RowBuilder] = None,
+                 workdir: Optional[str] = None):
+        """
+        Initialize the suite
+
+        Args:
+            sizes: Universe sizes (number of tickers) to run every scenario at
+            repeat: Runs per measurement; the median is reported
+            row_builder: Function building one GUI display row, enables the display_rows scenario
+            workdir: Scratch directory (default: a temporary directory removed afterwards)
+        """
+        self.sizes = list(sizes)
+        self.repeat = repeat
+        self.row_builder = row_builder
+        self.workdir = workdir
+        self.results: List[Dict[str, Any]] = []
+        self.scenarios: Dict[str, Callable[[int, List[FinancialData], str], None]] = {
+            "parse": self.bench_parse,
+            "replay_refresh": self.bench_replay_refresh,
+            "storage": self.bench_storage,
+            "get_all_data": self.bench_get_all_data,
+            "export": self.bench_export,
+            "performance_summary": self.bench_performance_summary,
+        }
+        if row_builder is not None:
+            self.scenarios["display_rows"] = self.bench_display_rows
+
+    def _record(self, scenario: str, size: int, seconds: float, variant: Optional[str] = None):
+        result = {
+            'scenario': scenario,
+            'variant': variant,
+            'size': size,
+            'seconds': seconds,
+            'per_ticker_us': seconds / size * 1e6,
+        }
+        self.results.append(result)
+        label = f"{scenario}[{variant}]" if variant else scenario
+        print(f"  {label:<32} {size:>7} tickers  {seconds * 1000:10.1f} ms  "
+              f"{result['per_ticker_us']:9.1f} us/ticker", file=sys.stderr)
+
+    def bench_parse(self, size: int, records: List[FinancialData], workdir: str):
+        """Finviz page parsing with the default parser backend"""
+        from ..core.finviz_parser import FinvizParser
+        from ..core.replay import synthetic_quote_page, synthetic_ticker
+
+        parser = FinvizParser()
+        pages = [(synthetic_ticker(i), synthetic_quote_page(synthetic_ticker(i), i))
+                 for i in range(min(size, PARSE_POOL))]
+
+        def run():
+            for i in range(size):
+                ticker, html = pages[i % len(pages)]
+                parser.parse(ticker, html)
+
+        self._record("parse", size, _timed(run, 1), parser.backend)
+
+    def bench_replay_refresh(self, size: int, records: List[FinancialData], workdir: str):
+        """Full refresh of every ticker through the fetch pipeline, replaying generated fixtures"""
+        from ..core.replay import generate_fixtures
+        from ..core.async_sources import AsyncDataSourceManager
+
+        if size > REPLAY_MAX_SIZE:
+            print(f"  replay_refresh skipped at {size} tickers (limit {REPLAY_MAX_SIZE})", file=sys.stderr)
+            return
+
+        fixtures = os.path.join(workdir, "fixtures")
+        tickers = generate_fixtures(fixtures, size, filler=2)
+
+        async def refresh():
+            async with AsyncDataSourceManager() as manager:
+                manager.use_replay(fixtures)
+                await asyncio.gather(*(manager.fetch_data(ticker) for ticker in tickers))
+
+        self._record("replay_refresh", size, _timed(lambda: asyncio.run(refresh()), 1), "async")
+
+    def bench_storage(self, size: int, records: List[FinancialData], workdir: str):
+        """DataStorage.save_data and load_data for every backend"""
+        from ..core.storage import DataStorage
+
+        for backend, extension in (("json", "json"), ("journal", "json"), ("sqlite", "db")):
+            path = os.path.join(workdir, f"storage_{backend}_{size}.{extension}")
+            storage = DataStorage(path, backend=backend)
+            storage.tickers_list = [data.ticker for data in records]
+            storage.data_cache = {data.ticker: data for data in records}
+
+            self._record("storage_save", size, _timed(storage.save_data, self.repeat), backend)
+            self._record("storage_load", size, _timed(storage.load_data, self.repeat), backend)
+            storage.close()
+
+            reader = DataStorage(path, backend=backend, read_only=True)
+            self._record("storage_load", size, _timed(reader.load_data, self.repeat), f"{backend}-read-only")
+            reader.close()
+
+    def _scraper(self, records: List[FinancialData], workdir: str):
+        from ..core.scraper import FinancialDataScraper
+
+        scraper = FinancialDataScraper(os.path.join(workdir, f"scraper_{len(records)}.json"))
+        scraper.storage.tickers_list = [data.ticker for data in records]
+        scraper.storage.data_cache = {data.ticker: data for data in records}
+        return scraper
+
+    def bench_get_all_data(self, size: int, records: List[FinancialData], workdir: str):
+        """FinancialDataScraper.get_all_data on a loaded universe"""
+        scraper = self._scraper(records, workdir)
+        self._record("get_all_data", size, _timed(scraper.get_all_data, self.repeat))
+
+    def bench_export(self, size: int, records: List[FinancialData], workdir: str):
+        """CSV, JSON and (when openpyxl is installed) Excel export"""
+        scraper = self._scraper(records, workdir)
+        storage = scraper.storage
+        csv_file = os.path.join(workdir, "export.csv")
+        json_file = os.path.join(workdir, "export.json")
+        self._record("export", size, _timed(lambda: storage.export_to_csv(csv_file), self.repeat), "csv")
+        self._record("export", size, _timed(lambda: storage.export_to_json(json_file), self.repeat), "json")
+
+        if HAS_OPENPYXL:
+            from ..utils.export import ExcelExporter
+
+            xlsx_file = os.path.join(workdir, "export.xlsx")
+            exporter = ExcelExporter()
+            self._record("export", size, _timed(lambda: exporter.export_data(records, xlsx_file), 1), "xlsx")
+
+    def bench_performance_summary(self, size: int, records: List[FinancialData], workdir: str):
+        """get_ticker_performance_summary over the universe, and over a table kept in sync"""
+        from ..core.table import FinancialTable
+        from ..utils.batch import get_ticker_performance_summary, get_table_performance_summary
+
+        self._record("performance_summary", size,
+                     _timed(lambda: get_ticker_performance_summary(records), self.repeat))
+        table = FinancialTable(records)
+        self._record("performance_summary", size,
+                     _timed(lambda: get_table_performance_summary(table), self.repeat), "table")
+
+    def bench_display_rows(self, size: int, records: List[FinancialData], workdir: str):
+        """Building the display row of every ticker, as a full GUI refresh does"""
+        scraper = self._scraper(records, workdir)
+        build = self.row_builder
+        self._record("display_rows", size,
+                     _timed(lambda: [build(data) for data in scraper.get_all_data()], self.repeat))
+
+    def run(self, scenarios: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run the selected scenarios (default: all) at every size
+
+        Returns:
+            Dictionary with environment metadata and one result per measurement
+        """
+        names = scenarios or list(self.scenarios)
+        unknown = [name for name in names if name not in self.scenarios]
+        if unknown:
+            raise ValueError(f"Unknown scenario: {', '.join(unknown)}. "
+                             f"Available scenarios: {', '.join(self.scenarios)}")
+
+        # Keep benchmark writes out of the user's history directory
+        previous_history = os.environ.get('FINPULL_HISTORY')
+        os.environ['FINPULL_HISTORY'] = '0'
+        workdir = self.workdir or tempfile.mkdtemp(prefix="finpull-bench-")
+        os.makedirs(workdir, exist_ok=True)
+        try:
+            for size in self.sizes:
+                records = synthetic_records(size)
+                for name in names:
+                    scenario_dir = os.path.join(workdir, f"{name}_{size}")
+                    os.makedirs(scenario_dir, exist_ok=True)
+                    self.scenarios[name](size, records, scenario_dir)
+                    shutil.rmtree(scenario_dir, ignore_errors=True)
+        finally:
+            if previous_history is None:
+                os.environ.pop('FINPULL_HISTORY', None)
+            else:
+                os.environ['FINPULL_HISTORY'] = previous_history
+            if self.workdir is None:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        return {
+            'finpull_version': __version__,
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': self.sizes,
+            'repeat': self.repeat,
+            'results': self.results,
+        }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare two result files measurement by measurement
+
+    Returns:
+        One entry per measurement present in both, with the time ratio
+        (current / baseline) and whether it exceeds the threshold
+    """
+    def key(result):
+        return result['scenario'], result['variant'], result['size']
+
+    previous = {key(result): result for result in baseline.get('results', [])}
+    comparison = []
+    for result in current['results']:
+        before = previous.get(key(result))
+        if before is None or not before['seconds']:
+            continue
+        ratio = result['seconds'] / before['seconds']
+        comparison.append({
+            'scenario': result['scenario'],
+            'variant': result['variant'],
+            'size': result['size'],
+            'baseline_seconds': before['seconds'],
+            'seconds': result['seconds'],
+            'ratio': ratio,
+            'regression': ratio > threshold,
+        })
+    return comparison
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the benchmark options to an argument parser"""
+    parser.add_argument('--sizes', default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated universe sizes (default: %(default)s)")
+    parser.add_argument('--scenarios', help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (median reported)")
+    parser.add_argument('--output', '-o', help="Write results as JSON to this file (default: stdout)")
+    parser.add_argument('--compare', help="Baseline results file to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown ratio reported as a regression (default: %(default)s)")
+
+
+def run_from_args(args: argparse.Namespace, row_builder: Optional[RowBuilder] = None) -> int:
+    """
+    Run the suite for parsed command-line options
+
+    Returns:
+        Exit code: 1 when --compare finds a regression, 0 otherwise
+    """
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    scenarios = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else None
+    suite = BenchmarkSuite(sizes, args.repeat, row_builder)
+    result = suite.run(scenarios)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(result, json.load(f), args.threshold)
+        result['comparison'] = comparison
+        regressions = [entry for entry in comparison if entry['regression']]
+        for entry in regressions:
+            label = f"{entry['scenario']}[{entry['variant']}]" if entry['variant'] else entry['scenario']
+            print(f"REGRESSION: {label} at {entry['size']} tickers is {entry['ratio']:.2f}x slower",
+                  file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(result, indent=2))
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FinPull hot paths")
+    add_arguments(parser)
+    return run_from_args(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,35 @@
 from .data_models import FinancialData
+from .numeric import FIELD_UNITS, parse_number, parse_field
 from .data_sources import DataSourceManager
+from .async_sources import AsyncDataSourceManager
 from .storage import DataStorage
+from .backends import StorageBackend, JSONBackend, JournalBackend, SQLiteBackend, migrate_json_to_sqlite
 from .scraper import FinancialDataScraper
+from .history import HistoryStore
+from .table import FinancialTable
+from .refresh import RefreshEngine, RefreshReport, RefreshResult
+from .scheduler import RefreshScheduler
+from .market_calendar import TradingCalendar
 
 __all__ = [
     "FinancialData",
+    "FIELD_UNITS",
+    "parse_number",
+    "parse_field",
     "DataSourceManager", 
+    "AsyncDataSourceManager",
     "DataStorage",
+    "StorageBackend",
+    "JSONBackend",
+    "JournalBackend",
+    "SQLiteBackend",
+    "migrate_json_to_sqlite",
     "FinancialDataScraper",
+    "HistoryStore",
+    "FinancialTable",
+    "RefreshEngine",
+    "RefreshReport",
+    "RefreshResult",
+    "RefreshScheduler",
+    "TradingCalendar",
 ] 
\ No newline at end of file
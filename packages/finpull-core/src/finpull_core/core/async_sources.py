@@ -0,0 +1,238 @@
+"""
+Asyncio-native data source manager for fetching many tickers on one event loop
+"""
+
+import copy
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from .data_models import FinancialData
+from .data_sources import DataSourceManager, FINVIZ_URL, FINVIZ_HEADERS
+from .http_cache import ResponseCache
+from .health import SourceUnavailableError, get_source_health
+from ..utils.compatibility import HAS_AIOHTTP
+from ..utils.retry import RetryLaterError, get_retry_policy
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDataSourceManager(DataSourceManager):
+    """Async variant of DataSourceManager with awaitable fetchers"""
+
+    def __init__(self, source_concurrency: Optional[Dict[str, int]] = None,
+                 max_connections: int = 100, response_cache: Optional[ResponseCache] = None,
+                 supplement_deadline: Optional[float] = None):
+        """
+        Initialize the async data source manager
+
+        Args:
+            source_concurrency: Per-source limit on in-flight requests
+            max_connections: Size of the shared aiohttp connection pool
+            response_cache: Optional cache of parsed responses
+            supplement_deadline: Seconds to wait for supplementary sources once the
+                primary source has returned (default: wait for every source)
+        """
+        super().__init__(source_concurrency, response_cache=response_cache,
+                         supplement_deadline=supplement_deadline)
+        self.max_connections = max_connections
+        self._aiohttp_session = None
+        self._async_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def use_replay(self, directory: str, latency: float = 0.0, jitter: float = 0.0):
+        """Replace the live sources with replays of recorded fixtures, awaited without blocking"""
+        replays = super().use_replay(directory, latency, jitter)
+        self.sources = [replay.as_async() for replay in replays]
+        return replays
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the shared HTTP sessions"""
+        if self._aiohttp_session is not None:
+            await self._aiohttp_session.close()
+            self._aiohttp_session = None
+        super().close()
+
+    def _get_aiohttp_session(self):
+        """Get the shared aiohttp session, creating it on first use"""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                          headers=FINVIZ_HEADERS)
+        return self._aiohttp_session
+
+    async def _rate_limit_async(self, source_name: str = "finviz"):
+        """Wait for a request token without blocking the event loop"""
+        limiter = self.rate_limiters.get(source_name)
+        if limiter is not None:
+            await limiter.acquire_async()
+
+    @asynccontextmanager
+    async def _async_source_slot(self, source_name: str):
+        """Hold one of the concurrency slots of a source for the duration of a request"""
+        limit = self.source_concurrency.get(source_name)
+        if limit is None:
+            yield
+            return
+
+        slot = self._async_slots.get(source_name)
+        if slot is None:
+            slot = self._async_slots[source_name] = asyncio.Semaphore(max(1, limit))
+        async with slot:
+            yield
+
+    async def _fetch_from_finviz(self, ticker: str) -> FinancialData:
+        """Fetch data from Finviz"""
+        if not HAS_AIOHTTP:
+            # Fall back to the blocking fetcher on a worker thread
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, super()._fetch_from_finviz, ticker)
+
+        url = FINVIZ_URL.format(ticker=ticker)
+        cached = self._get_cached(url)
+        if cached is not None:
+            return cached
+
+        await self._rate_limit_async("finviz")
+
+        try:
+            async with self._get_aiohttp_session().get(url, headers=self._conditional_headers(url)) as response:
+                if response.status == 304:
+                    cached = self._revalidate_cached(url)
+                    if cached is not None:
+                        return cached
+                response.raise_for_status()
+                html = await response.text()
+                headers = response.headers
+            data = self._parse_finviz(ticker, html)
+            self._store_cached(url, data, headers)
+            if self.recorder is not None:
+                self.recorder.record_finviz(ticker, html)
+            return data
+
+        except Exception as e:
+            logger.error(f"Error fetching from Finviz for {ticker}: {e}")
+            raise
+
+    async def _fetch_from_yahoo(self, ticker: str) -> FinancialData:
+        """Fetch data from Yahoo Finance (yfinance is blocking, so it runs on a worker thread)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, super()._fetch_from_yahoo, ticker)
+
+    async def fetch_data(self, ticker: str, defer_retries: bool = False,
+                         resume: Optional[RetryLaterError] = None) -> FinancialData:
+        """
+        Fetch data using available sources, coalescing concurrent fetches of the same ticker
+
+        Retries wait with asyncio.sleep, so they never block the event loop;
+        defer_retries and resume work as in DataSourceManager.fetch_data.
+        """
+        ticker = ticker.upper().strip()
+        key = self._flight_key(ticker, resume) if defer_retries else ticker
+        data = await self.single_flight.do_async(key, self._fetch_all_sources, ticker, defer_retries, resume)
+        return copy.copy(data)
+
+    async def _fetch_from_source_async(self, index: int, source, ticker: str, attempt: int = 0,
+                                       defer_retries: bool = False) -> FinancialData:
+        """Fetch a ticker from one source, holding that source's concurrency slot (see DataSourceManager)"""
+        name = self.get_source_name(source)
+        health = get_source_health(name)
+        policy = get_retry_policy(name)
+        if attempt == 0:
+            policy.record_request()
+
+        while True:
+            if not health.allow_request():
+                raise SourceUnavailableError(f"Source {name} is unavailable (circuit open)")
+
+            logger.info(f"Attempting to fetch {ticker} using source {index+1}/{len(self.sources)}")
+            try:
+                async with self._async_source_slot(name):
+                    start = time.perf_counter()
+                    try:
+                        data = await source(ticker)
+                    except asyncio.CancelledError:
+                        # Ignored after the supplement deadline; says nothing about the source's health
+                        raise
+                    except Exception as e:
+                        health.record(time.perf_counter() - start, e)
+                        raise
+                    health.record(time.perf_counter() - start)
+                    return data
+            except asyncio.CancelledError:
+                # A cancelled half-open probe must not keep the source locked out
+                health.release_probe()
+                raise
+            except Exception as e:
+                attempt += 1
+                delay = policy.next_delay(attempt, e)
+                if delay is None:
+                    raise
+                if defer_retries:
+                    raise RetryLaterError(ticker, delay, attempt, e, name) from e
+                logger.info(f"Retrying {ticker} on {name} in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{policy.max_attempts}): {e}")
+                await asyncio.sleep(delay)
+
+    async def _fetch_all_sources(self, ticker: str, defer_retries: bool = False,
+                                 resume: Optional[RetryLaterError] = None) -> FinancialData:
+        """Fetch a ticker from every source concurrently and merge the results (see DataSourceManager)"""
+        sources = list(self.sources)
+        results, errors, attempts = self._resume_state(len(sources), resume)
+        tasks = {asyncio.ensure_future(self._fetch_from_source_async(i, sources[i], ticker, attempt,
+                                                                     defer_retries)): i
+                 for i, attempt in attempts.items()}
+
+        pending = set(tasks)
+        deadline = None
+        loop = asyncio.get_event_loop()
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"Supplement deadline passed for {ticker}, "
+                                f"cancelling {len(pending)} slow source(s)")
+                    break
+
+                for task in done:
+                    i = tasks[task]
+                    try:
+                        results[i] = task.result()
+                    except Exception as e:
+                        logger.warning(f"Source {i+1} failed for {ticker}: {e}")
+                        errors[i] = e
+
+                primary_data = self._combine_results(len(sources), results, errors)
+                if primary_data is None:
+                    continue
+                if not self._missing_supplementary(primary_data):
+                    break
+                if deadline is None and self.supplement_deadline is not None:
+                    deadline = loop.time() + self.supplement_deadline
+        finally:
+            # Also reached when the caller is cancelled
+            for task in pending:
+                task.cancel()
+
+        retry = self._deferred_retry(ticker, results, errors)
+        if retry is not None:
+            raise retry
+
+        primary_data = self._combine_results(len(sources), results, errors, final=True)
+        if primary_data is None:
+            self._raise_all_failed(ticker, errors)
+
+        logger.info(f"Successfully compiled data for {ticker}")
+        return primary_data
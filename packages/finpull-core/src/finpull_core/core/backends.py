@@ -0,0 +1,622 @@
+"""
+Pluggable persistence backends for DataStorage
+"""
+
+import json
+import os
+import shutil
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import fields
+from datetime import datetime
+from urllib.parse import quote
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .data_models import FinancialData
+
+logger = logging.getLogger(__name__)
+
+# FinancialData field names, in declaration order
+DATA_FIELDS = [f.name for f in fields(FinancialData)]
+
+
+class ChangeSet:
+    """Changes made to a DataStorage since its last commit"""
+
+    def __init__(self):
+        self.upserted: Set[str] = set()
+        self.deleted_data: Set[str] = set()
+        self.added_tickers: List[str] = []
+        self.removed_tickers: Set[str] = set()
+        self.cleared = False
+
+    def __bool__(self) -> bool:
+        return bool(self.upserted or self.deleted_data or self.added_tickers
+                    or self.removed_tickers or self.cleared)
+
+    def add_ticker(self, ticker: str):
+        """Record a ticker appended to the ticker list"""
+        self.removed_tickers.discard(ticker)
+        self.added_tickers.append(ticker)
+
+    def remove_ticker(self, ticker: str):
+        """Record a ticker removed from the list along with its data"""
+        if ticker in self.added_tickers:
+            self.added_tickers.remove(ticker)
+        self.removed_tickers.add(ticker)
+        self.delete_data(ticker)
+
+    def upsert(self, ticker: str):
+        """Record new or updated data for a ticker"""
+        self.deleted_data.discard(ticker)
+        self.upserted.add(ticker)
+
+    def delete_data(self, ticker: str):
+        """Record cached data dropped for a ticker that stays tracked"""
+        self.upserted.discard(ticker)
+        self.deleted_data.add(ticker)
+
+    def clear(self):
+        """Record that everything was removed"""
+        self.__init__()
+        self.cleared = True
+
+
+class LazyRecords(Mapping):
+    """Read-only mapping that builds FinancialData records on first access"""
+
+    def __init__(self, tickers: Iterable[str], loader: Callable[[str], Optional[FinancialData]],
+                 timestamp_loader: Optional[Callable[[], Dict[str, str]]] = None):
+        self._tickers = list(tickers)
+        self._ticker_set = set(self._tickers)
+        self._loader = loader
+        self._timestamp_loader = timestamp_loader
+        self._loaded: Dict[str, FinancialData] = {}
+
+    def __getitem__(self, ticker: str) -> FinancialData:
+        data = self._loaded.get(ticker)
+        if data is None:
+            if ticker not in self._ticker_set:
+                raise KeyError(ticker)
+            data = self._loader(ticker)
+            if data is None:
+                raise KeyError(ticker)
+            self._loaded[ticker] = data
+        return data
+
+    def __contains__(self, ticker) -> bool:
+        return ticker in self._ticker_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tickers)
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def copy(self) -> Dict[str, FinancialData]:
+        """Materialize every record into a plain dict"""
+        return dict(self.items())
+
+    def timestamps(self) -> Dict[str, str]:
+        """Get the timestamp of every record, without building the records when the backend can"""
+        if self._timestamp_loader is None:
+            return {ticker: data.timestamp for ticker, data in self.items()}
+        return self._timestamp_loader()
+
+
+class StorageBackend:
+    """Interface for persisting the ticker list and cached FinancialData records"""
+
+    name = "base"
+
+    def __init__(self, path: str, read_only: bool = False):
+        """
+        Initialize the backend
+
+        Args:
+            path: Storage file path
+            read_only: Never write to disk, not even to repair or compact the store
+        """
+        self.path = path
+        self.read_only = read_only
+
+    def load(self) -> Tuple[List[str], Dict[str, FinancialData]]:
+        """Load the ticker list and all cached records"""
+        raise NotImplementedError
+
+    def load_lazy(self) -> Tuple[List[str], Mapping]:
+        """Load the ticker list and a mapping that only builds the records that are read"""
+        return self.load()
+
+    def save_all(self, tickers: List[str], cache: Dict[str, FinancialData]):
+        """Replace the stored contents with the given tickers and records"""
+        raise NotImplementedError
+
+    def commit(self, changes: ChangeSet, tickers: List[str], cache: Dict[str, FinancialData]):
+        """
+        Persist a set of changes
+
+        Args:
+            changes: What changed since the last commit
+            tickers: Current ticker list
+            cache: Current cached records
+        """
+        self.save_all(tickers, cache)
+
+    def exists(self) -> bool:
+        """Check if the backing store exists on disk"""
+        return os.path.exists(self.path)
+
+    def size(self) -> int:
+        """Get the on-disk size of the backing store in bytes"""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def close(self):
+        """Release any open resources"""
+
+
+class JSONBackend(StorageBackend):
+    """Single JSON file rewritten atomically on every commit"""
+
+    name = "json"
+
+    def load(self) -> Tuple[List[str], Dict[str, FinancialData]]:
+        tickers: List[str] = []
+        cache: Dict[str, FinancialData] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                tickers = data.get('tickers', [])
+
+                # Convert dict data back to FinancialData objects
+                for ticker, item_data in data.get('cache', {}).items():
+                    cache[ticker] = FinancialData.from_dict(item_data)
+        return tickers, cache
+
+    def load_lazy(self) -> Tuple[List[str], Mapping]:
+        if not os.path.exists(self.path):
+            return [], {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        raw = data.get('cache', {})
+        return data.get('tickers', []), LazyRecords(
+            raw, lambda ticker: FinancialData.from_dict(raw[ticker]),
+            lambda: {ticker: record.get('timestamp', '') for ticker, record in raw.items()})
+
+    def save_all(self, tickers: List[str], cache: Dict[str, FinancialData]):
+        self._write_snapshot(tickers, cache)
+
+    def commit(self, changes: ChangeSet, tickers: List[str], cache: Dict[str, FinancialData]):
+        if not self._write_snapshot(tickers, cache):
+            raise IOError(f"Could not write {self.path}")
+
+    def _write_snapshot(self, tickers: List[str], cache: Dict[str, FinancialData], **extra) -> bool:
+        """Atomically replace the JSON file, returning True on success"""
+        try:
+            from .. import __version__
+
+            data = {
+                'tickers': tickers,
+                'cache': {ticker: data.to_dict() for ticker, data in cache.items()},
+                'last_updated': datetime.now().isoformat(),
+                'version': __version__
+            }
+            data.update(extra)
+
+            if os.path.exists(self.path):
+                backup_file = f"{self.path}.backup"
+                try:
+                    shutil.copy2(self.path, backup_file)
+                except Exception as backup_error:
+                    logger.warning(f"Could not create backup: {backup_error}")
+
+            temp_file = f"{self.path}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+            # Replace original file
+            os.replace(temp_file, self.path)
+            logger.debug(f"Saved data to {self.path}")
+            return True
+
+        except PermissionError as e:
+            logger.error(f"Permission denied when writing storage file: {e}")
+            print(f"⚠️  FinPull cannot save data due to permission error. Changes will not persist. Path: {self.path}")
+        except Exception as e:
+            logger.error(f"Error saving data: {e}")
+            # Clean up temp file if it exists
+            temp_file = f"{self.path}.tmp"
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except:
+                    pass
+        return False
+
+
+class JournalBackend(JSONBackend):
+    """
+    Log-structured JSON storage
+
+    Every commit appends one line per change to ``<path>.journal`` instead of
+    rewriting the file. Loading replays the journal on top of the last JSON
+    snapshot, and once the journal grows past ``compact_threshold`` entries a
+    background thread folds it into a new snapshot.
+    """
+
+    name = "journal"
+
+    def __init__(self, path: str, read_only: bool = False, compact_threshold: int = 500):
+        super().__init__(path, read_only)
+        self.journal_path = f"{path}.journal"
+        self.compacting_path = f"{path}.journal.compacting"
+        self.compact_threshold = compact_threshold
+        self.compactions = 0
+        self._seq = 0
+        self._entries = 0
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def _load_snapshot(self) -> Tuple[List[str], Dict[str, FinancialData], int]:
+        """Load the JSON snapshot and the journal sequence number it includes"""
+        tickers: List[str] = []
+        cache: Dict[str, FinancialData] = {}
+        seq = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            tickers = data.get('tickers', [])
+            cache = {ticker: FinancialData.from_dict(item) for ticker, item in data.get('cache', {}).items()}
+            seq = data.get('journal_seq', 0)
+        return tickers, cache, seq
+
+    def _replay(self, journal_file: str, tickers: List[str], cache: Dict[str, FinancialData],
+                after_seq: int, repair: bool = False) -> Tuple[int, int]:
+        """
+        Apply journal entries newer than after_seq
+
+        Args:
+            repair: Truncate an incomplete trailing entry so later appends stay readable
+
+        Returns:
+            Tuple of (last sequence number seen, number of entries read)
+        """
+        last_seq, count = after_seq, 0
+        if not os.path.exists(journal_file):
+            return last_seq, count
+
+        valid_bytes = 0
+        torn = False
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("missing newline")
+                    entry = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # A torn write can only affect the tail of the journal
+                    logger.warning(f"Ignoring incomplete journal entry in {journal_file}")
+                    torn = True
+                    break
+                valid_bytes += len(line)
+                count += 1
+                if entry['seq'] <= after_seq:
+                    continue
+                last_seq = entry['seq']
+
+                op, ticker = entry['op'], entry.get('ticker')
+                if op == 'clear':
+                    tickers.clear()
+                    cache.clear()
+                elif op == 'add':
+                    if ticker in tickers:
+                        tickers.remove(ticker)
+                    tickers.append(ticker)
+                elif op == 'remove':
+                    if ticker in tickers:
+                        tickers.remove(ticker)
+                    cache.pop(ticker, None)
+                elif op == 'delete':
+                    cache.pop(ticker, None)
+                elif op == 'upsert':
+                    cache[ticker] = FinancialData.from_dict(entry['data'])
+
+        if torn and repair:
+            with open(journal_file, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return last_seq, count
+
+    def load(self) -> Tuple[List[str], Dict[str, FinancialData]]:
+        with self._compact_lock, self._lock:
+            tickers, cache, seq = self._load_snapshot()
+            seq, _ = self._replay(self.compacting_path, tickers, cache, seq)
+            self._seq, self._entries = self._replay(self.journal_path, tickers, cache, seq,
+                                                    repair=not self.read_only)
+            pending = os.path.exists(self.compacting_path)
+
+        if pending and not self.read_only:
+            # A previous compaction was interrupted; finish it
+            self._start_compactor()
+        return tickers, cache
+
+    def load_lazy(self) -> Tuple[List[str], Mapping]:
+        if os.path.exists(self.journal_path) or os.path.exists(self.compacting_path):
+            # Replaying the journal needs the full records
+            return self.load()
+        return super().load_lazy()
+
+    def exists(self) -> bool:
+        return any(os.path.exists(p) for p in (self.path, self.journal_path, self.compacting_path))
+
+    def size(self) -> int:
+        return sum(os.path.getsize(p) for p in (self.path, self.journal_path, self.compacting_path)
+                   if os.path.exists(p))
+
+    def save_all(self, tickers: List[str], cache: Dict[str, FinancialData]):
+        with self._compact_lock, self._lock:
+            if self._write_snapshot(tickers, cache, journal_seq=self._seq):
+                for journal_file in (self.journal_path, self.compacting_path):
+                    if os.path.exists(journal_file):
+                        os.remove(journal_file)
+                self._entries = 0
+
+    def _entries_for(self, changes: ChangeSet, cache: Dict[str, FinancialData]) -> List[Dict]:
+        """Translate a change set into journal entries, in replay order"""
+        entries = []
+        if changes.cleared:
+            entries.append({'op': 'clear'})
+        entries.extend({'op': 'remove', 'ticker': t} for t in changes.removed_tickers)
+        entries.extend({'op': 'delete', 'ticker': t} for t in changes.deleted_data
+                       if t not in changes.removed_tickers)
+        entries.extend({'op': 'add', 'ticker': t} for t in changes.added_tickers)
+        entries.extend({'op': 'upsert', 'ticker': t, 'data': cache[t].to_dict()}
+                       for t in changes.upserted if t in cache)
+        return entries
+
+    def commit(self, changes: ChangeSet, tickers: List[str], cache: Dict[str, FinancialData]):
+        entries = self._entries_for(changes, cache)
+        if not entries:
+            return
+
+        with self._lock:
+            lines = []
+            for entry in entries:
+                self._seq += 1
+                entry['seq'] = self._seq
+                lines.append(json.dumps(entry, ensure_ascii=False))
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            self._entries += len(entries)
+            needs_compaction = self._entries >= self.compact_threshold
+        logger.debug(f"Appended {len(entries)} journal entries to {self.journal_path}")
+
+        if needs_compaction:
+            self._start_compactor()
+
+    def _rotate(self) -> bool:
+        """Freeze the active journal for compaction (caller holds the lock)"""
+        if os.path.exists(self.compacting_path):
+            return True
+        if not os.path.exists(self.journal_path):
+            return False
+        os.replace(self.journal_path, self.compacting_path)
+        self._entries = 0
+        return True
+
+    def _start_compactor(self):
+        """Compact in a background thread unless one is already running"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if not self._rotate():
+                return
+            self._compactor = threading.Thread(target=self._compact_frozen, name="finpull-compactor",
+                                               daemon=True)
+            self._compactor.start()
+
+    def _compact_frozen(self):
+        """Fold the frozen journal into a new snapshot"""
+        with self._compact_lock:
+            if not os.path.exists(self.compacting_path):
+                return
+            try:
+                tickers, cache, seq = self._load_snapshot()
+                seq, count = self._replay(self.compacting_path, tickers, cache, seq)
+                if self._write_snapshot(tickers, cache, journal_seq=seq):
+                    os.remove(self.compacting_path)
+                    self.compactions += 1
+                    logger.info(f"Compacted {count} journal entries into {self.path}")
+            except Exception as e:
+                logger.error(f"Error compacting journal: {e}")
+
+    def compact(self):
+        """Fold the whole journal into the snapshot now"""
+        with self._lock:
+            rotated = self._rotate()
+        if rotated:
+            self._compact_frozen()
+
+    def close(self):
+        if self.read_only:
+            return
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        self.compact()
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite database with row-level upserts, WAL mode and indexed lookups"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, read_only: bool = False):
+        import sqlite3
+
+        super().__init__(path, read_only)
+        self._lock = threading.Lock()
+        self._conn = None
+        if read_only:
+            # No schema or journal mode changes; a missing database stays missing
+            if os.path.exists(path):
+                uri = f"file:{quote(os.path.abspath(path))}?mode=ro"
+                self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        columns = ", ".join(f"{name} TEXT" for name in DATA_FIELDS if name != "ticker")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT PRIMARY KEY, position INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS financial_data (ticker TEXT PRIMARY KEY, {columns})"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tickers_position ON tickers(position)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_data_sector ON financial_data(sector)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_data_timestamp ON financial_data(timestamp)")
+
+    def _row_to_data(self, row) -> FinancialData:
+        return FinancialData.from_dict(dict(zip(DATA_FIELDS, row)))
+
+    def load(self) -> Tuple[List[str], Dict[str, FinancialData]]:
+        with self._lock:
+            tickers = [row[0] for row in self._conn.execute("SELECT ticker FROM tickers ORDER BY position")]
+            select = f"SELECT {', '.join(DATA_FIELDS)} FROM financial_data"
+            cache = {row[0]: self._row_to_data(row) for row in self._conn.execute(select)}
+        return tickers, cache
+
+    def load_lazy(self) -> Tuple[List[str], Mapping]:
+        with self._lock:
+            tickers = [row[0] for row in self._conn.execute("SELECT ticker FROM tickers ORDER BY position")]
+            cached = [row[0] for row in self._conn.execute("SELECT ticker FROM financial_data")]
+        return tickers, LazyRecords(cached, self.get, self.get_timestamps)
+
+    def get_timestamps(self) -> Dict[str, str]:
+        """Read the timestamp of every cached record"""
+        with self._lock:
+            return {ticker: timestamp or '' for ticker, timestamp in
+                    self._conn.execute("SELECT ticker, timestamp FROM financial_data")}
+
+    def get(self, ticker: str) -> Optional[FinancialData]:
+        """Read a single cached record"""
+        select = f"SELECT {', '.join(DATA_FIELDS)} FROM financial_data WHERE ticker = ?"
+        with self._lock:
+            row = self._conn.execute(select, (ticker,)).fetchone()
+        return self._row_to_data(row) if row else None
+
+    def _upsert_rows(self, records: List[FinancialData]):
+        placeholders = ", ".join("?" for _ in DATA_FIELDS)
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO financial_data ({', '.join(DATA_FIELDS)}) VALUES ({placeholders})",
+            [tuple(getattr(record, name) for name in DATA_FIELDS) for record in records]
+        )
+
+    def save_all(self, tickers: List[str], cache: Dict[str, FinancialData]):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tickers")
+            self._conn.execute("DELETE FROM financial_data")
+            self._conn.executemany("INSERT INTO tickers (ticker, position) VALUES (?, ?)",
+                                   [(ticker, i) for i, ticker in enumerate(tickers)])
+            self._upsert_rows([cache[t] for t in cache])
+        logger.debug(f"Saved {len(tickers)} tickers to {self.path}")
+
+    def commit(self, changes: ChangeSet, tickers: List[str], cache: Dict[str, FinancialData]):
+        with self._lock, self._conn:
+            if changes.cleared:
+                self._conn.execute("DELETE FROM tickers")
+                self._conn.execute("DELETE FROM financial_data")
+
+            if changes.removed_tickers:
+                self._conn.executemany("DELETE FROM tickers WHERE ticker = ?",
+                                       [(t,) for t in changes.removed_tickers])
+            if changes.deleted_data:
+                self._conn.executemany("DELETE FROM financial_data WHERE ticker = ?",
+                                       [(t,) for t in changes.deleted_data])
+
+            if changes.added_tickers:
+                row = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM tickers").fetchone()
+                next_position = row[0] + 1
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tickers (ticker, position) VALUES (?, ?)",
+                    [(t, next_position + i) for i, t in enumerate(changes.added_tickers)]
+                )
+
+            upserted = [cache[t] for t in changes.upserted if t in cache]
+            if upserted:
+                self._upsert_rows(upserted)
+        logger.debug(f"Committed {len(changes.upserted)} upserts to {self.path}")
+
+    def size(self) -> int:
+        total = 0
+        for suffix in ("", "-wal"):
+            path = self.path + suffix
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+    def exists(self) -> bool:
+        return self._conn is not None and os.path.exists(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+
+
+BACKENDS = {
+    JSONBackend.name: JSONBackend,
+    JournalBackend.name: JournalBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def create_backend(path: str, backend: Optional[str] = None, read_only: bool = False) -> StorageBackend:
+    """
+    Create a storage backend
+
+    Args:
+        path: Storage file path
+        backend: Backend name ("json", "journal" or "sqlite"); inferred from the file
+            extension when omitted
+        read_only: Open the backend without ever writing to disk
+
+    Returns:
+        StorageBackend instance
+    """
+    if backend is None:
+        backend = "sqlite" if path.lower().endswith(SQLITE_EXTENSIONS) else "json"
+    try:
+        backend_class = BACKENDS[backend.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}. Available backends: {', '.join(BACKENDS)}")
+    return backend_class(path, read_only)
+
+
+def migrate_json_to_sqlite(json_file: str, sqlite_file: str) -> int:
+    """
+    Copy the contents of a JSON storage file into a SQLite database
+
+    Args:
+        json_file: Existing JSON storage file
+        sqlite_file: SQLite database to create or overwrite
+
+    Returns:
+        int: Number of tickers migrated
+    """
+    tickers, cache = JSONBackend(json_file).load()
+    target = SQLiteBackend(sqlite_file)
+    try:
+        target.save_all(tickers, cache)
+    finally:
+        target.close()
+    logger.info(f"Migrated {len(tickers)} tickers from {json_file} to {sqlite_file}")
+    return len(tickers)
@@ -4,7 +4,9 @@ Data models for financial information
 
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .numeric import NUMERIC_FIELDS, parse_field
 
 
 @dataclass
@@ -51,6 +53,20 @@ class FinancialData:
         """Create instance from dictionary"""
         return cls(**data)
     
+    def numeric(self) -> Dict[str, Optional[float]]:
+        """
+        Get numeric values of all numeric fields (None where missing)
+        
+        Values are in the units listed in FIELD_UNITS. The result is cached
+        until one of the fields changes.
+        """
+        key = tuple(getattr(self, name) for name in NUMERIC_FIELDS)
+        cached = self.__dict__.get('_numeric_cache')
+        if cached is None or cached[0] != key:
+            cached = (key, {name: parse_field(name, value) for name, value in zip(NUMERIC_FIELDS, key)})
+            self.__dict__['_numeric_cache'] = cached
+        return dict(cached[1])
+    
     def is_valid(self) -> bool:
         """Check if the data contains meaningful information"""
         # Consider data valid if we have at least ticker and one meaningful field
@@ -67,8 +83,13 @@ class FinancialData:
     
     def get_age_minutes(self) -> float:
         """Get age of data in minutes"""
+        return self.age_minutes(self.timestamp)
+    
+    @staticmethod
+    def age_minutes(timestamp: str) -> float:
+        """Get the age of a record timestamp in minutes (inf if it cannot be parsed)"""
         try:
-            timestamp_dt = datetime.fromisoformat(self.timestamp.replace('Z', '+00:00'))
+            timestamp_dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
             age = datetime.now() - timestamp_dt.replace(tzinfo=None)
             return age.total_seconds() / 60
         except:
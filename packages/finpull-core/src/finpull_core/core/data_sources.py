@@ -2,273 +2,778 @@
 Data source managers for fetching financial data from various sources
 """
 
+import os
+import copy
+import json
 import time
+import atexit
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Callable
+from typing import Any, Dict, List, Callable, Optional, Tuple
 
 from .data_models import FinancialData
+from .http_cache import ResponseCache, response_cache_from_env
+from .finviz_parser import FinvizParser
+from .replay import ReplaySource, recorder_from_env
+from .health import SourceUnavailableError, get_source_health
+from .negative_cache import TickerNotFoundError, is_not_found
+from .market_calendar import TradingCalendar, get_trading_calendar
 from ..utils.compatibility import HAS_REQUESTS, HAS_BS4, HAS_YFINANCE
-
-if HAS_REQUESTS:
-    import requests
-
-if HAS_BS4:
-    from bs4 import BeautifulSoup
-
-if HAS_YFINANCE:
-    import yfinance as yf
+from ..utils.rate_limit import TokenBucket, get_rate_limiter
+from ..utils.retry import RetryLaterError, get_retry_policy
+from ..utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+FINVIZ_URL = "https://finviz.com/quote.ashx?t={ticker}"
+YAHOO_CACHE_KEY = "yahoo://quote/{ticker}"
+YAHOO_COMPONENT_KEY = "yahoo://{component}/{ticker}"
+FINVIZ_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
 
 class DataSourceManager:
     """Manages multiple data sources with fallback mechanisms"""
     
-    def __init__(self):
+    # Maximum number of concurrent requests allowed per source
+    DEFAULT_SOURCE_CONCURRENCY = {
+        "finviz": 4,
+        "yahoo": 8,
+    }
+    
+    # Seconds each Yahoo component stays fresh before it is fetched again.
+    # The quote (price, volume, ratios) is fetched on every refresh in session.
+    DEFAULT_COMPONENT_TTLS = {
+        "quote": 0,
+        "change_5y": 24 * 3600,            # daily: needs the full 5-year price history
+        "balance_sheet": 90 * 24 * 3600,   # quarterly: total assets and liabilities
+    }
+    
+    # Components that only change while the market is in session: with a trading
+    # calendar, values fetched after the last close are reused until the next open
+    MARKET_COMPONENTS = ("quote",)
+    
+    # Fields a supplementary source fills in when the primary source lacks them
+    SUPPLEMENTARY_FIELDS = [
+        'total_assets', 'total_liabilities', 'change_5y',
+        'dividend_yield', 'beta', 'eps_ttm', 'pe_ratio'
+    ]
+    
+    # Worker threads that query the sources of a ticker in parallel, shared by every manager
+    FANOUT_WORKERS = 32
+    _fanout_executor: Optional[ThreadPoolExecutor] = None
+    _fanout_lock = threading.Lock()
+    
+    # Last fetched values of each (ticker, component), shared by every manager
+    _components: Dict[Tuple[str, str], Tuple[float, Dict[str, str]]] = {}
+    _components_lock = threading.Lock()
+    
+    # Market components are kept on disk this long (covers the longest market closure)
+    MARKET_COMPONENT_RETENTION = 7 * 24 * 3600
+    
+    def __init__(self, source_concurrency: Optional[Dict[str, int]] = None,
+                 pool_size: int = 10, max_retries: int = 2, backoff_factor: float = 0.5,
+                 response_cache: Optional[ResponseCache] = None,
+                 component_ttls: Optional[Dict[str, float]] = None,
+                 supplement_deadline: Optional[float] = None,
+                 calendar: Optional[TradingCalendar] = None,
+                 component_file: Optional[str] = None):
+        """
+        Initialize the data source manager
+        
+        Args:
+            source_concurrency: Per-source limit on in-flight requests,
+                keyed by source name ("finviz", "yahoo")
+            pool_size: Maximum number of keep-alive connections kept per host
+            max_retries: Retries for failed connections (retryable HTTP statuses and
+                timeouts are handled by the per-source retry policy, see utils.retry)
+            backoff_factor: Exponential backoff factor between connection retries, in seconds
+            response_cache: Optional cache of parsed responses (default: enabled by
+                FINPULL_HTTP_CACHE_TTL, otherwise off)
+            component_ttls: Overrides of DEFAULT_COMPONENT_TTLS, in seconds
+            supplement_deadline: Seconds to wait for supplementary sources once the
+                primary source has returned (default: wait for every source)
+            calendar: Trading calendar deciding when quotes can change (default:
+                selected by FINPULL_CALENDAR, NYSE unless set to "none")
+            component_file: JSON file keeping Yahoo component values and their fetch
+                times across runs (the scraper uses <storage_file>.components.json)
+        """
         self.sources: List[Callable[[str], FinancialData]] = []
-        self.rate_limit_delay = 1.0  # seconds between requests
-        self.last_request_time = 0
+        self.request_timeout = 10  # seconds
+        self.supplement_deadline = supplement_deadline
+        
+        # Token buckets are shared by every manager in the process
+        self.rate_limiters: Dict[str, TokenBucket] = {
+            name: get_rate_limiter(name) for name in ("finviz", "yahoo")
+        }
+        
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+        self._adapter = None
+        self._session_lock = threading.Lock()
+        self.response_cache = response_cache if response_cache is not None else response_cache_from_env()
+        self._finviz_parser: Optional[FinvizParser] = None  # created on first parse
+        self.recorder = recorder_from_env()
+        
+        self.component_ttls = dict(self.DEFAULT_COMPONENT_TTLS)
+        if component_ttls:
+            self.component_ttls.update(component_ttls)
+        self._component_stats = {name: {'fetched': 0, 'reused': 0, 'market_closed': 0}
+                                 for name in self.component_ttls}
+        self.calendar = calendar if calendar is not None else get_trading_calendar()
+        self.component_file = component_file
+        self._components_loaded = False
+        self._components_dirty = False
+        self._atexit_registered = False
+        
+        # Concurrent fetches of the same ticker through this manager share one request
+        self.single_flight = SingleFlight()
+        
+        self.source_concurrency = dict(self.DEFAULT_SOURCE_CONCURRENCY)
+        if source_concurrency:
+            self.source_concurrency.update(source_concurrency)
+        self._source_slots: Dict[str, threading.BoundedSemaphore] = {
+            name: threading.BoundedSemaphore(max(1, limit))
+            for name, limit in self.source_concurrency.items()
+        }
         
         # Initialize available sources
-        if HAS_REQUESTS and HAS_BS4:
-            self.sources.append(self._fetch_from_finviz)
-        if HAS_YFINANCE:
-            self.sources.append(self._fetch_from_yahoo)
+        replay_dir = os.getenv('FINPULL_REPLAY_DIR')
+        if replay_dir:
+            self.use_replay(replay_dir, latency=float(os.getenv('FINPULL_REPLAY_LATENCY', '0')))
+        else:
+            if HAS_REQUESTS and HAS_BS4:
+                self.sources.append(self._fetch_from_finviz)
+            if HAS_YFINANCE:
+                self.sources.append(self._fetch_from_yahoo)
+    
+    def use_replay(self, directory: str, latency: float = 0.0, jitter: float = 0.0) -> List[ReplaySource]:
+        """
+        Replace the live sources with replays of recorded fixtures
+        
+        Args:
+            directory: Fixture directory (see FixtureRecorder and generate_fixtures)
+            latency: Synthetic delay per request, in seconds
+            jitter: Maximum extra random delay per request, in seconds
+            
+        Returns:
+            The replay sources, one per source with fixtures in the directory
+        """
+        replays = [ReplaySource(directory, source, latency, jitter)
+                   for source in ("finviz", "yahoo")
+                   if os.path.isdir(os.path.join(directory, source))]
+        if not replays:
+            raise ValueError(f"No fixtures found in {directory}")
+        self.sources = list(replays)
+        logger.info(f"Replaying {', '.join(r.source for r in replays)} fixtures from {directory}")
+        return replays
+    
+    def _get_session(self):
+        """Get the pooled keep-alive HTTP session, creating it on first use"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                # Only connection failures are retried here; statuses and read timeouts
+                # go through the retry policy, which adds jitter, a budget and deferral
+                retry = Retry(
+                    total=self.max_retries,
+                    read=0,
+                    status=0,
+                    backoff_factor=self.backoff_factor,
+                    raise_on_status=False,
+                )
+                self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size,
+                                            max_retries=retry)
+                session = requests.Session()
+                session.headers.update(FINVIZ_HEADERS)
+                session.mount("https://", self._adapter)
+                session.mount("http://", self._adapter)
+                self._session = session
+            return self._session
+    
+    def close(self):
+        """Close the pooled HTTP session and its connections"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._adapter = None
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get connection reuse statistics for the pooled HTTP session"""
+        requests_sent = 0
+        connections_opened = 0
+        
+        with self._session_lock:
+            if self._adapter is not None:
+                pools = self._adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        requests_sent += pool.num_requests
+                        connections_opened += pool.num_connections
+        
+        reused = max(0, requests_sent - connections_opened)
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'connections_reused': reused,
+            'reuse_ratio': reused / requests_sent if requests_sent else 0.0,
+            'pool_size': self.pool_size,
+            'max_retries': self.max_retries,
+        }
+    
+    @property
+    def rate_limit_delay(self) -> float:
+        """Seconds between Finviz requests at the sustained rate"""
+        rate = self.rate_limiters["finviz"].rate
+        return 1.0 / rate if rate > 0 else 0.0
+    
+    @rate_limit_delay.setter
+    def rate_limit_delay(self, delay: float):
+        self.rate_limiters["finviz"].configure(rate=1.0 / delay if delay > 0 else 0.0)
     
-    def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+    def _rate_limit(self, source_name: str = "finviz"):
+        """Wait for a request token from the source's shared token bucket"""
+        limiter = self.rate_limiters.get(source_name)
+        if limiter is not None:
+            limiter.acquire()
+    
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get token bucket statistics for each source"""
+        return {name: limiter.get_stats() for name, limiter in self.rate_limiters.items()}
+    
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """Get counters of fetches executed and requests coalesced into them"""
+        return self.single_flight.get_stats()
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get response cache statistics, or None when the cache is disabled"""
+        return self.response_cache.get_stats() if self.response_cache else None
+    
+    def _get_cached(self, url: str) -> Optional[FinancialData]:
+        """Get the cached record of a URL if it is still within the cache TTL"""
+        if self.response_cache is None:
+            return None
+        entry = self.response_cache.lookup(url)
+        return FinancialData.from_dict(entry.payload) if entry else None
+    
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators of an expired cache entry, so an unchanged page is answered with 304"""
+        entry = self.response_cache.get(url) if self.response_cache else None
+        return entry.conditional_headers() if entry else {}
+    
+    def _revalidate_cached(self, url: str) -> Optional[FinancialData]:
+        """Reuse the cached record after a 304; the unchanged page is current as of now"""
+        entry = self.response_cache.get(url) if self.response_cache else None
+        if entry is None:
+            return None
+        payload = dict(entry.payload, timestamp=datetime.now().isoformat())
+        self.response_cache.revalidate(url, payload)
+        return FinancialData.from_dict(payload)
+    
+    def _store_cached(self, url: str, data: FinancialData, headers=None):
+        """Cache a parsed record along with the ETag/Last-Modified validators of its response"""
+        if self.response_cache is not None:
+            headers = headers or {}
+            self.response_cache.put(url, data.to_dict(), headers.get('ETag'), headers.get('Last-Modified'))
+    
+    def _get_component(self, ticker: str, component: str) -> Optional[Dict[str, str]]:
+        """
+        Get the values of a component fetched within its TTL
+        
+        Components live in memory for the life of the process and, with a
+        component_file or the response cache, on disk so they also survive
+        restarts (e.g. between cron runs of finpull refresh). Market components
+        are also reused while the trading calendar says they cannot have
+        changed since they were fetched.
+        """
+        ttl = self.component_ttls.get(component, 0)
+        if not self._keeps_component(component):
+            return None
+        
+        self._load_components()
+        with self._components_lock:
+            entry = self._components.get((ticker, component))
+        if entry is None and self.response_cache is not None:
+            cached = self.response_cache.get(YAHOO_COMPONENT_KEY.format(component=component, ticker=ticker))
+            if cached is not None:
+                entry = (cached.fetched_at, cached.payload)
+        
+        if entry is None:
+            return None
+        if time.time() - entry[0] < ttl:
+            self._component_stats[component]['reused'] += 1
+        elif (component in self.MARKET_COMPONENTS and self.calendar is not None
+              and self.calendar.unchanged_since(entry[0])):
+            self._component_stats[component]['market_closed'] += 1
+        else:
+            return None
+        return entry[1]
+    
+    def _keeps_component(self, component: str) -> bool:
+        """Check whether fetched values of a component are worth keeping for reuse"""
+        if self.component_ttls.get(component, 0) > 0:
+            return True
+        return component in self.MARKET_COMPONENTS and self.calendar is not None
+    
+    def _put_component(self, ticker: str, component: str, values: Dict[str, str]):
+        """Remember freshly fetched component values"""
+        self._component_stats.setdefault(component, {'fetched': 0, 'reused': 0, 'market_closed': 0})['fetched'] += 1
+        if not self._keeps_component(component):
+            return
+        with self._components_lock:
+            self._components[(ticker, component)] = (time.time(), values)
+            if self.component_file:
+                self._components_dirty = True
+                if not self._atexit_registered:
+                    atexit.register(self.save_components)
+                    self._atexit_registered = True
+        if self.response_cache is not None:
+            self.response_cache.put(YAHOO_COMPONENT_KEY.format(component=component, ticker=ticker), values)
+    
+    def _component_retention(self, component: str) -> float:
+        """Seconds a component's values stay worth keeping"""
+        ttl = self.component_ttls.get(component, 0)
+        return ttl if ttl > 0 else self.MARKET_COMPONENT_RETENTION
+    
+    def _load_components(self):
+        """Merge the components saved in component_file into memory (once)"""
+        if self._components_loaded:
+            return
+        self._components_loaded = True
+        if not self.component_file or not os.path.exists(self.component_file):
+            return
+        try:
+            with open(self.component_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            with self._components_lock:
+                for ticker, components in saved.items():
+                    for component, entry in components.items():
+                        current = self._components.get((ticker, component))
+                        if current is None or current[0] < entry['fetched_at']:
+                            self._components[(ticker, component)] = (entry['fetched_at'], entry['values'])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable component cache {self.component_file}: {e}")
+    
+    def save_components(self):
+        """Write the kept component values and fetch times to component_file, if any changed"""
+        if not self.component_file or not self._components_dirty:
+            return
+        self._load_components()  # keep what other runs saved
+        now = time.time()
+        saved: Dict[str, Dict[str, Any]] = {}
+        with self._components_lock:
+            self._components_dirty = False
+            for (ticker, component), (fetched_at, values) in self._components.items():
+                if now - fetched_at < self._component_retention(component):
+                    saved.setdefault(ticker, {})[component] = {'fetched_at': fetched_at, 'values': values}
+        try:
+            temp_file = f"{self.component_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(saved, f)
+            os.replace(temp_file, self.component_file)
+        except Exception as e:
+            logger.warning(f"Could not save component cache {self.component_file}: {e}")
+    
+    def get_retry_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the retry policy settings and counters of each source"""
+        return {name: get_retry_policy(name).get_stats()
+                for name in (self.get_source_name(source) for source in self.sources)}
+    
+    def get_health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the health score, error rate and latency EWMAs and circuit state of each source"""
+        return {name: get_source_health(name).get_stats()
+                for name in (self.get_source_name(source) for source in self.sources)}
+    
+    def get_component_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the TTL and fetched/reused counters of each Yahoo component (market_closed: reused off-hours)"""
+        return {name: dict(stats, ttl=self.component_ttls.get(name, 0))
+                for name, stats in self._component_stats.items()}
+    
+    def get_source_name(self, source) -> str:
+        """Get the short name of a source callable (e.g. "finviz")"""
+        name = getattr(source, '__name__', source.__class__.__name__)
+        return name.replace('_fetch_from_', '')
+    
+    @contextmanager
+    def _source_slot(self, source_name: str):
+        """Hold one of the concurrency slots of a source for the duration of a request"""
+        slot = self._source_slots.get(source_name)
+        if slot is None:
+            yield
+            return
+        with slot:
+            yield
     
     def _fetch_from_finviz(self, ticker: str) -> FinancialData:
         """Fetch data from Finviz"""
-        self._rate_limit()
+        url = FINVIZ_URL.format(ticker=ticker)
+        cached = self._get_cached(url)
+        if cached is not None:
+            return cached
         
-        url = f"https://finviz.com/quote.ashx?t={ticker}"
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+        self._rate_limit("finviz")
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._get_session().get(url, headers=self._conditional_headers(url),
+                                               timeout=self.request_timeout)
+            if response.status_code == 304:
+                cached = self._revalidate_cached(url)
+                if cached is not None:
+                    return cached
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = FinancialData(ticker=ticker.upper())
-            
-            # Extract company name
-            company_tag = soup.find("h2", class_="quote-header_ticker-wrapper_company")
-            if company_tag:
-                data.company_name = company_tag.get_text(strip=True)
-            
-            # Extract price
-            price_tag = soup.find("strong", class_="quote-price_wrapper_price")
-            if price_tag:
-                data.price = price_tag.get_text(strip=True)
-            
-            # Extract sector
-            sector_div = soup.find("div", class_="flex space-x-0.5 overflow-hidden")
-            if sector_div:
-                sector_links = sector_div.find_all("a")
-                if sector_links:
-                    data.sector = sector_links[0].get_text(strip=True)
-            
-            # Snapshot table
-            snapshot_table = soup.find("table", class_="snapshot-table2")
-            if snapshot_table:
-                # Parse the table
-                rows = snapshot_table.find_all("tr")
-                metrics = {}
-                
-                for row in rows:
-                    cells = row.find_all("td")
-                    # Each row has multiple key-value pairs (every 2 cells = 1 pair)
-                    for i in range(0, len(cells), 2):
-                        if i + 1 < len(cells):
-                            key_cell = cells[i]
-                            value_cell = cells[i + 1]
-                            
-                            # Extract text and clean it
-                            key = key_cell.get_text(strip=True)
-                            value = value_cell.get_text(strip=True)
-                            
-                            # Clean up value (remove HTML formatting, extract main value)
-                            if value:
-                                # Handle cases like "1.01 (0.49%)"
-                                if '(' in value and ')' in value:
-                                    # For dividend: "1.01 (0.49%)" -> store both
-                                    if 'Dividend' in key:
-                                        parts = value.split('(')
-                                        if len(parts) == 2:
-                                            metrics[key] = parts[0].strip()
-                                            metrics[f"{key} %"] = parts[1].replace(')', '').strip()
-                                    else:
-                                        metrics[key] = value.split('(')[0].strip()
-                                else:
-                                    metrics[key] = value
-                
-                # Field mapping
-                field_mapping = {
-                    # Basic valuation metrics
-                    "Market Cap": "market_cap",
-                    "P/E": "pe_ratio",
-                    "P/S": "ps_ratio", 
-                    "P/B": "pb_ratio",
-                    
-                    # Earnings data
-                    "EPS (ttm)": "eps_ttm",
-                    "EPS next Y": "eps_next_year",
-                    "EPS next 5Y": "eps_next_5y",
-                    
-                    # Dividend data
-                    "Dividend TTM": "dividend_ttm",
-                    "Dividend TTM %": "dividend_yield",
-                    
-                    # Performance metrics
-                    "ROA": "roa",
-                    "ROE": "roe", 
-                    "ROIC": "roi",
-                    "Profit Margin": "profit_margin",
-                    "Oper. Margin": "operating_margin",
-                    
-                    # Revenue data
-                    "Sales": "revenue",
-                    
-                    # Performance over time
-                    "Perf 5Y": "change_5y",
-                    
-                    # Volume and other metrics
-                    "Volume": "volume",
-                    "Avg Volume": "avg_volume", 
-                    "Beta": "beta"
-                }
-                
-                # Apply the mapping
-                for finviz_key, data_field in field_mapping.items():
-                    if finviz_key in metrics:
-                        value = metrics[finviz_key]
-                        setattr(data, data_field, value)
-            
+            data = self._parse_finviz(ticker, response.text)
+            self._store_cached(url, data, response.headers)
+            if self.recorder is not None:
+                self.recorder.record_finviz(ticker, response.text)
             return data
             
         except Exception as e:
             logger.error(f"Error fetching from Finviz for {ticker}: {e}")
             raise
     
+    def _parse_finviz(self, ticker: str, html: str) -> FinancialData:
+        """Parse a Finviz quote page into FinancialData"""
+        if self._finviz_parser is None:
+            self._finviz_parser = FinvizParser()
+        return self._finviz_parser.parse(ticker, html)
+    
     def _fetch_from_yahoo(self, ticker: str) -> FinancialData:
         """Fetch data from Yahoo Finance using yfinance"""
+        # yfinance hides its URLs and validators, so Yahoo results are cached by TTL only
+        cache_key = YAHOO_CACHE_KEY.format(ticker=ticker.upper())
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        import yfinance as yf  # slow to import (pulls in pandas), so only on first use
+        
         try:
+            ticker = ticker.upper()
             yf_ticker = yf.Ticker(ticker)
-            info = yf_ticker.info
-            
-            # Check if we got meaningful data
-            # If Yahoo returns minimal data (just trailingPegRatio or similar), it's likely invalid
-            meaningful_fields = ['longName', 'currentPrice', 'marketCap', 'sector', 'trailingPE']
-            has_meaningful_data = any(
-                info.get(field) not in [None, 'N/A', 0] 
-                for field in meaningful_fields
-            )
-            
-            if not has_meaningful_data:
-                raise Exception(f"Ticker '{ticker}' not found - it may be invalid or delisted")
-            
-            data = FinancialData(ticker=ticker.upper())
-            
-            # Basic info
-            data.company_name = info.get('longName', 'N/A')
-            data.sector = info.get('sector', 'N/A')
-            data.price = str(info.get('currentPrice', 'N/A'))
-            
-            # Financial metrics
-            data.market_cap = str(info.get('marketCap', 'N/A'))
-            data.pe_ratio = str(info.get('trailingPE', 'N/A'))
-            data.pb_ratio = str(info.get('priceToBook', 'N/A'))
-            data.eps_ttm = str(info.get('trailingEps', 'N/A'))
-            data.dividend_yield = str(info.get('dividendYield', 'N/A'))
-            data.roa = str(info.get('returnOnAssets', 'N/A'))
-            data.roe = str(info.get('returnOnEquity', 'N/A'))
-            data.profit_margin = str(info.get('profitMargins', 'N/A'))
-            data.beta = str(info.get('beta', 'N/A'))
-            data.volume = str(info.get('volume', 'N/A'))
-            data.avg_volume = str(info.get('averageVolume', 'N/A'))
-            
-            # Calculate 5-year price change
-            try:
-                hist = yf_ticker.history(period="5y")
-                if not hist.empty:
-                    start_price = hist['Close'].iloc[0]
-                    end_price = hist['Close'].iloc[-1]
-                    change_5y = ((end_price - start_price) / start_price) * 100
-                    data.change_5y = f"{change_5y:.2f}%"
-            except:
-                pass
+            data = FinancialData(ticker=ticker)
             
-            # Balance sheet data
-            try:
-                balance_sheet = yf_ticker.balance_sheet
-                if not balance_sheet.empty:
-                    if 'Total Assets' in balance_sheet.index:
-                        data.total_assets = str(balance_sheet.loc['Total Assets'].iloc[0])
-                    if 'Total Liabilities Net Minority Interest' in balance_sheet.index:
-                        data.total_liabilities = str(balance_sheet.loc['Total Liabilities Net Minority Interest'].iloc[0])
-            except:
-                pass
+            # Each component is only fetched once its TTL has expired; otherwise
+            # the values from the previous fetch are merged in
+            for component, fetch in (("quote", self._fetch_yahoo_quote),
+                                     ("change_5y", self._fetch_yahoo_change_5y),
+                                     ("balance_sheet", self._fetch_yahoo_balance_sheet)):
+                values = self._get_component(ticker, component)
+                if values is None:
+                    values = fetch(ticker, yf_ticker)
+                    if values is None:
+                        continue
+                    self._put_component(ticker, component, values)
+                    if self.recorder is not None:
+                        self.recorder.record_yahoo(ticker, component, values)
+                for field, value in values.items():
+                    setattr(data, field, value)
             
+            self._store_cached(cache_key, data)
             return data
             
         except Exception as e:
             logger.error(f"Error fetching from Yahoo Finance for {ticker}: {e}")
             raise
     
-    def fetch_data(self, ticker: str) -> FinancialData:
-        """Fetch data using available sources with intelligent data fusion"""
+    def _fetch_yahoo_quote(self, ticker: str, yf_ticker) -> Dict[str, str]:
+        """Fetch the quote fields from the Yahoo info endpoint"""
+        self._rate_limit("yahoo")
+        info = yf_ticker.info
+        
+        # Check if we got meaningful data
+        # If Yahoo returns minimal data (just trailingPegRatio or similar), it's likely invalid
+        meaningful_fields = ['longName', 'currentPrice', 'marketCap', 'sector', 'trailingPE']
+        has_meaningful_data = any(
+            info.get(field) not in [None, 'N/A', 0] 
+            for field in meaningful_fields
+        )
+        
+        if not has_meaningful_data:
+            raise TickerNotFoundError(f"Ticker '{ticker}' not found - it may be invalid or delisted")
+        
+        return {
+            # Basic info
+            'company_name': info.get('longName', 'N/A'),
+            'sector': info.get('sector', 'N/A'),
+            'price': str(info.get('currentPrice', 'N/A')),
+            
+            # Financial metrics
+            'market_cap': str(info.get('marketCap', 'N/A')),
+            'pe_ratio': str(info.get('trailingPE', 'N/A')),
+            'pb_ratio': str(info.get('priceToBook', 'N/A')),
+            'eps_ttm': str(info.get('trailingEps', 'N/A')),
+            'dividend_yield': str(info.get('dividendYield', 'N/A')),
+            'roa': str(info.get('returnOnAssets', 'N/A')),
+            'roe': str(info.get('returnOnEquity', 'N/A')),
+            'profit_margin': str(info.get('profitMargins', 'N/A')),
+            'beta': str(info.get('beta', 'N/A')),
+            'volume': str(info.get('volume', 'N/A')),
+            'avg_volume': str(info.get('averageVolume', 'N/A')),
+        }
+    
+    def _fetch_yahoo_change_5y(self, ticker: str, yf_ticker) -> Optional[Dict[str, str]]:
+        """Calculate the 5-year price change from the price history (None on failure)"""
+        try:
+            self._rate_limit("yahoo")
+            hist = yf_ticker.history(period="5y")
+            if hist.empty:
+                return {}
+            start_price = hist['Close'].iloc[0]
+            end_price = hist['Close'].iloc[-1]
+            change_5y = ((end_price - start_price) / start_price) * 100
+            return {'change_5y': f"{change_5y:.2f}%"}
+        except:
+            return None
+    
+    def _fetch_yahoo_balance_sheet(self, ticker: str, yf_ticker) -> Optional[Dict[str, str]]:
+        """Fetch total assets and liabilities from the balance sheet (None on failure)"""
+        try:
+            self._rate_limit("yahoo")
+            balance_sheet = yf_ticker.balance_sheet
+            values = {}
+            if not balance_sheet.empty:
+                if 'Total Assets' in balance_sheet.index:
+                    values['total_assets'] = str(balance_sheet.loc['Total Assets'].iloc[0])
+                if 'Total Liabilities Net Minority Interest' in balance_sheet.index:
+                    values['total_liabilities'] = str(balance_sheet.loc['Total Liabilities Net Minority Interest'].iloc[0])
+            return values
+        except:
+            return None
+    
+    def fetch_data(self, ticker: str, defer_retries: bool = False,
+                   resume: Optional[RetryLaterError] = None) -> FinancialData:
+        """
+        Fetch data using available sources with intelligent data fusion
+        
+        Concurrent calls for the same ticker are coalesced into a single fetch;
+        every caller receives its own copy of the result.
+        
+        Transient source failures are retried according to each source's retry
+        policy. By default the retry sleeps on the calling thread; with
+        defer_retries, RetryLaterError is raised instead so the caller can fetch
+        the ticker again later, passing the error as resume. Only the sources
+        that failed are asked again, each continuing its own attempt count, and
+        their results are merged with those the other sources already returned.
+        
+        Args:
+            ticker: Stock ticker symbol
+            defer_retries: Raise RetryLaterError instead of sleeping before a retry
+            resume: RetryLaterError raised by an earlier deferred fetch of the ticker
+        """
         ticker = ticker.upper().strip()
+        key = self._flight_key(ticker, resume) if defer_retries else ticker
+        data = self.single_flight.do(key, self._fetch_all_sources, ticker, defer_retries, resume)
+        return copy.copy(data)
+    
+    @staticmethod
+    def _flight_key(ticker: str, resume: Optional[RetryLaterError]) -> Tuple:
+        """Single-flight key of a deferred fetch: the ticker and the attempts its sources have made"""
+        return (ticker, tuple(sorted(resume.attempts.items())) if resume is not None else ())
+    
+    @classmethod
+    def _get_fanout_executor(cls) -> ThreadPoolExecutor:
+        with cls._fanout_lock:
+            if cls._fanout_executor is None:
+                cls._fanout_executor = ThreadPoolExecutor(max_workers=cls.FANOUT_WORKERS,
+                                                          thread_name_prefix="finpull-source")
+            return cls._fanout_executor
+    
+    def _fetch_from_source(self, index: int, source, ticker: str, attempt: int = 0,
+                           defer_retries: bool = False) -> FinancialData:
+        """
+        Fetch a ticker from one source, holding that source's concurrency slot
         
-        primary_data = None
-        errors = []
+        A source whose circuit is open is skipped right away instead of making
+        every ticker wait for its timeout; the outcome of each request feeds the
+        source's health tracking. Transient failures are retried as the source's
+        retry policy allows, without holding the slot while waiting.
+        """
+        name = self.get_source_name(source)
+        health = get_source_health(name)
+        policy = get_retry_policy(name)
+        if attempt == 0:
+            policy.record_request()
         
-        # Try each source and collect data
-        for i, source in enumerate(self.sources):
+        while True:
+            if not health.allow_request():
+                raise SourceUnavailableError(f"Source {name} is unavailable (circuit open)")
+            
+            logger.info(f"Attempting to fetch {ticker} using source {index+1}/{len(self.sources)}")
             try:
-                logger.info(f"Attempting to fetch {ticker} using source {i+1}/{len(self.sources)}")
-                data = source(ticker)
-                
-                if primary_data is None:
-                    primary_data = data
-                    logger.info(f"Successfully fetched {ticker} from primary source")
-                else:
-                    logger.info(f"Supplementing {ticker} data from additional source")
-                    self._merge_data(primary_data, data)
-
-                if primary_data and hasattr(self, '_is_yahoo_source') and self._is_yahoo_source(source):
-                    continue
-                    
+                with self._source_slot(name):
+                    start = time.perf_counter()
+                    try:
+                        data = source(ticker)
+                    except Exception as e:
+                        health.record(time.perf_counter() - start, e)
+                        raise
+                    health.record(time.perf_counter() - start)
+                    return data
+            except Exception as e:
+                attempt += 1
+                delay = policy.next_delay(attempt, e)
+                if delay is None:
+                    raise
+                if defer_retries:
+                    raise RetryLaterError(ticker, delay, attempt, e, name) from e
+                logger.info(f"Retrying {ticker} on {name} in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{policy.max_attempts}): {e}")
+                time.sleep(delay)
+    
+    def _fetch_all_sources(self, ticker: str, defer_retries: bool = False,
+                           resume: Optional[RetryLaterError] = None) -> FinancialData:
+        """
+        Fetch a ticker from every source in parallel and merge the results
+        
+        The first source in priority order that succeeds is the primary; the
+        others fill in its missing fields. Waiting stops as soon as the primary
+        has every supplementary field, or supplement_deadline seconds after the
+        primary returned; sources still running are then ignored. A deferred retry
+        of a source ranked above the primary is raised instead of falling back.
+        When resuming, only the sources that deferred a retry are asked again.
+        """
+        sources = list(self.sources)
+        results, errors, attempts = self._resume_state(len(sources), resume)
+        futures = {}
+        
+        if len(attempts) == 1:
+            # A single source runs on the calling thread
+            (i, attempt), = attempts.items()
+            try:
+                results[i] = self._fetch_from_source(i, sources[i], ticker, attempt, defer_retries)
             except Exception as e:
                 logger.warning(f"Source {i+1} failed for {ticker}: {e}")
-                errors.append(str(e))
-                
+                errors[i] = e
+        elif attempts:
+            executor = self._get_fanout_executor()
+            futures = {executor.submit(self._fetch_from_source, i, sources[i], ticker, attempt, defer_retries): i
+                       for i, attempt in attempts.items()}
+        
+        pending = set(futures)
+        deadline = None
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info(f"Supplement deadline passed for {ticker}, ignoring {len(pending)} slow source(s)")
+                break
+            
+            for future in done:
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.warning(f"Source {i+1} failed for {ticker}: {e}")
+                    errors[i] = e
+            
+            primary_data = self._combine_results(len(sources), results, errors)
+            if primary_data is None:
+                continue
+            if not self._missing_supplementary(primary_data):
+                break
+            if deadline is None and self.supplement_deadline is not None:
+                deadline = time.monotonic() + self.supplement_deadline
+        
+        for future in pending:
+            future.cancel()
+        
+        retry = self._deferred_retry(ticker, results, errors)
+        if retry is not None:
+            raise retry
+        
+        primary_data = self._combine_results(len(sources), results, errors, final=True)
         if primary_data is None:
-            # If all sources failed, raise a user-friendly exception
-            logger.error(f"All data sources failed for ticker {ticker}: {'; '.join(errors)}")
-            raise Exception(f"Ticker '{ticker}' not found - it may be invalid or delisted")
+            self._raise_all_failed(ticker, errors)
         
         logger.info(f"Successfully compiled data for {ticker}")
         return primary_data
     
+    @staticmethod
+    def _resume_state(count: int, resume: Optional[RetryLaterError]) -> Tuple[
+            Dict[int, FinancialData], Dict[int, Exception], Dict[int, int]]:
+        """Get the results and errors kept from earlier passes, and the attempts of the sources to fetch"""
+        if resume is None:
+            return {}, {}, {i: 0 for i in range(count)}
+        attempts = {i: attempt for i, attempt in resume.attempts.items() if i < count}
+        return dict(resume.results), dict(resume.errors), attempts
+    
+    def _deferred_retry(self, ticker: str, results: Dict[int, FinancialData],
+                        errors: Dict[int, Exception]) -> Optional[RetryLaterError]:
+        """
+        Get the deferred retry of a source ranked above the primary result, if any
+        
+        Every source that deferred a retry is retried together, after the longest
+        of their delays; the error keeps the other sources' results and errors.
+        """
+        primary_index = min(results) if results else None
+        deferred = {i: e for i, e in errors.items() if isinstance(e, RetryLaterError)}
+        if not any(primary_index is None or i < primary_index for i in deferred):
+            return None
+        first = deferred[min(deferred)]
+        return RetryLaterError(ticker, max(e.delay for e in deferred.values()), first.attempt,
+                               first.cause, first.source,
+                               attempts={i: e.attempt for i, e in deferred.items()},
+                               results=dict(results),
+                               errors={i: e for i, e in errors.items() if i not in deferred})
+    
+    def _raise_all_failed(self, ticker: str, errors: Dict[int, Exception]):
+        """Raise the exception for a ticker that no source returned"""
+        logger.error(f"All data sources failed for ticker {ticker}: {'; '.join(map(str, errors.values()))}")
+        if errors and all(isinstance(e, SourceUnavailableError) for e in errors.values()):
+            # Nothing was asked, so the ticker itself may well be valid
+            raise SourceUnavailableError(f"All data sources are unavailable, could not fetch '{ticker}'")
+        # If all sources failed, raise a user-friendly exception
+        message = f"Ticker '{ticker}' not found - it may be invalid or delisted"
+        if errors and all(is_not_found(e) for e in errors.values()):
+            # Every source answered that the ticker does not exist
+            raise TickerNotFoundError(message)
+        raise Exception(message)
+    
+    def _combine_results(self, count: int, results: Dict[int, FinancialData], errors: Dict[int, Exception],
+                         final: bool = False) -> Optional[FinancialData]:
+        """
+        Merge the results received so far into the primary result
+        
+        The primary is the first source in priority order that succeeded. Until
+        every higher-priority source has finished it is not known yet, and None
+        is returned (unless final, when unfinished sources are skipped).
+        """
+        primary_index = None
+        for i in range(count):
+            if i in results:
+                primary_index = i
+                break
+            if i not in errors and not final:
+                return None
+        if primary_index is None:
+            return None
+        
+        primary_data = results[primary_index]
+        for i in sorted(results):
+            if i != primary_index:
+                self._merge_data(primary_data, results[i])
+        return primary_data
+    
+    def _missing_supplementary(self, data: FinancialData) -> List[str]:
+        """Supplementary fields the data does not have yet"""
+        return [field for field in self.SUPPLEMENTARY_FIELDS if getattr(data, field, "N/A") == "N/A"]
+    
     def _is_yahoo_source(self, source) -> bool:
         """Check if a source is the Yahoo Finance source"""
         return source.__name__ == '_fetch_from_yahoo' if hasattr(source, '__name__') else False
     
     def _merge_data(self, primary: FinancialData, supplementary: FinancialData):
         """Merge supplementary data into primary data for missing fields"""
-        supplementary_fields = [
-            'total_assets', 'total_liabilities', 'change_5y',
-            'dividend_yield', 'beta', 'eps_ttm', 'pe_ratio'
-        ]
-        
-        for field in supplementary_fields:
+        for field in self.SUPPLEMENTARY_FIELDS:
             primary_value = getattr(primary, field, "N/A")
             supp_value = getattr(supplementary, field, "N/A")
 
@@ -282,9 +787,19 @@ class DataSourceManager:
     
     def get_source_info(self) -> List[str]:
         """Get information about available sources"""
+        replays = [source for source in self.sources if isinstance(source, ReplaySource)]
+        if replays:
+            return [f"{replay.source.title()} (replay of {replay.directory}, {replay.requests} requests)"
+                    for replay in replays]
+        
         info = []
         if HAS_REQUESTS and HAS_BS4:
-            info.append("Finviz (web scraping)")
+            conn = self.get_connection_stats()
+            if conn['requests']:
+                info.append(f"Finviz (web scraping, {conn['requests']} requests over "
+                            f"{conn['connections_opened']} connections)")
+            else:
+                info.append("Finviz (web scraping)")
         if HAS_YFINANCE:
             info.append("Yahoo Finance (API)")
         return info 
\ No newline at end of file
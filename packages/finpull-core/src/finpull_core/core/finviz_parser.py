@@ -0,0 +1,235 @@
+"""
+Finviz quote page parser with pluggable HTML backends
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .data_models import FinancialData
+from ..utils.compatibility import HAS_BS4, HAS_LXML, HAS_SELECTOLAX
+
+logger = logging.getLogger(__name__)
+
+COMPANY_CLASS = "quote-header_ticker-wrapper_company"
+PRICE_CLASS = "quote-price_wrapper_price"
+SECTOR_CLASS = "flex space-x-0.5 overflow-hidden"
+SNAPSHOT_CLASS = "snapshot-table2"
+
+# Snapshot table label -> FinancialData field
+FIELD_MAPPING = {
+    # Basic valuation metrics
+    "Market Cap": "market_cap",
+    "P/E": "pe_ratio",
+    "P/S": "ps_ratio",
+    "P/B": "pb_ratio",
+
+    # Earnings data
+    "EPS (ttm)": "eps_ttm",
+    "EPS next Y": "eps_next_year",
+    "EPS next 5Y": "eps_next_5y",
+
+    # Dividend data
+    "Dividend TTM": "dividend_ttm",
+    "Dividend TTM %": "dividend_yield",
+
+    # Performance metrics
+    "ROA": "roa",
+    "ROE": "roe",
+    "ROIC": "roi",
+    "Profit Margin": "profit_margin",
+    "Oper. Margin": "operating_margin",
+
+    # Revenue data
+    "Sales": "revenue",
+
+    # Performance over time
+    "Perf 5Y": "change_5y",
+
+    # Volume and other metrics
+    "Volume": "volume",
+    "Avg Volume": "avg_volume",
+    "Beta": "beta"
+}
+
+# Preferred backends, fastest first
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Text of the company name, price and sector, plus the cell texts of each snapshot table row
+Extracted = Tuple[Optional[str], Optional[str], Optional[str], Optional[List[List[str]]]]
+
+
+def available_backends() -> List[str]:
+    """Get the parser backends that can be used in this environment"""
+    installed = {"selectolax": HAS_SELECTOLAX, "lxml": HAS_LXML, "html.parser": HAS_BS4}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def _extract_selectolax(html: str) -> Extracted:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+
+    def text(node) -> Optional[str]:
+        return node.text(strip=True) if node is not None else None
+
+    sector = None
+    sector_div = tree.css_first(f'div[class="{SECTOR_CLASS}"]')
+    if sector_div is not None:
+        sector = text(sector_div.css_first("a"))
+
+    rows = None
+    table = tree.css_first(f"table.{SNAPSHOT_CLASS}")
+    if table is not None:
+        rows = [[text(cell) for cell in row.css("td")] for row in table.css("tr")]
+
+    return (text(tree.css_first(f"h2.{COMPANY_CLASS}")),
+            text(tree.css_first(f"strong.{PRICE_CLASS}")),
+            sector, rows)
+
+
+def _has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def _extract_lxml(html: str) -> Extracted:
+    import lxml.html
+
+    root = lxml.html.fromstring(html)
+
+    def first(path: str, node=None):
+        found = (root if node is None else node).xpath(path)
+        return found[0] if found else None
+
+    def text(node) -> Optional[str]:
+        return "".join(s.strip() for s in node.itertext()) if node is not None else None
+
+    sector = None
+    sector_div = first(f'//div[@class="{SECTOR_CLASS}"]')
+    if sector_div is not None:
+        sector = text(first(".//a", sector_div))
+
+    rows = None
+    table = first(f"//table[{_has_class(SNAPSHOT_CLASS)}]")
+    if table is not None:
+        rows = [[text(cell) for cell in row.xpath(".//td")] for row in table.xpath(".//tr")]
+
+    return (text(first(f"//h2[{_has_class(COMPANY_CLASS)}]")),
+            text(first(f"//strong[{_has_class(PRICE_CLASS)}]")),
+            sector, rows)
+
+
+_WANTED_CLASSES = frozenset((COMPANY_CLASS, PRICE_CLASS, SECTOR_CLASS, SNAPSHOT_CLASS))
+
+
+def _is_wanted(value: Optional[str]) -> bool:
+    # Depending on the bs4 version, called with the full class string or with each class
+    return value is not None and (value in _WANTED_CLASSES or
+                                  any(name in _WANTED_CLASSES for name in value.split()))
+
+
+def _extract_html_parser(html: str) -> Extracted:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # Only build the elements that are read; everything else on the page is skipped
+    strainer = SoupStrainer(class_=_is_wanted)
+    soup = BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+    def text(node) -> Optional[str]:
+        return node.get_text(strip=True) if node is not None else None
+
+    sector = None
+    sector_div = soup.find("div", class_=SECTOR_CLASS)
+    if sector_div:
+        sector = text(sector_div.find("a"))
+
+    rows = None
+    table = soup.find("table", class_=SNAPSHOT_CLASS)
+    if table:
+        rows = [[text(cell) for cell in row.find_all("td")] for row in table.find_all("tr")]
+
+    return (text(soup.find("h2", class_=COMPANY_CLASS)),
+            text(soup.find("strong", class_=PRICE_CLASS)),
+            sector, rows)
+
+
+_EXTRACTORS = {
+    "selectolax": _extract_selectolax,
+    "lxml": _extract_lxml,
+    "html.parser": _extract_html_parser,
+}
+
+
+def _snapshot_metrics(rows: List[List[str]]) -> Dict[str, str]:
+    """Turn snapshot table rows (label, value, label, value, ...) into a label -> value dict"""
+    metrics = {}
+    for cells in rows:
+        # Each row has multiple key-value pairs (every 2 cells = 1 pair)
+        for i in range(0, len(cells) - 1, 2):
+            key = cells[i]
+            value = cells[i + 1]
+            if not value:
+                continue
+            # Handle cases like "1.01 (0.49%)"
+            if '(' in value and ')' in value:
+                # For dividend: "1.01 (0.49%)" -> store both
+                if 'Dividend' in key:
+                    parts = value.split('(')
+                    if len(parts) == 2:
+                        metrics[key] = parts[0].strip()
+                        metrics[f"{key} %"] = parts[1].replace(')', '').strip()
+                else:
+                    metrics[key] = value.split('(')[0].strip()
+            else:
+                metrics[key] = value
+    return metrics
+
+
+class FinvizParser:
+    """
+    Extracts FinancialData from a Finviz quote page
+
+    Only the header (company, price, sector) and the snapshot table are read.
+    The backend is selectolax or lxml when installed and BeautifulSoup's
+    html.parser restricted to those elements otherwise; FINPULL_HTML_PARSER
+    forces a specific one.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize the parser
+
+        Args:
+            backend: "selectolax", "lxml" or "html.parser" (default: fastest installed)
+        """
+        available = available_backends()
+        backend = backend or os.getenv('FINPULL_HTML_PARSER') or None
+        if backend is None:
+            if not available:
+                raise ImportError("No HTML parser available; install beautifulsoup4, lxml or selectolax")
+            backend = available[0]
+        elif backend not in available:
+            raise ValueError(f"HTML parser backend '{backend}' is not available. "
+                             f"Available backends: {', '.join(available) or 'none'}")
+        self.backend = backend
+        self._extract = _EXTRACTORS[backend]
+
+    def parse(self, ticker: str, html: str) -> FinancialData:
+        """Parse a Finviz quote page into FinancialData"""
+        company, price, sector, rows = self._extract(html)
+
+        data = FinancialData(ticker=ticker.upper())
+        if company is not None:
+            data.company_name = company
+        if price is not None:
+            data.price = price
+        if sector is not None:
+            data.sector = sector
+
+        if rows is not None:
+            metrics = _snapshot_metrics(rows)
+            for finviz_key, data_field in FIELD_MAPPING.items():
+                if finviz_key in metrics:
+                    setattr(data, data_field, metrics[finviz_key])
+
+        return data
@@ -0,0 +1,229 @@
+"""
+Per-source health tracking and circuit breaking
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from ..utils.retry import http_status, is_transient_error
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CLOSED = "closed"        # requests flow normally
+OPEN = "open"            # requests are skipped until the cooldown has passed
+HALF_OPEN = "half_open"  # a single probe request decides whether to close or reopen
+
+# HTTP statuses that mean the source itself is failing, not the ticker
+FAILURE_STATUS_CODES = (403, 429)
+
+
+class SourceUnavailableError(Exception):
+    """Raised instead of calling a source whose circuit is open"""
+
+
+def is_source_failure(error: BaseException) -> bool:
+    """
+    Check whether an error means the source is unhealthy
+
+    Blocking (403), rate limiting (429), server errors, timeouts and connection
+    failures count; a 404 or an unknown ticker only concerns that ticker.
+    """
+    status = http_status(error)
+    if status is not None:
+        return status in FAILURE_STATUS_CODES or status >= 500
+    return is_transient_error(error)
+
+
+class SourceHealth:
+    """
+    Error rate and latency EWMAs of one source, with a circuit breaker
+
+    The circuit opens after failure_threshold consecutive failures, or when the
+    error rate EWMA reaches error_rate_threshold. While open, requests are
+    skipped for cooldown seconds; then a single probe is let through and the
+    circuit closes on success or reopens with a doubled cooldown on failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, error_rate_threshold: float = 0.5,
+                 cooldown: float = 30.0, max_cooldown: float = 300.0, alpha: float = 0.2,
+                 min_samples: int = 10):
+        """
+        Initialize health tracking
+
+        Args:
+            name: Source name
+            failure_threshold: Consecutive failures that open the circuit
+            error_rate_threshold: Error rate EWMA that opens the circuit
+            cooldown: Seconds the circuit stays open before a probe
+            max_cooldown: Upper bound for the cooldown after repeated failed probes
+            alpha: EWMA smoothing factor (weight of the newest sample)
+            min_samples: Requests needed before the error rate can open the circuit
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.alpha = alpha
+        self.min_samples = min_samples
+
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.error_rate = 0.0
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, moving an expired open circuit to half-open"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                logger.info(f"Circuit for {self.name} half-open, probing recovery")
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.skipped += 1
+            return False
+
+    def _open(self, now: float):
+        """Open the circuit (caller holds the lock)"""
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened for {self.cooldown:g}s "
+                       f"after {self.consecutive_failures} consecutive failure(s): {self.last_error}")
+
+    def release_probe(self):
+        """
+        Give up a half-open probe without an outcome, e.g. when it was cancelled
+
+        The next request is let through as the probe instead.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, latency: float, error: Optional[BaseException] = None):
+        """
+        Record the outcome of a request
+
+        Args:
+            latency: Seconds the request took
+            error: Exception raised by the source, if any
+        """
+        failed = error is not None and is_source_failure(error)
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self.latency = latency if self.latency is None else (
+                self.alpha * latency + (1 - self.alpha) * self.latency)
+            self.error_rate = self.alpha * float(failed) + (1 - self.alpha) * self.error_rate
+
+            was_probe = self.state == HALF_OPEN
+            self._probe_in_flight = False
+
+            if not failed:
+                self.consecutive_failures = 0
+                if was_probe:
+                    self.state = CLOSED
+                    self.cooldown = self.base_cooldown
+                    logger.info(f"Circuit for {self.name} closed, source recovered")
+                return
+
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if was_probe:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open(now)
+            elif self.state == CLOSED and (
+                    self.consecutive_failures >= self.failure_threshold or
+                    (self.requests >= self.min_samples and self.error_rate >= self.error_rate_threshold)):
+                self._open(now)
+
+    def score(self) -> float:
+        """Health score from 0 (unusable) to 1 (no recent errors); 0 while the circuit is open"""
+        with self._lock:
+            return 0.0 if self.state == OPEN else round(1.0 - self.error_rate, 3)
+
+    def reset(self):
+        """Close the circuit and forget the recorded history"""
+        with self._lock:
+            self.state = CLOSED
+            self.cooldown = self.base_cooldown
+            self.error_rate = 0.0
+            self.latency = None
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the health score, EWMAs, circuit state and counters"""
+        score = self.score()
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'score': score,
+                'error_rate': round(self.error_rate, 3),
+                'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+                'requests': self.requests,
+                'failures': self.failures,
+                'consecutive_failures': self.consecutive_failures,
+                'skipped': self.skipped,
+                'times_opened': self.times_opened,
+                'retry_in': retry_in,
+                'last_error': self.last_error,
+            }
+
+
+_health: Dict[str, SourceHealth] = {}
+_health_lock = threading.Lock()
+
+
+def get_source_health(source: str) -> SourceHealth:
+    """Get the process-wide health tracker for a source, creating it on first use"""
+    with _health_lock:
+        health = _health.get(source)
+        if health is None:
+            health = _health[source] = SourceHealth(source)
+        return health
+
+
+def configure_circuit_breaker(source: str, failure_threshold: Optional[int] = None,
+                              error_rate_threshold: Optional[float] = None,
+                              cooldown: Optional[float] = None, max_cooldown: Optional[float] = None):
+    """
+    Configure the circuit breaker of a source for every scraper in the process
+
+    Args:
+        source: Source name ("finviz", "yahoo")
+        failure_threshold: Consecutive failures that open the circuit
+        error_rate_threshold: Error rate EWMA (0-1) that opens the circuit
+        cooldown: Seconds before a probe is sent to an open source
+        max_cooldown: Upper bound for the cooldown after failed probes
+    """
+    health = get_source_health(source)
+    with health._lock:
+        if failure_threshold is not None:
+            health.failure_threshold = failure_threshold
+        if error_rate_threshold is not None:
+            health.error_rate_threshold = error_rate_threshold
+        if cooldown is not None:
+            health.base_cooldown = health.cooldown = cooldown
+        if max_cooldown is not None:
+            health.max_cooldown = max_cooldown
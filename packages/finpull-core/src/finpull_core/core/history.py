@@ -0,0 +1,220 @@
+"""
+Append-only time series of FinancialData snapshots
+"""
+
+import os
+import json
+import math
+import struct
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from .data_models import FinancialData
+from .numeric import NUMERIC_FIELDS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FINPULL-HISTORY 1\n"
+
+TimeArg = Optional[Union[datetime, str, float]]
+
+
+def _to_epoch(value: TimeArg) -> Optional[float]:
+    """Convert a datetime, ISO string or epoch seconds to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value.timestamp()
+
+
+class _SeriesFile:
+    """One ticker's history file: a schema header followed by fixed-size float64 records"""
+
+    def __init__(self, path: str, field_names: Optional[List[str]] = None):
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                if f.readline() != MAGIC:
+                    raise ValueError(f"Not a FinPull history file: {path}")
+                self.fields = json.loads(f.readline().decode('utf-8'))
+                self.header_size = f.tell()
+        else:
+            self.fields = list(field_names or NUMERIC_FIELDS)
+            header = MAGIC + json.dumps(self.fields).encode('utf-8') + b"\n"
+            with open(path, 'wb') as f:
+                f.write(header)
+            self.header_size = len(header)
+
+        # Record layout: timestamp followed by one value per field
+        self.record = struct.Struct(f"<{len(self.fields) + 1}d")
+
+    def count(self) -> int:
+        """Number of complete records in the file"""
+        return (os.path.getsize(self.path) - self.header_size) // self.record.size
+
+    def _timestamp_at(self, f, index: int) -> float:
+        f.seek(self.header_size + index * self.record.size)
+        return struct.unpack("<d", f.read(8))[0]
+
+    def _bisect(self, f, timestamp: float, count: int, right: bool) -> int:
+        """Binary search over the on-disk timestamps"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ts = self._timestamp_at(f, mid)
+            if ts < timestamp or (right and ts == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def last_timestamp(self) -> Optional[float]:
+        """Timestamp of the newest record"""
+        count = self.count()
+        if count == 0:
+            return None
+        with open(self.path, 'rb') as f:
+            return self._timestamp_at(f, count - 1)
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        """Append one record, discarding any partially written tail first"""
+        row = [timestamp] + [values.get(name, math.nan) for name in self.fields]
+        end = self.header_size + self.count() * self.record.size
+        with open(self.path, 'r+b') as f:
+            f.truncate(end)
+            f.seek(end)
+            f.write(self.record.pack(*row))
+
+    def read_range(self, start: Optional[float], end: Optional[float]) -> List[Tuple[float, ...]]:
+        """Read the records with start <= timestamp <= end"""
+        count = self.count()
+        if count == 0:
+            return []
+        with open(self.path, 'rb') as f:
+            lo = self._bisect(f, start, count, right=False) if start is not None else 0
+            hi = self._bisect(f, end, count, right=True) if end is not None else count
+            if lo >= hi:
+                return []
+            f.seek(self.header_size + lo * self.record.size)
+            block = f.read((hi - lo) * self.record.size)
+        return list(self.record.iter_unpack(block))
+
+
+class HistoryStore:
+    """Keeps a compact per-ticker history of numeric FinancialData fields"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the history store
+
+        Args:
+            directory: Directory holding one history file per ticker (created
+                when the first snapshot is recorded)
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._series: Dict[str, _SeriesFile] = {}
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker}.hist")
+
+    def _get_series(self, ticker: str, create: bool = False) -> Optional[_SeriesFile]:
+        """Get the series file for a ticker (caller holds the lock)"""
+        series = self._series.get(ticker)
+        if series is None:
+            path = self._path(ticker)
+            if not create and not os.path.exists(path):
+                return None
+            if create:
+                os.makedirs(self.directory, exist_ok=True)
+            series = self._series[ticker] = _SeriesFile(path)
+        return series
+
+    def record(self, data: FinancialData) -> bool:
+        """
+        Append a snapshot to the ticker's history
+
+        Snapshots that are not newer than the last recorded one are ignored,
+        which keeps every file sorted by timestamp.
+
+        Returns:
+            bool: True if a record was written
+        """
+        ticker = data.ticker.upper().strip()
+        try:
+            timestamp = _to_epoch(data.timestamp)
+        except ValueError:
+            logger.warning(f"Not recording history for {ticker}: invalid timestamp {data.timestamp!r}")
+            return False
+
+        values = {name: math.nan if value is None else value for name, value in data.numeric().items()}
+        with self._lock:
+            try:
+                series = self._get_series(ticker, create=True)
+                last = series.last_timestamp()
+                if last is not None and timestamp <= last:
+                    return False
+                series.append(timestamp, values)
+                return True
+            except Exception as e:
+                logger.error(f"Error recording history for {ticker}: {e}")
+                return False
+
+    def get_history(self, ticker: str, field: str, start: TimeArg = None,
+                    end: TimeArg = None) -> List[Tuple[datetime, float]]:
+        """
+        Get the recorded values of one field
+
+        Args:
+            ticker: Stock ticker symbol
+            field: Numeric FinancialData field, e.g. "pe_ratio"
+            start: Earliest timestamp to include (datetime, ISO string or epoch seconds)
+            end: Latest timestamp to include
+
+        Returns:
+            List of (timestamp, value) tuples in chronological order; missing values are skipped
+        """
+        if field not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown history field: {field}. Available fields: {', '.join(NUMERIC_FIELDS)}")
+
+        with self._lock:
+            series = self._get_series(ticker.upper().strip())
+            if series is None or field not in series.fields:
+                return []
+            index = series.fields.index(field) + 1
+            rows = series.read_range(_to_epoch(start), _to_epoch(end))
+
+        return [(datetime.fromtimestamp(row[0]), row[index]) for row in rows
+                if not math.isnan(row[index])]
+
+    def get_tickers(self) -> List[str]:
+        """Get tickers that have recorded history"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith('.hist'))
+
+    def delete(self, ticker: str):
+        """Delete the history of a ticker"""
+        ticker = ticker.upper().strip()
+        with self._lock:
+            self._series.pop(ticker, None)
+            path = self._path(ticker)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get history statistics"""
+        tickers = self.get_tickers()
+        with self._lock:
+            records = sum(self._get_series(t).count() for t in tickers)
+        return {
+            'directory': self.directory,
+            'tickers': len(tickers),
+            'records': records,
+            'size': sum(os.path.getsize(self._path(t)) for t in tickers),
+        }
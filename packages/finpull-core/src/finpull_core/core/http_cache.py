@@ -0,0 +1,182 @@
+"""
+On-disk cache of parsed HTTP responses with conditional-GET revalidation
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300  # seconds
+
+
+def default_cache_dir() -> str:
+    """Default cache directory under ~/.finpull"""
+    return os.path.join(os.path.expanduser('~'), '.finpull', 'http_cache')
+
+
+@dataclass
+class CacheEntry:
+    """A cached response: the parsed payload plus the validators needed to revalidate it"""
+    url: str
+    payload: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        """Seconds since the response was fetched or last revalidated"""
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Check if the entry can be used without contacting the server"""
+        return self.age() < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET that returns 304 if the resource is unchanged"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Caches parsed responses keyed by URL
+
+    Entries younger than the TTL are served without a request. Older entries
+    that carry an ETag or Last-Modified validator are revalidated with a
+    conditional GET, so an unchanged page costs a 304 instead of a download
+    and parse.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Cache directory (default: ~/.finpull/http_cache)
+            ttl: Seconds a response is served without revalidation
+        """
+        self.directory = directory or default_cache_dir()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the cached entry for a URL, fresh or not"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                return entry
+            path = self._path(url)
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = CacheEntry(**json.load(f))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+                return None
+            self._entries[url] = entry
+            return entry
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for a URL if it is still fresh, counting a hit or a miss"""
+        entry = self.get(url)
+        with self._lock:
+            if entry is not None and entry.is_fresh(self.ttl):
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return None
+
+    def _write(self, entry: CacheEntry):
+        """Persist an entry atomically (caller holds the lock)"""
+        path = self._path(entry.url)
+        temp_file = f"{path}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(temp_file, path)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry for {entry.url}: {e}")
+
+    def put(self, url: str, payload: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        """Store the parsed payload of a response"""
+        entry = CacheEntry(url, payload, time.time(), etag, last_modified)
+        with self._lock:
+            self._entries[url] = entry
+            self._write(entry)
+        return entry
+
+    def revalidate(self, url: str, payload: Any = None) -> Optional[CacheEntry]:
+        """Mark an entry as fresh again after the server answered 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry.fetched_at = time.time()
+            if payload is not None:
+                entry.payload = payload
+            self.revalidated += 1
+            self._write(entry)
+            return entry
+
+    def clear(self):
+        """Delete every cached response"""
+        with self._lock:
+            self._entries.clear()
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        files = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'ttl': self.ttl,
+                'entries': len(files),
+                'size': sum(os.path.getsize(os.path.join(self.directory, name)) for name in files),
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+            }
+
+
+def response_cache_from_env() -> Optional[ResponseCache]:
+    """
+    Create a cache from FINPULL_HTTP_CACHE_TTL (seconds) and FINPULL_HTTP_CACHE_DIR
+
+    Returns:
+        ResponseCache, or None when FINPULL_HTTP_CACHE_TTL is unset or not positive
+    """
+    try:
+        ttl = float(os.getenv('FINPULL_HTTP_CACHE_TTL', '0'))
+    except ValueError:
+        logger.warning("Ignoring invalid FINPULL_HTTP_CACHE_TTL value")
+        return None
+    if ttl <= 0:
+        return None
+    return ResponseCache(os.getenv('FINPULL_HTTP_CACHE_DIR') or None, ttl)
@@ -0,0 +1,286 @@
+"""
+Trading calendar: exchange sessions and holidays, for market-hours aware refreshing
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from zoneinfo import ZoneInfo  # Python 3.9+
+except ImportError:
+    try:
+        from backports.zoneinfo import ZoneInfo
+    except ImportError:
+        ZoneInfo = None
+
+# How far ahead/back to look for a session (covers the longest run of closed days)
+_SEARCH_DAYS = 14
+
+
+def _easter(year: int) -> date:
+    """Easter Sunday (anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month, day = divmod(h + l - 7 * m + 90, 25)
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday of a month (n = -1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> Tuple[List[date], Dict[date, str]]:
+    """
+    NYSE full-day holidays and early (13:00) closes of a year, by the exchange's rules
+
+    Returns:
+        (holidays, early_closes) where early_closes maps a date to its closing time
+    """
+    holidays = []
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # not moved to the previous year's Dec 31
+        holidays.append(_observed(new_year))
+    holidays += [
+        _nth_weekday(year, 1, 0, 3),             # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),             # Washington's Birthday
+        _easter(year) - timedelta(days=2),       # Good Friday
+        _nth_weekday(year, 5, 0, -1),            # Memorial Day
+        _observed(date(year, 7, 4)),             # Independence Day
+        _nth_weekday(year, 9, 0, 1),             # Labor Day
+        _nth_weekday(year, 11, 3, 4),            # Thanksgiving
+        _observed(date(year, 12, 25)),           # Christmas
+    ]
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+
+    early_closes = {}
+    for day in (date(year, 7, 3), _nth_weekday(year, 11, 3, 4) + timedelta(days=1), date(year, 12, 24)):
+        if day.weekday() < 5 and day not in holidays:
+            early_closes[day] = "13:00"
+    return sorted(holidays), early_closes
+
+
+def _parse_time(value: str) -> Tuple[int, int]:
+    hour, minute = value.split(":")
+    return int(hour), int(minute)
+
+
+class TradingCalendar:
+    """
+    Trading sessions of one exchange
+
+    Sessions are given in exchange local time; holidays and early closes can be
+    listed explicitly, and the NYSE rules generate them for any year. Everything
+    works offline.
+
+    Times passed to and returned by the methods are Unix timestamps.
+    """
+
+    def __init__(self, name: str = "NYSE", timezone_name: Optional[str] = "America/New_York",
+                 sessions: Iterable[Tuple[str, str]] = (("09:30", "16:00"),),
+                 weekdays: Iterable[int] = (0, 1, 2, 3, 4), holidays: Iterable[str] = (),
+                 early_closes: Optional[Dict[str, str]] = None, holiday_rules: Optional[str] = "nyse",
+                 utc_offset: float = -5.0, off_hours_factor: float = 12.0, settle_minutes: float = 20.0):
+        """
+        Initialize the calendar
+
+        Args:
+            name: Exchange name
+            timezone_name: IANA time zone of the exchange (needs zoneinfo; utc_offset
+                is used when it is unavailable)
+            sessions: (open, close) pairs in local "HH:MM" time
+            weekdays: Trading weekdays (Monday is 0)
+            holidays: Extra full-day closures ("YYYY-MM-DD")
+            early_closes: Extra early closes, mapping "YYYY-MM-DD" to the closing time
+            holiday_rules: Built-in holiday rules ("nyse") or None for explicit lists only
+            utc_offset: Fixed UTC offset in hours, used without zoneinfo
+            off_hours_factor: Refresh intervals are stretched up to this many times
+                while the market is closed
+            settle_minutes: Minutes after the close before quotes are final (data
+                feeds are delayed, so the closing print arrives late)
+        """
+        self.name = name
+        self.timezone_name = timezone_name
+        self.tz: tzinfo = timezone(timedelta(hours=utc_offset))
+        if timezone_name and ZoneInfo is not None:
+            try:
+                self.tz = ZoneInfo(timezone_name)
+            except Exception as e:
+                logger.warning(f"Time zone {timezone_name} unavailable ({e}), using UTC{utc_offset:+g}")
+        self.sessions = [(_parse_time(start), _parse_time(end)) for start, end in sessions]
+        self.weekdays = set(weekdays)
+        self.holidays = {date.fromisoformat(d) for d in holidays}
+        self.early_closes = {date.fromisoformat(d): _parse_time(t) for d, t in (early_closes or {}).items()}
+        self.holiday_rules = holiday_rules
+        self.off_hours_factor = off_hours_factor
+        self.settle = settle_minutes * 60
+        self._rule_years: Dict[int, Tuple[set, Dict[date, Tuple[int, int]]]] = {}
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'TradingCalendar':
+        """Create a calendar from a configuration dictionary (keys as in __init__, "timezone" for timezone_name)"""
+        config = dict(config)
+        if "timezone" in config:
+            config["timezone_name"] = config.pop("timezone")
+        return cls(**config)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'TradingCalendar':
+        """Load a calendar from a JSON configuration file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def _rules_for(self, year: int) -> Tuple[set, Dict[date, Tuple[int, int]]]:
+        """Holidays and early closes generated by the built-in rules (cached per year)"""
+        if self.holiday_rules != "nyse":
+            return set(), {}
+        if year not in self._rule_years:
+            holidays, early = nyse_holidays(year)
+            self._rule_years[year] = (set(holidays), {d: _parse_time(t) for d, t in early.items()})
+        return self._rule_years[year]
+
+    def is_trading_day(self, day: date) -> bool:
+        """Check whether the exchange opens on a local date"""
+        if day.weekday() not in self.weekdays or day in self.holidays:
+            return False
+        return day not in self._rules_for(day.year)[0]
+
+    def sessions_on(self, day: date) -> List[Tuple[float, float]]:
+        """(open, close) timestamps of the sessions on a local date, shortened on early-close days"""
+        if not self.is_trading_day(day):
+            return []
+        early = self.early_closes.get(day) or self._rules_for(day.year)[1].get(day)
+        result = []
+        for (open_h, open_m), (close_h, close_m) in self.sessions:
+            if early is not None and (close_h, close_m) > early:
+                close_h, close_m = early
+                if (open_h, open_m) >= early:
+                    continue
+            start = datetime(day.year, day.month, day.day, open_h, open_m, tzinfo=self.tz)
+            end = datetime(day.year, day.month, day.day, close_h, close_m, tzinfo=self.tz)
+            result.append((start.timestamp(), end.timestamp()))
+        return result
+
+    def _local_date(self, ts: float) -> date:
+        return datetime.fromtimestamp(ts, self.tz).date()
+
+    def is_open(self, ts: Optional[float] = None) -> bool:
+        """Check whether the market is in session"""
+        ts = time.time() if ts is None else ts
+        return any(start <= ts < end for start, end in self.sessions_on(self._local_date(ts)))
+
+    def next_open(self, ts: Optional[float] = None) -> Optional[float]:
+        """Start of the next session (ts itself while in session)"""
+        ts = time.time() if ts is None else ts
+        day = self._local_date(ts)
+        for offset in range(_SEARCH_DAYS):
+            for start, end in self.sessions_on(day + timedelta(days=offset)):
+                if end > ts:
+                    return max(start, ts)
+        return None
+
+    def last_close(self, ts: Optional[float] = None) -> Optional[float]:
+        """End of the most recent session that closed at or before ts"""
+        ts = time.time() if ts is None else ts
+        day = self._local_date(ts)
+        for offset in range(_SEARCH_DAYS):
+            for start, end in reversed(self.sessions_on(day - timedelta(days=offset))):
+                if end <= ts:
+                    return end
+        return None
+
+    def unchanged_since(self, fetched_at: float, now: Optional[float] = None) -> bool:
+        """
+        Check whether quotes fetched at fetched_at are still current
+
+        True when the market has been closed from the fetch until now and the
+        fetch happened after the last close had settled.
+        """
+        now = time.time() if now is None else now
+        if self.is_open(now) or self.is_open(fetched_at):
+            return False
+        last_close = self.last_close(now)
+        return last_close is None or fetched_at >= last_close + self.settle
+
+    def refresh_interval(self, base: float, ts: Optional[float] = None) -> float:
+        """
+        Stretch a refresh interval while the market is closed
+
+        In session (and while the close is settling) the base interval applies.
+        Otherwise the next refresh waits for the next open, but no longer than
+        off_hours_factor times the base interval.
+        """
+        ts = time.time() if ts is None else ts
+        if self.is_open(ts):
+            return base
+        last_close = self.last_close(ts)
+        if last_close is not None and ts < last_close + self.settle:
+            return base
+        next_open = self.next_open(ts)
+        until_open = next_open - ts if next_open is not None else base * self.off_hours_factor
+        return max(base, min(until_open, base * self.off_hours_factor))
+
+    def get_status(self, ts: Optional[float] = None) -> Dict[str, Any]:
+        """Get whether the market is open and the next open/last close"""
+        ts = time.time() if ts is None else ts
+        next_open, last_close = self.next_open(ts), self.last_close(ts)
+        fmt = lambda t: datetime.fromtimestamp(t, self.tz).isoformat() if t is not None else None
+        return {
+            'exchange': self.name,
+            'open': self.is_open(ts),
+            'next_open': fmt(next_open),
+            'last_close': fmt(last_close),
+        }
+
+
+_default_calendar: Optional[TradingCalendar] = None
+_default_loaded = False
+
+
+def get_trading_calendar() -> Optional[TradingCalendar]:
+    """
+    Get the process-wide trading calendar
+
+    FINPULL_CALENDAR selects it: "nyse" (default), "none" to refresh the same
+    around the clock, or the path of a JSON calendar configuration.
+    """
+    global _default_calendar, _default_loaded
+    if not _default_loaded:
+        setting = os.getenv('FINPULL_CALENDAR', 'nyse').strip()
+        try:
+            if setting.lower() in ('none', 'off', '0'):
+                _default_calendar = None
+            elif setting.lower() == 'nyse':
+                _default_calendar = TradingCalendar()
+            else:
+                _default_calendar = TradingCalendar.from_file(setting)
+        except Exception as e:
+            logger.warning(f"Could not load trading calendar {setting}: {e}; using NYSE")
+            _default_calendar = TradingCalendar()
+        _default_loaded = True
+    return _default_calendar
@@ -0,0 +1,148 @@
+"""
+Persistent cache of tickers that no source could find
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from ..utils.retry import http_status
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 86400  # seconds; listings change rarely, but new symbols do appear
+
+
+class TickerNotFoundError(Exception):
+    """Raised when every source reports that a ticker does not exist"""
+
+
+def is_not_found(error: BaseException) -> bool:
+    """Check whether a source error says the ticker does not exist (rather than the source failing)"""
+    return isinstance(error, TickerNotFoundError) or http_status(error) == 404
+
+
+class NegativeCache:
+    """
+    Remembers invalid or delisted tickers so they are rejected without a fetch
+
+    Entries expire after ttl seconds. The cache is a small JSON file, rewritten
+    whenever an entry is added or removed.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL, read_only: bool = False):
+        """
+        Initialize the cache
+
+        Args:
+            path: JSON file to persist entries in (None keeps them in memory only)
+            ttl: Seconds a ticker stays rejected (0 or less disables the cache)
+            read_only: Never write the file
+        """
+        self.path = path
+        self.ttl = ttl
+        self.read_only = read_only
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            now = time.time()
+            self.entries = {t: e for t, e in entries.items() if now - e.get('failed_at', 0) < self.ttl}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable negative cache {self.path}: {e}")
+
+    def _save(self):
+        """Write the entries to disk (caller holds the lock)"""
+        if not self.path or self.read_only:
+            return
+        try:
+            temp_file = f"{self.path}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(temp_file, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save negative cache {self.path}: {e}")
+
+    def check(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a ticker
+
+        Returns:
+            The entry ('failed_at', 'error', 'failures') if the ticker is known to be
+            invalid and the entry has not expired, otherwise None
+        """
+        if self.ttl <= 0:
+            return None
+        ticker = ticker.upper().strip()
+        with self._lock:
+            entry = self.entries.get(ticker)
+            if entry is None:
+                return None
+            if time.time() - entry['failed_at'] >= self.ttl:
+                del self.entries[ticker]
+                return None
+            self.hits += 1
+            return entry
+
+    def add(self, ticker: str, error: str):
+        """Remember a ticker that no source could find"""
+        if self.ttl <= 0:
+            return
+        ticker = ticker.upper().strip()
+        with self._lock:
+            failures = self.entries.get(ticker, {}).get('failures', 0) + 1
+            self.entries[ticker] = {'failed_at': time.time(), 'error': error, 'failures': failures}
+            self._save()
+        logger.info(f"Remembering {ticker} as not found for {self.ttl / 3600:g}h")
+
+    def discard(self, ticker: str) -> bool:
+        """Forget a ticker, e.g. after it has been listed; returns whether it was cached"""
+        ticker = ticker.upper().strip()
+        with self._lock:
+            if self.entries.pop(ticker, None) is None:
+                return False
+            self._save()
+            return True
+
+    def clear(self):
+        """Forget every ticker"""
+        with self._lock:
+            self.entries.clear()
+            self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of cached tickers, the TTL and the rejections served"""
+        with self._lock:
+            return {
+                'entries': len(self.entries),
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'path': self.path,
+            }
+
+
+def negative_cache_for_storage(storage_file: str, read_only: bool = False) -> NegativeCache:
+    """
+    Create the negative cache of a storage file, kept in <storage_file>.negative_cache.json
+
+    FINPULL_NEGATIVE_CACHE_TTL overrides the TTL in seconds (0 disables the cache).
+    """
+    ttl = float(DEFAULT_TTL)
+    env_ttl = os.getenv('FINPULL_NEGATIVE_CACHE_TTL')
+    if env_ttl:
+        try:
+            ttl = float(env_ttl)
+        except ValueError:
+            logger.warning("Ignoring invalid FINPULL_NEGATIVE_CACHE_TTL value")
+    path = f"{os.path.abspath(storage_file)}.negative_cache.json"
+    return NegativeCache(path, ttl, read_only)
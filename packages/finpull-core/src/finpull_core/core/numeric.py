@@ -0,0 +1,96 @@
+"""
+Conversion of FinancialData display strings into canonical numeric values
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+# Unit of every numeric FinancialData field, in declaration order.
+# Percentages are expressed in percentage points (12.3 means 12.3%).
+FIELD_UNITS: Dict[str, str] = {
+    'price': 'usd',
+    'change_5y': 'percent',
+    'dividend_yield': 'percent',
+    'dividend_ttm': 'usd',
+    'eps_ttm': 'usd',
+    'eps_next_year': 'usd',
+    'eps_next_5y': 'percent',
+    'revenue': 'usd',
+    'revenue_growth_5y': 'percent',
+    'operating_margin': 'percent',
+    'profit_margin': 'percent',
+    'roa': 'percent',
+    'roe': 'percent',
+    'roi': 'percent',
+    'pe_ratio': 'ratio',
+    'ps_ratio': 'ratio',
+    'pb_ratio': 'ratio',
+    'total_assets': 'usd',
+    'total_liabilities': 'usd',
+    'market_cap': 'usd',
+    'volume': 'shares',
+    'avg_volume': 'shares',
+    'beta': 'ratio',
+}
+
+NUMERIC_FIELDS = list(FIELD_UNITS)
+
+MISSING_VALUES = frozenset(('', 'N/A', '-', 'None', 'nan', 'NaN', 'inf', 'Infinity'))
+
+SUFFIX_MULTIPLIERS = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+
+@lru_cache(maxsize=65536)
+def _parse(value: str, unit: Optional[str]) -> Optional[float]:
+    text = value.strip().replace(',', '').replace('$', '')
+    if text in MISSING_VALUES:
+        return None
+
+    is_percent = text.endswith('%')
+    if is_percent:
+        text = text[:-1]
+
+    multiplier = SUFFIX_MULTIPLIERS.get(text[-1:].upper())
+    if multiplier:
+        text = text[:-1]
+
+    try:
+        number = float(text) * (multiplier or 1)
+    except ValueError:
+        return None
+    if math.isnan(number) or math.isinf(number):
+        return None
+
+    # Finviz percentages carry a "%" sign; Yahoo reports bare fractions (0.25 = 25%)
+    if unit == 'percent' and not is_percent:
+        number *= 100
+    return number
+
+
+def parse_number(value: Union[str, float, int, None], unit: Optional[str] = None) -> Optional[float]:
+    """
+    Convert a display value to a number
+
+    Handles Finviz strings ("2.95T", "12.3%", "1,234,567") and raw Yahoo values.
+    Results are memoized, so repeated values are only parsed once.
+
+    Args:
+        value: Display string or number
+        unit: Unit of the field (see FIELD_UNITS); "percent" scales bare fractions to percentage points
+
+    Returns:
+        The numeric value, or None when the value is missing or unparseable
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        return float(value) * 100 if unit == 'percent' else float(value)
+    return _parse(str(value), unit)
+
+
+def parse_field(field: str, value: Union[str, float, int, None]) -> Optional[float]:
+    """Convert the display value of a FinancialData field to a number in the field's unit"""
+    return parse_number(value, FIELD_UNITS.get(field))
@@ -0,0 +1,192 @@
+"""
+Concurrent refresh engine for fetching many tickers with a bounded worker pool
+"""
+
+import time
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .data_sources import DataSourceManager
+from .storage import DataStorage
+from ..utils.retry import RetryLaterError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of refreshing a single ticker"""
+    ticker: str
+    success: bool
+    error: Optional[str] = None
+    duration: float = 0.0  # seconds spent fetching, over every attempt
+    attempts: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+@dataclass
+class RefreshReport:
+    """Per-ticker results of a refresh run"""
+    results: List[RefreshResult] = field(default_factory=list)
+    elapsed: float = 0.0  # wall-clock seconds for the whole run
+
+    @property
+    def successful(self) -> List[str]:
+        """Tickers that were refreshed successfully"""
+        return [r.ticker for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[str]:
+        """Tickers that failed to refresh"""
+        return [r.ticker for r in self.results if not r.success]
+
+    @property
+    def retried(self) -> List[str]:
+        """Tickers that needed more than one attempt"""
+        return [r.ticker for r in self.results if r.attempts > 1]
+
+    def get_result(self, ticker: str) -> Optional[RefreshResult]:
+        """Get the result for a specific ticker"""
+        ticker = ticker.upper().strip()
+        for result in self.results:
+            if result.ticker == ticker:
+                return result
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "total": len(self.results),
+            "completed": len(self.successful),
+            "failed": len(self.failed),
+            "retried": len(self.retried),
+            "elapsed": self.elapsed,
+            "details": [r.to_dict() for r in self.results],
+        }
+
+
+class RefreshEngine:
+    """
+    Refreshes tickers concurrently while storage writes stay on the calling thread
+
+    Transient source failures do not block a worker: the data source raises
+    RetryLaterError and the ticker is queued again behind the remaining tickers
+    once its backoff delay has passed. The requeued fetch only asks the sources
+    that failed, keeping what the others returned.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, data_source: DataSourceManager, storage: DataStorage,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the refresh engine
+
+        Args:
+            data_source: Source manager used to fetch ticker data
+            storage: Storage updated with every successful fetch
+            max_workers: Size of the worker pool (per-source limits still apply)
+        """
+        self.data_source = data_source
+        self.storage = storage
+        self.max_workers = max(1, max_workers or self.DEFAULT_MAX_WORKERS)
+
+    def _fetch(self, ticker: str, resume: Optional[RetryLaterError] = None):
+        """Fetch one ticker, returning (data, error, duration)"""
+        start = time.time()
+        try:
+            data = self.data_source.fetch_data(ticker, defer_retries=True, resume=resume)
+            return data, None, time.time() - start
+        except Exception as e:
+            return None, e, time.time() - start
+
+    def run(self, tickers: List[str],
+            progress_callback: Optional[Callable[[str, str], None]] = None) -> RefreshReport:
+        """
+        Refresh the given tickers
+
+        Args:
+            tickers: Ticker symbols to refresh
+            progress_callback: Function called with (ticker, status) where status is
+                "loading", "retrying", "complete" or "error"
+
+        Returns:
+            RefreshReport with one result per ticker, in input order
+        """
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+        report = RefreshReport()
+        if not tickers:
+            return report
+
+        start = time.time()
+        results: Dict[str, RefreshResult] = {}
+        durations: Dict[str, float] = {}
+        attempts: Dict[str, int] = {}
+        workers = min(self.max_workers, len(tickers))
+
+        # Storage writes are batched so the whole run costs a single save
+        with self.storage.batch(), \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="finpull-refresh") as executor:
+            futures = {}
+            for ticker in tickers:
+                if progress_callback:
+                    progress_callback(ticker, "loading")
+                futures[executor.submit(self._fetch, ticker)] = ticker
+                attempts[ticker] = 1
+
+            # Deferred retries as (ready_at, ticker, RetryLaterError), earliest first
+            retries: List[Tuple[float, str, RetryLaterError]] = []
+            while futures or retries:
+                now = time.monotonic()
+                while retries and retries[0][0] <= now:
+                    _, ticker, resume = heapq.heappop(retries)
+                    futures[executor.submit(self._fetch, ticker, resume)] = ticker
+                    attempts[ticker] += 1
+
+                timeout = max(0.0, retries[0][0] - now) if retries else None
+                if not futures:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    ticker = futures.pop(future)
+                    data, error, duration = future.result()
+                    durations[ticker] = durations.get(ticker, 0.0) + duration
+
+                    if isinstance(error, RetryLaterError):
+                        logger.info(f"{error}, requeued")
+                        heapq.heappush(retries, (time.monotonic() + error.delay, ticker, error))
+                        if progress_callback:
+                            progress_callback(ticker, "retrying")
+                        continue
+
+                    if error is None:
+                        try:
+                            self.storage.update_cache(ticker, data)
+                        except Exception as e:
+                            error = e
+
+                    duration = durations[ticker]
+                    if error is None:
+                        logger.info(f"Refreshed data for {ticker}")
+                        results[ticker] = RefreshResult(ticker, True, duration=duration, attempts=attempts[ticker])
+                    else:
+                        logger.error(f"Failed to refresh {ticker}: {error}")
+                        results[ticker] = RefreshResult(ticker, False, str(error), duration, attempts[ticker])
+
+                    if progress_callback:
+                        progress_callback(ticker, "complete" if error is None else "error")
+
+        # Component fetch times outlive this run, so the next one can reuse them
+        self.data_source.save_components()
+
+        report.results = [results[t] for t in tickers]
+        report.elapsed = time.time() - start
+        return report
@@ -0,0 +1,262 @@
+"""
+Recording of source responses to fixture directories and offline replay
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+from .data_models import FinancialData
+from .finviz_parser import FinvizParser
+from .negative_cache import TickerNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Fixture layout: <directory>/finviz/<TICKER>.html and <directory>/yahoo/<TICKER>.json
+SOURCES = ("finviz", "yahoo")
+
+_SNAPSHOT_VALUES = {
+    "Market Cap": "2.95T", "P/E": "31.20", "P/S": "7.65", "P/B": "47.10",
+    "EPS (ttm)": "6.08", "EPS next Y": "7.10", "EPS next 5Y": "10.40%",
+    "Dividend TTM": "0.97 (0.51%)", "ROA": "28.30%", "ROE": "160.60%", "ROIC": "56.20%",
+    "Profit Margin": "26.30%", "Oper. Margin": "30.70%", "Sales": "385.60B",
+    "Perf 5Y": "320.45%", "Volume": "52,164,387", "Avg Volume": "58.42M", "Beta": "1.29",
+}
+
+
+class FixtureRecorder:
+    """Saves raw source responses so they can be replayed later"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the recorder
+
+        Args:
+            directory: Fixture directory (created if needed)
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        for source in SOURCES:
+            os.makedirs(os.path.join(directory, source), exist_ok=True)
+
+    def _write(self, path: str, text: str):
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_file, path)
+
+    def record_finviz(self, ticker: str, html: str):
+        """Save a Finviz quote page"""
+        try:
+            self._write(os.path.join(self.directory, "finviz", f"{ticker.upper()}.html"), html)
+        except Exception as e:
+            logger.warning(f"Could not record Finviz page for {ticker}: {e}")
+
+    def record_yahoo(self, ticker: str, component: str, values: Dict[str, str]):
+        """
+        Save the values of one Yahoo component
+
+        yfinance does not expose its raw HTTP responses, so the values extracted
+        from each component are recorded instead.
+        """
+        path = os.path.join(self.directory, "yahoo", f"{ticker.upper()}.json")
+        try:
+            with self._lock:
+                components = {}
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        components = json.load(f)
+                components[component] = values
+                self._write(path, json.dumps(components, indent=2))
+        except Exception as e:
+            logger.warning(f"Could not record Yahoo {component} for {ticker}: {e}")
+
+
+def recorder_from_env() -> Optional[FixtureRecorder]:
+    """Create a recorder when FINPULL_RECORD_DIR is set"""
+    directory = os.getenv('FINPULL_RECORD_DIR')
+    return FixtureRecorder(directory) if directory else None
+
+
+class ReplaySource:
+    """
+    Serves recorded responses in place of a live source
+
+    Each replay source stands in for one live source and carries its name, so
+    per-source concurrency limits and data merging behave as they do live.
+    Finviz pages go through the regular parser; a synthetic delay of
+    latency + uniform(0, jitter) seconds stands in for the network.
+    """
+
+    def __init__(self, directory: str, source: str = "finviz", latency: float = 0.0,
+                 jitter: float = 0.0, parser: Optional[FinvizParser] = None):
+        """
+        Initialize the replay source
+
+        Args:
+            directory: Fixture directory written by FixtureRecorder or generate_fixtures
+            source: Live source to replay ("finviz" or "yahoo")
+            latency: Fixed delay per request, in seconds
+            jitter: Maximum extra random delay per request, in seconds
+            parser: Finviz parser (default: fastest installed backend)
+        """
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source: {source}. Available sources: {', '.join(SOURCES)}")
+        self.directory = directory
+        self.source = source
+        self.latency = latency
+        self.jitter = jitter
+        self._parser = parser
+        self._lock = threading.Lock()
+        self.requests = 0
+        # Named like the live fetcher it replaces (see DataSourceManager.get_source_name)
+        self.__name__ = f"_fetch_from_{source}"
+
+    def __repr__(self) -> str:
+        return f"ReplaySource({self.directory!r}, source={self.source!r}, latency={self.latency})"
+
+    def _delay(self) -> float:
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter > 0 else 0.0)
+
+    def _load(self, ticker: str) -> FinancialData:
+        ticker = ticker.upper()
+        with self._lock:
+            self.requests += 1
+        extension = "html" if self.source == "finviz" else "json"
+        path = os.path.join(self.directory, self.source, f"{ticker}.{extension}")
+        if not os.path.exists(path):
+            raise TickerNotFoundError(f"Ticker '{ticker}' not found - it may be invalid or delisted")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if self.source == "finviz":
+            if self._parser is None:
+                self._parser = FinvizParser()
+            return self._parser.parse(ticker, text)
+
+        data = FinancialData(ticker=ticker)
+        for values in json.loads(text).values():
+            for field, value in values.items():
+                setattr(data, field, value)
+        return data
+
+    def __call__(self, ticker: str) -> FinancialData:
+        """Fetch a ticker from the fixtures, blocking for the synthetic latency"""
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        return self._load(ticker)
+
+    def as_async(self):
+        """Get an awaitable fetcher for AsyncDataSourceManager that sleeps without blocking the loop"""
+        async def fetch(ticker: str) -> FinancialData:
+            delay = self._delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return self._load(ticker)
+
+        fetch.__name__ = self.__name__
+        return fetch
+
+
+def synthetic_ticker(index: int) -> str:
+    """Deterministic four-letter ticker for a fixture index (AAAA, AAAB, ...)"""
+    letters = []
+    for _ in range(4):
+        index, rest = divmod(index, 26)
+        letters.append(chr(ord('A') + rest))
+    return "".join(reversed(letters))
+
+
+def synthetic_quote_page(ticker: str, seed: int = 0, filler: int = 100) -> str:
+    """
+    Build a page with the Finviz quote layout
+
+    Args:
+        ticker: Ticker shown on the page
+        seed: Seed for the generated values
+        filler: Number of news rows; navigation, insider rows and scripts scale with it
+            (100 gives a page of about 100 KB, like a real quote page)
+    """
+    rng = random.Random(f"{ticker}-{seed}")
+    labels = list(_SNAPSHOT_VALUES) + [f"Metric {i}" for i in range(72 - len(_SNAPSHOT_VALUES))]
+    cells = []
+    for label in labels:
+        value = _SNAPSHOT_VALUES.get(label, f"{rng.uniform(-50, 500):.2f}")
+        cells.append(f'<td class="snapshot-td2" align="left">{label}</td>'
+                     f'<td class="snapshot-td2"><b><span>{value}</span></b></td>')
+    snapshot_rows = "".join(f'<tr class="table-dark-row">{"".join(cells[i:i + 6])}</tr>'
+                            for i in range(0, len(cells), 6))
+
+    nav = "".join(f'<li><a href="/screener.ashx?v={i}" class="nav-link">Screener {i}</a></li>'
+                  for i in range(filler + filler // 5))
+    news = "".join(
+        f'<tr class="cursor-pointer has-label"><td width="130" align="right">Dec-{i % 28 + 1:02d}-23 '
+        f'{i % 12 + 1:02d}:{i % 60:02d}AM</td><td align="left"><div class="news-link-container">'
+        f'<div class="news-link-left"><a class="tab-link-news" href="https://example.com/news/{i}">'
+        f'{ticker} headline number {i} about quarterly results and guidance</a></div>'
+        f'<div class="news-link-right"><span>(Source {i % 7})</span></div></div></td></tr>'
+        for i in range(filler))
+    insiders = "".join(
+        f'<tr class="insider-row"><td><a href="/insider.ashx?oc={i}">Insider {i}</a></td>'
+        f'<td>Officer</td><td>Nov {i % 28 + 1}</td><td>Sale</td><td>{rng.uniform(100, 200):.2f}</td>'
+        f'<td>{rng.randint(1000, 90000):,}</td><td>{rng.randint(100000, 9000000):,}</td></tr>'
+        for i in range(filler * 2 // 5))
+    script = "var data = " + json.dumps([rng.random() for _ in range(filler * 20)]) + ";"
+    footer = "".join(f'<a href="/page{i}">Footer link {i}</a>' for i in range(filler * 3 // 5))
+
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{ticker} Stock Price and Quote</title>
+<script>{script}</script><style>.nav-link{{color:#333}} .snapshot-td2{{padding:2px}}</style></head>
+<body><header><nav><ul class="nav">{nav}</ul></nav></header>
+<div class="quote-header">
+  <h1 class="quote-header_ticker-wrapper_ticker">{ticker}</h1>
+  <h2 class="quote-header_ticker-wrapper_company"><a href="https://example.com">{ticker} Holdings Inc.</a></h2>
+  <div class="flex space-x-0.5 overflow-hidden">
+    <a href="screener.ashx?v=111&amp;f=sec_technology" class="tab-link">Technology</a>
+    <a href="screener.ashx?v=111&amp;f=ind_consumerelectronics" class="tab-link">Consumer Electronics</a>
+    <a href="screener.ashx?v=111&amp;f=geo_usa" class="tab-link">USA</a>
+  </div>
+  <div class="quote-price"><strong class="quote-price_wrapper_price">{rng.uniform(10, 900):.2f}</strong></div>
+</div>
+<div class="chart"><canvas id="chart"></canvas></div>
+<table width="100%" class="js-snapshot-table snapshot-table2 screener_snapshot-table-body">{snapshot_rows}</table>
+<table class="fullview-news-outer news-table">{news}</table>
+<table class="body-table styled-table-new insider-trading">{insiders}</table>
+<footer>{footer}</footer>
+</body></html>"""
+
+
+def generate_fixtures(directory: str, count: int, seed: int = 0, filler: int = 10,
+                      yahoo: bool = True) -> List[str]:
+    """
+    Write synthetic fixtures for load testing without network access
+
+    Args:
+        directory: Fixture directory
+        count: Number of tickers
+        seed: Seed for the generated values
+        filler: Page filler passed to synthetic_quote_page (10 keeps pages around 18 KB)
+        yahoo: Also write Yahoo balance sheet fixtures
+
+    Returns:
+        The generated tickers
+    """
+    recorder = FixtureRecorder(directory)
+    tickers = [synthetic_ticker(i) for i in range(count)]
+    for ticker in tickers:
+        recorder.record_finviz(ticker, synthetic_quote_page(ticker, seed, filler))
+        if yahoo:
+            rng = random.Random(f"{ticker}-{seed}-yahoo")
+            assets = rng.uniform(1e9, 5e11)
+            values: Dict[str, Any] = {
+                'total_assets': str(assets),
+                'total_liabilities': str(assets * rng.uniform(0.2, 0.9)),
+            }
+            recorder.record_yahoo(ticker, 'balance_sheet', values)
+    return tickers
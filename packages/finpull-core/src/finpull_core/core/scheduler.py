@@ -0,0 +1,333 @@
+"""
+Long-running refresh scheduler that only refreshes tickers that are due
+"""
+
+import os
+import json
+import time
+import heapq
+import logging
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .data_models import FinancialData
+from .market_calendar import TradingCalendar, get_trading_calendar
+from .refresh import RefreshEngine, RefreshReport
+from ..utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """
+    Keeps cached data fresh by refreshing each ticker when it falls due
+
+    Tickers sit in a priority queue keyed by their next due time, so a run only
+    fetches what is due, most overdue first. A ticker is due interval seconds
+    after its data was fetched; after a failed refresh it is retried sooner
+    (retry_delay, doubling per failure, never later than interval). At most
+    max_rate tickers per second are refreshed, so data is never older than
+    about interval plus the time needed to work through a backlog.
+
+    While the market is closed prices cannot move, so the trading calendar
+    stretches the interval up to the next open (at most the calendar's
+    off_hours_factor times the interval).
+
+    The queue is saved to queue_file (<storage_file>.schedule.json by default),
+    so a restarted scheduler picks up where it left off instead of refreshing
+    everything.
+    """
+
+    MAX_SLEEP = 60.0  # seconds between checks for tickers added from elsewhere
+
+    def __init__(self, scraper, interval: float = 3600.0, max_rate: Optional[float] = None,
+                 burst: Optional[int] = None, max_workers: Optional[int] = None,
+                 retry_delay: float = 300.0, queue_file: Optional[str] = None,
+                 calendar: Optional[TradingCalendar] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            scraper: FinancialDataScraper whose tickers are kept fresh
+            interval: Seconds after which a ticker's data is due for a refresh
+            max_rate: Tickers refreshed per second at most (None: only the per-source
+                rate limits apply)
+            burst: Tickers that may be refreshed at once when the budget has built
+                up (default: a minute's worth of max_rate)
+            max_workers: Refresh worker pool size (default: the scraper's)
+            retry_delay: Delay before retrying a failed ticker, in seconds
+            queue_file: JSON file the queue is persisted in
+            calendar: Trading calendar for off-hours intervals (default: the data
+                source's; FINPULL_CALENDAR=none refreshes at the same pace around the clock)
+        """
+        self.scraper = scraper
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.calendar = calendar if calendar is not None else getattr(
+            scraper.data_source, 'calendar', get_trading_calendar())
+        self.max_workers = max_workers or scraper.max_workers
+        # Named after the storage file, so stores sharing a directory keep separate queues
+        self.queue_file = queue_file or f"{os.path.abspath(scraper.storage.storage_file)}.schedule.json"
+
+        rate = max_rate or 0.0
+        self.budget = TokenBucket(rate, burst if burst is not None else max(1.0, rate * 60))
+
+        # due[ticker] is authoritative; heap entries that disagree with it are stale
+        self._due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listening = False
+
+        self.runs = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.last_run: Optional[float] = None
+
+        self._load()
+        self.sync()
+
+    # Queue
+
+    def _push(self, ticker: str, due: float):
+        """Schedule a ticker (caller holds the lock)"""
+        self._due[ticker] = due
+        heapq.heappush(self._heap, (due, ticker))
+
+    def _initial_due(self, ticker: str, data: Optional[FinancialData], now: float) -> float:
+        """Due time of a ticker that is not in the queue yet, from the age of its data"""
+        if data is None:
+            return now
+        age = data.get_age_minutes() * 60
+        if age == float('inf'):
+            return now
+        fetched_at = now - age
+        return fetched_at + self.next_interval(ticker, fetched_at)
+
+    def next_interval(self, ticker: str, now: float) -> float:
+        """Seconds until a ticker refreshed at now is due again, stretched while the market is closed"""
+        if self.calendar is None:
+            return self.interval
+        return self.calendar.refresh_interval(self.interval, now)
+
+    def sync(self):
+        """Schedule tickers added to storage and drop removed ones"""
+        storage = self.scraper.storage
+        tickers = storage.get_all_tickers()
+        with self._lock:
+            missing = [t for t in tickers if t not in self._due]
+            removed = set(self._due).difference(tickers)
+        if not missing and not removed:
+            return
+
+        now = time.time()
+        initial = {t: self._initial_due(t, storage.get_cached_data(t), now) for t in missing}
+        with self._lock:
+            for ticker in removed:
+                self._due.pop(ticker, None)
+                self._failures.pop(ticker, None)
+            for ticker, due in initial.items():
+                self._push(ticker, due)
+        logger.info(f"Scheduler queue: {len(missing)} added, {len(removed)} removed")
+
+    def _on_storage_change(self, event: str, ticker: Optional[str], data: Optional[FinancialData]):
+        """Keep the queue in step with refreshes and removals made outside the scheduler"""
+        with self._lock:
+            if event == "update" and ticker:
+                self._failures.pop(ticker, None)
+                self._push(ticker, time.time() + self.next_interval(ticker, time.time()))
+            elif event == "delete" and ticker:
+                self._due.pop(ticker, None)
+                self._failures.pop(ticker, None)
+            elif event in ("clear", "reload"):
+                self._due.clear()
+                self._failures.clear()
+                self._heap = []
+        # Reloaded tickers are rescheduled by the next sync()
+
+    def _take_due(self, now: float) -> List[str]:
+        """Pop the due tickers, most overdue first, as far as the rate budget allows"""
+        batch: List[str] = []
+        taken = set()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, ticker = self._heap[0]
+                if self._due.get(ticker) != due or ticker in taken:
+                    heapq.heappop(self._heap)  # superseded or duplicate entry
+                    continue
+                if not self.budget.try_acquire():
+                    break
+                heapq.heappop(self._heap)
+                batch.append(ticker)
+                taken.add(ticker)
+        return batch
+
+    def _reschedule(self, report: RefreshReport):
+        """Schedule each refreshed ticker's next refresh"""
+        now = time.time()
+        with self._lock:
+            for result in report.results:
+                ticker = result.ticker
+                if ticker not in self._due:
+                    continue  # removed while it was being refreshed
+                if result.success:
+                    self._failures.pop(ticker, None)
+                    self._push(ticker, now + self.next_interval(ticker, now))
+                else:
+                    failures = self._failures.get(ticker, 0) + 1
+                    self._failures[ticker] = failures
+                    delay = min(self.interval, self.retry_delay * 2 ** (failures - 1))
+                    self._push(ticker, now + delay)
+
+    # Persistence
+
+    def _load(self):
+        """Restore the queue saved by a previous run"""
+        if not os.path.exists(self.queue_file):
+            return
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            # A shorter interval than last time takes effect right away
+            now = time.time()
+            with self._lock:
+                for ticker, entry in saved.get('queue', {}).items():
+                    self._push(ticker, min(float(entry['due']), now + self.next_interval(ticker, now)))
+                    if entry.get('failures'):
+                        self._failures[ticker] = int(entry['failures'])
+            logger.info(f"Restored scheduler queue of {len(self._due)} tickers from {self.queue_file}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable scheduler queue {self.queue_file}: {e}")
+
+    def save(self):
+        """Write the queue to queue_file"""
+        with self._lock:
+            queue = {ticker: {'due': due, 'failures': self._failures.get(ticker, 0)}
+                     for ticker, due in self._due.items()}
+        try:
+            temp_file = f"{self.queue_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'interval': self.interval, 'saved_at': time.time(), 'queue': queue}, f)
+            os.replace(temp_file, self.queue_file)
+        except Exception as e:
+            logger.warning(f"Could not save scheduler queue {self.queue_file}: {e}")
+
+    # Running
+
+    def run_pending(self, progress_callback: Optional[Callable[[str, str], None]] = None) -> Optional[RefreshReport]:
+        """
+        Refresh the tickers that are due now
+
+        Returns:
+            RefreshReport of the run, or None if nothing was due
+        """
+        self.sync()
+        batch = self._take_due(time.time())
+        if not batch:
+            return None
+
+        logger.info(f"Scheduler refreshing {len(batch)} due ticker(s)")
+        engine = RefreshEngine(self.scraper.data_source, self.scraper.storage, self.max_workers)
+        report = engine.run(batch, progress_callback)
+        self._reschedule(report)
+        self.save()
+
+        self.runs += 1
+        self.refreshed += len(report.successful)
+        self.failed += len(report.failed)
+        self.last_run = time.time()
+        return report
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the next ticker is due (0 if one is overdue, None if the queue is empty)"""
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.time())
+
+    def _sleep_time(self) -> float:
+        wait = self.seconds_until_due()
+        if wait is None:
+            return self.MAX_SLEEP
+        if wait == 0 and self.budget.rate > 0:
+            # Overdue tickers are waiting for the rate budget to refill
+            wait = 1.0 / self.budget.rate
+        return min(wait, self.MAX_SLEEP)
+
+    def run_forever(self, progress_callback: Optional[Callable[[str, str], None]] = None,
+                    report_callback: Optional[Callable[[RefreshReport], None]] = None):
+        """
+        Refresh due tickers until stop() is called
+
+        Args:
+            progress_callback: Passed to every refresh run
+            report_callback: Called with the report of every run
+        """
+        self._stop.clear()
+        if not self._listening:
+            self.scraper.storage.add_listener(self._on_storage_change)
+            self._listening = True
+        try:
+            while not self._stop.is_set():
+                try:
+                    report = self.run_pending(progress_callback)
+                    if report is not None and report_callback:
+                        report_callback(report)
+                except Exception as e:
+                    logger.error(f"Scheduled refresh failed: {e}")
+                self._stop.wait(self._sleep_time())
+        finally:
+            self.scraper.storage.remove_listener(self._on_storage_change)
+            self._listening = False
+            self.save()
+
+    def start(self) -> bool:
+        """Run the scheduler on a background thread; returns False if it is already running"""
+        if self.is_running():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="finpull-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Refresh scheduler started ({len(self._due)} tickers, interval {self.interval:g}s)")
+        return True
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the scheduler after the current run and save the queue"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        """Check whether the background thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue size, due and overdue counts, and run counters"""
+        now = time.time()
+        with self._lock:
+            dues = list(self._due.values())
+            failing = sum(1 for n in self._failures.values() if n)
+        overdue = [now - due for due in dues if due <= now]
+        next_due = self.seconds_until_due()
+        return {
+            'running': self.is_running(),
+            'interval': self.interval,
+            'current_interval': round(self.next_interval('', now), 1),
+            'market': self.calendar.get_status(now) if self.calendar is not None else None,
+            'max_rate': self.budget.rate or None,
+            'queued': len(dues),
+            'due': len(overdue),
+            'max_overdue': round(max(overdue), 1) if overdue else 0.0,
+            'next_due_in': round(next_due, 1) if next_due is not None else None,
+            'failing': failing,
+            'runs': self.runs,
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+            'last_run': self.last_run,
+            'queue_file': self.queue_file,
+        }
@@ -1,9 +1,14 @@
+import os
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .data_models import FinancialData
 from .data_sources import DataSourceManager
+from .negative_cache import NegativeCache, TickerNotFoundError, negative_cache_for_storage
 from .storage import DataStorage
+from .refresh import RefreshEngine, RefreshReport
+from .table import FinancialTable
 from ..utils.compatibility import HAS_OPENPYXL
 
 if HAS_OPENPYXL:
@@ -14,17 +19,67 @@ logger = logging.getLogger(__name__)
 
 class FinancialDataScraper:
     
-    def __init__(self, storage_file: str = None):
+    def __init__(self, storage_file: str = None, max_workers: Optional[int] = None,
+                 source_concurrency: Optional[Dict[str, int]] = None,
+                 storage_backend: Optional[str] = None, read_only: bool = False):
         """
         Initialize the scraper
         
         Args:
             storage_file: Custom path for data storage file
+            max_workers: Worker pool size used when refreshing many tickers
+            source_concurrency: Per-source limit on in-flight requests
+            storage_backend: Storage backend name ("json", "journal" or "sqlite")
+            read_only: Open storage read-only for commands that only display or
+                export cached data; records are built only when read
         """
-        self.data_source = DataSourceManager()
-        self.storage = DataStorage(storage_file)
+        self.storage = DataStorage(storage_file, storage_backend, read_only=read_only)
+        self.source_concurrency = source_concurrency
+        self.max_workers = max_workers
+        self._data_source: Optional[DataSourceManager] = None
+        self._negative_cache: Optional[NegativeCache] = None
+        self._table: Optional[FinancialTable] = None
         
-        logger.info(f"FinancialDataScraper initialized with {self.data_source.get_source_count()} data sources")
+        logger.info(f"FinancialDataScraper initialized{' (read-only)' if read_only else ''}")
+    
+    @property
+    def data_source(self) -> DataSourceManager:
+        """Data source manager, created the first time data is fetched"""
+        if self._data_source is None:
+            component_file = None
+            if not self.storage.read_only:
+                component_file = f"{os.path.abspath(self.storage.storage_file)}.components.json"
+            self._data_source = DataSourceManager(self.source_concurrency, component_file=component_file)
+            logger.info(f"Initialized {self._data_source.get_source_count()} data sources")
+        return self._data_source
+    
+    @data_source.setter
+    def data_source(self, value: DataSourceManager):
+        self._data_source = value
+    
+    @property
+    def negative_cache(self) -> NegativeCache:
+        """Tickers recently found invalid or delisted, loaded the first time a ticker is added"""
+        if self._negative_cache is None:
+            self._negative_cache = negative_cache_for_storage(self.storage.storage_file, self.storage.read_only)
+        return self._negative_cache
+    
+    @negative_cache.setter
+    def negative_cache(self, value: NegativeCache):
+        self._negative_cache = value
+    
+    def check_not_found(self, ticker: str):
+        """
+        Reject a ticker that every source recently reported as not found
+        
+        Raises:
+            TickerNotFoundError: If the ticker is in the negative cache
+        """
+        entry = self.negative_cache.check(ticker)
+        if entry is not None:
+            failed_at = datetime.fromtimestamp(entry['failed_at']).strftime('%Y-%m-%d %H:%M')
+            raise TickerNotFoundError(f"Ticker '{ticker.upper().strip()}' not found - it may be invalid "
+                                      f"or delisted (cached since {failed_at})")
     
     def add_ticker(self, ticker: str) -> bool:
         """
@@ -37,50 +92,58 @@ class FinancialDataScraper:
             bool: True if ticker was added successfully
             
         Raises:
+            TickerNotFoundError: If no source knows the ticker (also raised without
+                a fetch for tickers in the negative cache)
             Exception: If data fetching fails
         """
         # Validate ticker format first
         if not self.validate_ticker(ticker):
             raise ValueError(f"'{ticker}' is not a valid ticker symbol")
         
-        if self.storage.add_ticker(ticker):
-            try:
-                data = self.data_source.fetch_data(ticker)
-                self.storage.update_cache(ticker, data)
-                logger.info(f"Successfully added and fetched data for {ticker}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to fetch data for {ticker}: {e}")
-                self.storage.remove_ticker(ticker)  # Remove if we can't fetch data
-                raise
-        else:
-            logger.info(f"Ticker {ticker} already exists")
-            return False
+        # Known-bad symbols are rejected without a network round trip
+        if not self.storage.has_ticker(ticker):
+            self.check_not_found(ticker)
+        
+        # Adding the ticker and caching its data is saved as a single write
+        with self.storage.batch():
+            if self.storage.add_ticker(ticker):
+                try:
+                    data = self.data_source.fetch_data(ticker)
+                    self.storage.update_cache(ticker, data)
+                    logger.info(f"Successfully added and fetched data for {ticker}")
+                    return True
+                except Exception as e:
+                    logger.error(f"Failed to fetch data for {ticker}: {e}")
+                    self.storage.remove_ticker(ticker)  # Remove if we can't fetch data
+                    if isinstance(e, TickerNotFoundError):
+                        self.negative_cache.add(ticker, str(e))
+                    raise
+            else:
+                logger.info(f"Ticker {ticker} already exists")
+                return False
     
-    def refresh_data(self, ticker: str = None):
+    def refresh_data(self, ticker: str = None, max_workers: Optional[int] = None,
+                     progress_callback: Optional[Callable[[str, str], None]] = None) -> RefreshReport:
         """
         Refresh data for a specific ticker or all tickers
         
         Args:
             ticker: Specific ticker to refresh, or None for all tickers
+            max_workers: Override the worker pool size for this refresh
+            progress_callback: Function called with (ticker, status) updates
+            
+        Returns:
+            RefreshReport with a result for every refreshed ticker
         """
         tickers_to_refresh = [ticker] if ticker else self.storage.get_all_tickers()
         
-        successful = 0
-        failed = 0
-        
-        for t in tickers_to_refresh:
-            try:
-                data = self.data_source.fetch_data(t)
-                self.storage.update_cache(t, data)
-                logger.info(f"Refreshed data for {t}")
-                successful += 1
-            except Exception as e:
-                logger.error(f"Failed to refresh {t}: {e}")
-                failed += 1
+        engine = RefreshEngine(self.data_source, self.storage, max_workers or self.max_workers)
+        report = engine.run(tickers_to_refresh, progress_callback)
         
         if ticker is None:
-            logger.info(f"Refresh complete: {successful} successful, {failed} failed")
+            logger.info(f"Refresh complete: {len(report.successful)} successful, "
+                        f"{len(report.failed)} failed in {report.elapsed:.1f}s")
+        return report
     
     def get_all_data(self) -> List[FinancialData]:
         """
@@ -96,6 +159,20 @@ class FinancialDataScraper:
                 all_data.append(cached_data)
         return all_data
     
+    def get_table(self) -> FinancialTable:
+        """
+        Get a columnar view of all cached data
+        
+        The table is built on first use and then kept in sync with storage,
+        so filters, sorts and aggregates don't walk FinancialData objects.
+        
+        Returns:
+            FinancialTable following this scraper's storage
+        """
+        if self._table is None:
+            self._table = FinancialTable.from_storage(self.storage)
+        return self._table
+    
     def get_ticker_data(self, ticker: str) -> Optional[FinancialData]:
         """
         Get data for a specific ticker
@@ -163,18 +240,54 @@ class FinancialDataScraper:
         """
         Get statistics about the scraper state
         
+        In read-only mode the data source sections are left out unless the data
+        source is already in use, since creating it costs more than the stats.
+        
         Returns:
             dict: Statistics including ticker counts, data sources, etc.
         """
         storage_stats = self.storage.get_stats()
+        history = self.storage.history.get_stats() if self.storage.history else None
+        if self.storage.read_only and self._data_source is None:
+            return {
+                **storage_stats,
+                'negative_cache': self.negative_cache.get_stats(),
+                'history': history
+            }
         source_info = self.data_source.get_source_info()
         
         return {
             **storage_stats,
             'data_sources': source_info,
-            'source_count': len(source_info)
+            'source_count': len(source_info),
+            'connection_pool': self.data_source.get_connection_stats(),
+            'rate_limits': self.data_source.get_rate_limit_stats(),
+            'request_coalescing': self.data_source.get_coalescing_stats(),
+            'http_cache': self.data_source.get_cache_stats(),
+            'field_freshness': self.data_source.get_component_stats(),
+            'source_health': self.data_source.get_health_stats(),
+            'retries': self.data_source.get_retry_stats(),
+            'negative_cache': self.negative_cache.get_stats(),
+            'history': history
         }
     
+    def get_history(self, ticker: str, field: str, start=None, end=None) -> List[Tuple[datetime, float]]:
+        """
+        Get recorded values of a numeric field over time
+        
+        Args:
+            ticker: Stock ticker symbol
+            field: Numeric FinancialData field, e.g. "price" or "pe_ratio"
+            start: Earliest timestamp to include (datetime or ISO string)
+            end: Latest timestamp to include
+            
+        Returns:
+            List of (timestamp, value) tuples in chronological order
+        """
+        if self.storage.history is None:
+            return []
+        return self.storage.history.get_history(ticker, field, start, end)
+    
     def cleanup_stale_data(self, max_age_hours: int = 24) -> int:
         """
         Remove stale cached data
@@ -228,4 +341,4 @@ class FinancialDataScraper:
         Returns:
             bool: True if ticker is being tracked
         """
-        return ticker.upper() in self.storage.get_all_tickers() 
\ No newline at end of file
+        return self.storage.has_ticker(ticker) 
\ No newline at end of file
@@ -1,19 +1,53 @@
 import json
 import os
 import csv
+import atexit
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
 
 from .data_models import FinancialData
+from .backends import ChangeSet, JSONBackend, LazyRecords, StorageBackend, create_backend
+from .history import HistoryStore
 
 logger = logging.getLogger(__name__)
 
 
+def _count_stale(timestamps: Iterable[str], max_age_minutes: int = 60) -> int:
+    """Count timestamps older than max_age_minutes, as FinancialData.is_stale would"""
+    # Naive ISO timestamps (what FinancialData writes) sort chronologically as strings
+    cutoff = (datetime.now() - timedelta(minutes=max_age_minutes)).isoformat()
+    stale = 0
+    for timestamp in timestamps:
+        if len(timestamp) >= 19 and timestamp[10] == 'T' and timestamp[-6] not in '+-' and timestamp[-1] != 'Z':
+            stale += timestamp < cutoff
+        else:
+            stale += FinancialData.age_minutes(timestamp) > max_age_minutes
+    return stale
+
+
 class DataStorage:
     """Handles data persistence"""
     
-    def __init__(self, storage_file: str = None):
+    def __init__(self, storage_file: str = None, backend: Optional[str] = None,
+                 read_only: bool = False):
+        """
+        Initialize storage
+        
+        Args:
+            storage_file: Custom path for the storage file
+            backend: Storage backend ("json", "journal" or "sqlite"); defaults to the
+                FINPULL_STORAGE_BACKEND environment variable, then to the
+                file extension (.db/.sqlite/.sqlite3 select SQLite)
+            read_only: Open without write access; cached records are only
+                built when they are read
+        """
+        if backend is None:
+            backend = os.getenv('FINPULL_STORAGE_BACKEND') or None
+        
+        migrate_from = None
         if storage_file is None:
             # Check environment override
             env_path = os.getenv('FINPULL_STORAGE_FILE')
@@ -28,25 +62,59 @@ class DataStorage:
                     # Fallback to current directory if home directory not writable
                     default_dir = os.getcwd()
                 storage_file = os.path.join(default_dir, 'financial_data.json')
+                if backend and backend.lower() == 'sqlite':
+                    # Pick up the default JSON store the first time SQLite is used
+                    migrate_from = storage_file
+                    storage_file = os.path.join(default_dir, 'financial_data.db')
         
         self.storage_file = storage_file
+        self.read_only = read_only
         self.data_cache: Dict[str, FinancialData] = {}
         self.tickers_list: List[str] = []
+        
+        # Write batching state
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._changes = ChangeSet()
+        self.write_behind_latency: Optional[float] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
+        
+        # Callbacks notified with (event, ticker, data) after every cache change
+        self._listeners: List[Callable[[str, Optional[str], Optional[FinancialData]], None]] = []
+        
+        is_new = not os.path.exists(storage_file)
+        self.backend: StorageBackend = create_backend(storage_file, backend, read_only)
+        if is_new and migrate_from and os.path.exists(migrate_from) and not read_only:
+            self.migrate_from_json(migrate_from)
+        
         self.load_data()
+        
+        # Every cached snapshot is also appended to the per-ticker history,
+        # kept in <storage_file>.history (read-only opens never record)
+        self.history: Optional[HistoryStore] = None
+        if not read_only and os.getenv('FINPULL_HISTORY', '1') != '0':
+            history_dir = f"{os.path.abspath(storage_file)}.history"
+            try:
+                self.history = HistoryStore(history_dir)
+            except Exception as e:
+                logger.warning(f"History disabled, cannot use {history_dir}: {e}")
+    
+    @property
+    def _dirty(self) -> bool:
+        """Whether there are changes that have not been written yet"""
+        return bool(self._changes)
     
     def load_data(self):
         """Load data from storage file"""
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tickers_list = data.get('tickers', [])
-                    
-                    # Convert dict data back to FinancialData objects
-                    cache_data = data.get('cache', {})
-                    for ticker, item_data in cache_data.items():
-                        self.data_cache[ticker] = FinancialData.from_dict(item_data)
-                        
+            if self.backend.exists():
+                tickers, cache = self.backend.load_lazy() if self.read_only else self.backend.load()
+                with self._lock:
+                    self.tickers_list = tickers
+                    self.data_cache = cache
+                    self._changes = ChangeSet()
+                    self._notify("reload")
                 logger.info(f"Loaded {len(self.tickers_list)} tickers from {self.storage_file}")
         except PermissionError as e:
             logger.error(f"Permission denied when reading storage file: {e}")
@@ -60,85 +128,212 @@ class DataStorage:
             self.data_cache = {}
             self.tickers_list = []
     
+    def add_listener(self, callback: Callable[[str, Optional[str], Optional[FinancialData]], None]):
+        """
+        Register a callback for cache changes
+        
+        The callback receives (event, ticker, data) where event is "update",
+        "delete", "clear" or "reload" (ticker and data are None for the last two).
+        """
+        with self._lock:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a cache change callback"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def _notify(self, event: str, ticker: Optional[str] = None, data: Optional[FinancialData] = None):
+        """Call the registered listeners (caller holds the lock)"""
+        for callback in self._listeners:
+            try:
+                callback(event, ticker, data)
+            except Exception as e:
+                logger.error(f"Storage listener error: {e}")
+    
+    def _check_writable(self):
+        """Refuse changes to read-only storage"""
+        if self.read_only:
+            raise PermissionError(f"Storage is open in read-only mode: {self.storage_file}")
+    
     def save_data(self):
-        """Save data to storage file"""
+        """Save all data to the storage backend"""
+        self._check_writable()
+        with self._lock:
+            self._changes = ChangeSet()
+            self.backend.save_all(self.tickers_list, self.data_cache)
+    
+    def _commit(self):
+        """Write pending changes to the storage backend (caller holds the lock)"""
         try:
-            from .. import __version__
-            
-            data = {
-                'tickers': self.tickers_list,
-                'cache': {ticker: data.to_dict() for ticker, data in self.data_cache.items()},
-                'last_updated': datetime.now().isoformat(),
-                'version': __version__
-            }
-
-            if os.path.exists(self.storage_file):
-                backup_file = f"{self.storage_file}.backup"
-                try:
-                    import shutil
-                    shutil.copy2(self.storage_file, backup_file)
-                except Exception as backup_error:
-                    logger.warning(f"Could not create backup: {backup_error}")
-
-            temp_file = f"{self.storage_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # Replace original file
-            os.replace(temp_file, self.storage_file)
-            logger.debug(f"Saved data to {self.storage_file}")
-            
-        except PermissionError as e:
-            logger.error(f"Permission denied when writing storage file: {e}")
-            print(f"⚠️  FinPull cannot save data due to permission error. Changes will not persist. Path: {self.storage_file}")
+            self.backend.commit(self._changes, self.tickers_list, self.data_cache)
         except Exception as e:
+            # Keep the changes pending so the next flush writes them again
             logger.error(f"Error saving data: {e}")
-            # Clean up temp file if it exists
-            temp_file = f"{self.storage_file}.tmp"
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            return
+        self._changes = ChangeSet()
+    
+    def migrate_from_json(self, json_file: str) -> int:
+        """
+        Import tickers and cached data from a JSON storage file
+        
+        Args:
+            json_file: Path of an existing JSON storage file
+            
+        Returns:
+            int: Number of tickers imported
+        """
+        self._check_writable()
+        tickers, cache = JSONBackend(json_file).load()
+        with self._lock:
+            self.backend.save_all(tickers, cache)
+            self.tickers_list = tickers
+            self.data_cache = cache
+            self._changes = ChangeSet()
+            self._notify("reload")
+        logger.info(f"Migrated {len(tickers)} tickers from {json_file} to {self.storage_file}")
+        return len(tickers)
+    
+    def close(self):
+        """Flush pending changes and release the storage backend"""
+        if not self.read_only:
+            self.flush()
+        self.backend.close()
+    
+    def _persist(self):
+        """Save now, or defer the write while batching or in write-behind mode"""
+        with self._lock:
+            if self._batch_depth > 0:
+                return
+            elif self.write_behind_latency is not None:
+                self._schedule_flush()
+            else:
+                self._commit()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Defer all writes until the outermost batch exits, then save once
+        
+        Example:
+            with storage.batch():
+                for ticker, data in results:
+                    storage.update_cache(ticker, data)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+    
+    def flush(self):
+        """Write pending changes to disk, if any"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._commit()
+    
+    def enable_write_behind(self, max_latency: float = 2.0):
+        """
+        Coalesce writes in the background instead of saving on every change
+        
+        Args:
+            max_latency: Maximum seconds a change may stay unsaved
+        """
+        with self._lock:
+            self.write_behind_latency = max(0.0, max_latency)
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+    
+    def disable_write_behind(self):
+        """Flush pending changes and go back to saving on every change"""
+        with self._lock:
+            self.write_behind_latency = None
+            self.flush()
+    
+    def _schedule_flush(self):
+        """Start the write-behind timer unless a flush is already pending"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.write_behind_latency, self._write_behind_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _write_behind_flush(self):
+        """Timer callback that flushes pending changes"""
+        with self._lock:
+            self._flush_timer = None
+            if self._batch_depth == 0:
+                self.flush()
+            elif self._dirty:
+                self._schedule_flush()
     
     def add_ticker(self, ticker: str) -> bool:
         """Add ticker to the list if not already present"""
+        self._check_writable()
         ticker = ticker.upper().strip()
-        if ticker and ticker not in self.tickers_list:
-            self.tickers_list.append(ticker)
-            self.save_data()
-            logger.info(f"Added ticker {ticker}")
-            return True
+        with self._lock:
+            if ticker and ticker not in self.tickers_list:
+                self.tickers_list.append(ticker)
+                self._changes.add_ticker(ticker)
+                self._persist()
+                logger.info(f"Added ticker {ticker}")
+                return True
         return False
     
     def remove_ticker(self, ticker: str):
         """Remove ticker from the list"""
+        self._check_writable()
         ticker = ticker.upper().strip()
-        if ticker in self.tickers_list:
-            self.tickers_list.remove(ticker)
-            if ticker in self.data_cache:
-                del self.data_cache[ticker]
-            self.save_data()
-            logger.info(f"Removed ticker {ticker}")
+        with self._lock:
+            if ticker in self.tickers_list:
+                self.tickers_list.remove(ticker)
+                if ticker in self.data_cache:
+                    del self.data_cache[ticker]
+                    self._notify("delete", ticker)
+                self._changes.remove_ticker(ticker)
+                self._persist()
+                logger.info(f"Removed ticker {ticker}")
     
     def clear_all(self):
         """Clear all tickers and cached data"""
-        self.tickers_list.clear()
-        self.data_cache.clear()
-        self.save_data()
+        self._check_writable()
+        with self._lock:
+            self.tickers_list.clear()
+            self.data_cache.clear()
+            self._changes.clear()
+            self._notify("clear")
+            self._persist()
         logger.info("Cleared all data")
     
     def update_cache(self, ticker: str, data: FinancialData):
         """Update cached data for a ticker"""
+        self._check_writable()
         ticker = ticker.upper().strip()
-        self.data_cache[ticker] = data
-        self.save_data()
+        with self._lock:
+            self.data_cache[ticker] = data
+            self._changes.upsert(ticker)
+            self._notify("update", ticker, data)
+            self._persist()
+        if self.history is not None:
+            self.history.record(data)
         logger.debug(f"Updated cache for {ticker}")
     
     def get_cached_data(self, ticker: str) -> Optional[FinancialData]:
         """Get cached data for a ticker"""
         return self.data_cache.get(ticker.upper())
     
+    def has_ticker(self, ticker: str) -> bool:
+        """Check if a ticker is tracked"""
+        return ticker.upper().strip() in self.tickers_list
+    
     def get_all_tickers(self) -> List[str]:
         """Get all ticker symbols"""
         return self.tickers_list.copy()
@@ -196,7 +391,11 @@ class DataStorage:
         """Get storage statistics"""
         total_tickers = len(self.tickers_list)
         cached_tickers = len(self.data_cache)
-        stale_count = sum(1 for data in self.data_cache.values() if data.is_stale())
+        if isinstance(self.data_cache, LazyRecords):
+            # Read-only: count from the stored timestamps instead of building every record
+            stale_count = _count_stale(self.data_cache.timestamps().values())
+        else:
+            stale_count = sum(1 for data in self.data_cache.values() if data.is_stale())
         
         return {
             'total_tickers': total_tickers,
@@ -204,25 +403,31 @@ class DataStorage:
             'missing_cache': total_tickers - cached_tickers,
             'stale_data': stale_count,
             'storage_file': self.storage_file,
-            'file_exists': os.path.exists(self.storage_file),
-            'file_size': os.path.getsize(self.storage_file) if os.path.exists(self.storage_file) else 0
+            'storage_backend': self.backend.name,
+            'read_only': self.read_only,
+            'file_exists': self.backend.exists(),
+            'file_size': self.backend.size()
         }
     
     def cleanup_stale_data(self, max_age_hours: int = 24):
         """Remove stale data from cache"""
+        self._check_writable()
         removed_count = 0
         tickers_to_remove = []
         
-        for ticker, data in self.data_cache.items():
-            if data.is_stale(max_age_hours * 60):  # Convert hours to minutes
-                tickers_to_remove.append(ticker)
-        
-        for ticker in tickers_to_remove:
-            del self.data_cache[ticker]
-            removed_count += 1
-        
-        if removed_count > 0:
-            self.save_data()
-            logger.info(f"Cleaned up {removed_count} stale records")
+        with self._lock:
+            for ticker, data in self.data_cache.items():
+                if data.is_stale(max_age_hours * 60):  # Convert hours to minutes
+                    tickers_to_remove.append(ticker)
+            
+            for ticker in tickers_to_remove:
+                del self.data_cache[ticker]
+                self._changes.delete_data(ticker)
+                self._notify("delete", ticker)
+                removed_count += 1
+            
+            if removed_count > 0:
+                self._persist()
+                logger.info(f"Cleaned up {removed_count} stale records")
         
         return removed_count 
\ No newline at end of file
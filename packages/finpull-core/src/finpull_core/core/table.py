@@ -0,0 +1,320 @@
+"""
+Columnar in-memory table of cached FinancialData
+"""
+
+import math
+import logging
+import operator
+import threading
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from .data_models import FinancialData
+from .numeric import NUMERIC_FIELDS
+from ..utils.compatibility import HAS_NUMPY
+
+np = None  # NumPy is imported by the first FinancialTable
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ('ticker', 'company_name', 'sector', 'timestamp')
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# A filter condition such as ("pe_ratio", "<", 20)
+Condition = Tuple[str, str, Any]
+
+
+class FinancialTable:
+    """
+    Stores each field of the ticker universe as a contiguous column
+
+    Numeric fields are float64 arrays (NaN where missing) and are processed
+    with NumPy when it is installed; text fields are plain lists. Rows are
+    addressed by ticker, and removals swap the last row into the gap so every
+    change is O(1).
+    """
+
+    def __init__(self, records: Optional[Iterable[FinancialData]] = None):
+        """
+        Initialize the table
+
+        Args:
+            records: Optional FinancialData objects to load
+        """
+        global np
+        if HAS_NUMPY and np is None:
+            import numpy as np
+
+        self._lock = threading.RLock()
+        self._storage = None
+        self._clear_columns()
+        for data in records or []:
+            self.upsert(data)
+
+    @classmethod
+    def from_storage(cls, storage) -> 'FinancialTable':
+        """Build a table from a DataStorage cache and keep it in sync with later changes"""
+        table = cls()
+        table.attach(storage)
+        return table
+
+    def attach(self, storage):
+        """Load the cache of a DataStorage and follow its changes"""
+        self.detach()
+        self._storage = storage
+        storage.add_listener(self._on_storage_change)
+        self._reload()
+
+    def detach(self):
+        """Stop following the attached DataStorage"""
+        if self._storage is not None:
+            self._storage.remove_listener(self._on_storage_change)
+            self._storage = None
+
+    def _clear_columns(self):
+        self._index: Dict[str, int] = {}
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_FIELDS}
+        self._numeric: Dict[str, array] = {name: array('d') for name in NUMERIC_FIELDS}
+
+    def _reload(self):
+        with self._lock:
+            self._clear_columns()
+            for ticker, data in self._storage.get_all_cached_data().items():
+                self.upsert(data, ticker)
+
+    def _on_storage_change(self, event: str, ticker: Optional[str], data: Optional[FinancialData]):
+        if event == "update":
+            self.upsert(data, ticker)
+        elif event == "delete":
+            self.remove(ticker)
+        elif event == "clear":
+            self.clear()
+        elif event == "reload":
+            self._reload()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._index
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers in row order"""
+        with self._lock:
+            return list(self._text['ticker'])
+
+    def upsert(self, data: FinancialData, ticker: Optional[str] = None):
+        """Insert or replace the row of a ticker"""
+        ticker = (ticker or data.ticker).upper().strip()
+        values = data.numeric()
+        text = {name: getattr(data, name) for name in TEXT_FIELDS}
+        text['ticker'] = ticker
+
+        with self._lock:
+            row = self._index.get(ticker)
+            if row is None:
+                self._index[ticker] = len(self._index)
+                for name, column in self._text.items():
+                    column.append(text[name])
+                for name, column in self._numeric.items():
+                    value = values[name]
+                    column.append(math.nan if value is None else value)
+            else:
+                for name, column in self._text.items():
+                    column[row] = text[name]
+                for name, column in self._numeric.items():
+                    value = values[name]
+                    column[row] = math.nan if value is None else value
+
+    def remove(self, ticker: str):
+        """Remove the row of a ticker, if present"""
+        ticker = ticker.upper().strip()
+        with self._lock:
+            row = self._index.pop(ticker, None)
+            if row is None:
+                return
+            last = len(self._index)
+            columns = list(self._text.values()) + list(self._numeric.values())
+            if row != last:
+                # Move the last row into the freed slot
+                for column in columns:
+                    column[row] = column[last]
+                self._index[self._text['ticker'][row]] = row
+            for column in columns:
+                column.pop()
+
+    def clear(self):
+        """Remove all rows"""
+        with self._lock:
+            self._clear_columns()
+
+    def column(self, field: str):
+        """
+        Get a copy of a column
+
+        Returns:
+            NumPy float64 array (array('d') without NumPy) for numeric fields,
+            list of strings for text fields
+        """
+        with self._lock:
+            if field in self._text:
+                return list(self._text[field])
+            if field not in self._numeric:
+                raise ValueError(f"Unknown field: {field}")
+            if HAS_NUMPY:
+                return np.array(self._numeric[field], dtype=np.float64)
+            return array('d', self._numeric[field])
+
+    def _mask(self, conditions: Iterable[Condition]) -> List[bool]:
+        """Evaluate conditions row by row into a boolean mask (caller holds the lock)"""
+        mask = None
+        for field, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator: {op}. Available operators: {', '.join(OPERATORS)}")
+            compare = OPERATORS[op]
+
+            if field in self._text:
+                column = self._text[field]
+                result = [compare(v, value) for v in column]
+                if HAS_NUMPY:
+                    result = np.array(result, dtype=bool)
+            elif field in self._numeric:
+                if HAS_NUMPY:
+                    # NaN compares False, so missing values never match
+                    with np.errstate(invalid='ignore'):
+                        result = compare(np.frombuffer(self._numeric[field], dtype=np.float64), value)
+                else:
+                    result = [compare(v, value) for v in self._numeric[field]]
+            else:
+                raise ValueError(f"Unknown field: {field}")
+
+            if mask is None:
+                mask = result
+            elif HAS_NUMPY:
+                mask = mask & result
+            else:
+                mask = [a and b for a, b in zip(mask, result)]
+
+        if mask is None:
+            return np.ones(len(self._index), dtype=bool) if HAS_NUMPY else [True] * len(self._index)
+        return mask
+
+    def filter(self, *conditions: Condition) -> List[str]:
+        """
+        Get tickers matching all conditions
+
+        Example:
+            table.filter(("pe_ratio", "<", 20), ("sector", "==", "Technology"))
+        """
+        with self._lock:
+            mask = self._mask(conditions)
+            tickers = self._text['ticker']
+            if HAS_NUMPY:
+                return [tickers[i] for i in np.flatnonzero(mask)]
+            return [t for t, keep in zip(tickers, mask) if keep]
+
+    def sort(self, field: str, descending: bool = False, limit: Optional[int] = None,
+             where: Iterable[Condition] = ()) -> List[str]:
+        """
+        Get tickers ordered by a field; missing values always sort last
+
+        Args:
+            field: Field to sort by
+            descending: Sort from largest to smallest
+            limit: Return at most this many tickers
+            where: Optional filter conditions
+        """
+        with self._lock:
+            tickers = self._text['ticker']
+            rows = self._rows(where)
+
+            if field in self._text:
+                column = self._text[field]
+                present = [i for i in rows if column[i] not in ('N/A', '')]
+                missing = [i for i in rows if column[i] in ('N/A', '')]
+                present.sort(key=lambda i: column[i].lower(), reverse=descending)
+                order = present + missing
+            elif field in self._numeric:
+                if HAS_NUMPY:
+                    values = np.frombuffer(self._numeric[field], dtype=np.float64)[rows]
+                    # argsort places NaN last; negate for a descending order with NaN still last
+                    order = rows[np.argsort(-values if descending else values, kind='stable')]
+                else:
+                    column = self._numeric[field]
+                    present = [i for i in rows if not math.isnan(column[i])]
+                    missing = [i for i in rows if math.isnan(column[i])]
+                    present.sort(key=lambda i: column[i], reverse=descending)
+                    order = present + missing
+            else:
+                raise ValueError(f"Unknown field: {field}")
+
+            if limit is not None:
+                order = order[:limit]
+            return [tickers[i] for i in order]
+
+    def _rows(self, where: Iterable[Condition]):
+        """Row numbers matching the conditions (caller holds the lock)"""
+        mask = self._mask(where)
+        if HAS_NUMPY:
+            return np.flatnonzero(mask)
+        return [i for i, keep in enumerate(mask) if keep]
+
+    def aggregate(self, field: str, where: Iterable[Condition] = ()) -> Dict[str, Optional[float]]:
+        """
+        Compute count, sum, mean, min and max of a numeric field, ignoring missing values
+
+        Args:
+            field: Numeric field name
+            where: Optional filter conditions, e.g. [("pe_ratio", ">", 0)]
+        """
+        if field not in self._numeric:
+            raise ValueError(f"Unknown numeric field: {field}")
+
+        with self._lock:
+            rows = self._rows(where)
+            if HAS_NUMPY:
+                values = np.frombuffer(self._numeric[field], dtype=np.float64)[rows]
+                values = values[~np.isnan(values)]
+                if values.size == 0:
+                    return {'count': 0, 'sum': None, 'mean': None, 'min': None, 'max': None}
+                total = float(values.sum())
+                return {
+                    'count': int(values.size),
+                    'sum': total,
+                    'mean': total / values.size,
+                    'min': float(values.min()),
+                    'max': float(values.max()),
+                }
+
+            column = self._numeric[field]
+            values = [column[i] for i in rows if not math.isnan(column[i])]
+        if not values:
+            return {'count': 0, 'sum': None, 'mean': None, 'min': None, 'max': None}
+        total = math.fsum(values)
+        return {
+            'count': len(values),
+            'sum': total,
+            'mean': total / len(values),
+            'min': min(values),
+            'max': max(values),
+        }
+
+    def value_counts(self, field: str, where: Iterable[Condition] = ()) -> Dict[str, int]:
+        """Count rows per distinct value of a text field"""
+        if field not in self._text:
+            raise ValueError(f"Unknown text field: {field}")
+        counts: Dict[str, int] = {}
+        with self._lock:
+            column = self._text[field]
+            for i in self._rows(where):
+                counts[column[i]] = counts.get(column[i], 0) + 1
+        return counts
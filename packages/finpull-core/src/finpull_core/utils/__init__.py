@@ -4,7 +4,7 @@ Utility modules for FinPull
 
 # Only import compatibility to avoid circular imports
 from .compatibility import (
-    HAS_REQUESTS, HAS_BS4, HAS_YFINANCE, HAS_TKINTER, HAS_OPENPYXL,
+    HAS_REQUESTS, HAS_BS4, HAS_YFINANCE, HAS_TKINTER, HAS_OPENPYXL, HAS_AIOHTTP, HAS_NUMPY,
     check_web_scraping_support, check_gui_support, check_excel_support,
     get_missing_dependencies, print_dependency_status
 )
@@ -15,6 +15,8 @@ __all__ = [
     "HAS_YFINANCE",
     "HAS_TKINTER",
     "HAS_OPENPYXL",
+    "HAS_AIOHTTP",
+    "HAS_NUMPY",
     "check_web_scraping_support",
     "check_gui_support", 
     "check_excel_support",
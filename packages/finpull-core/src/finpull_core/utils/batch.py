@@ -6,8 +6,10 @@ import logging
 from typing import List, Dict, Any
 
 from ..core.data_models import FinancialData
+from ..core.table import FinancialTable
 from .compatibility import (
-    HAS_REQUESTS, HAS_BS4, HAS_YFINANCE, HAS_TKINTER, HAS_OPENPYXL
+    HAS_REQUESTS, HAS_BS4, HAS_YFINANCE, HAS_TKINTER, HAS_OPENPYXL, HAS_AIOHTTP, HAS_NUMPY,
+    HAS_LXML, HAS_SELECTOLAX
 )
 
 logger = logging.getLogger(__name__)
@@ -31,16 +33,17 @@ def batch_fetch_tickers(tickers: List[str]) -> List[FinancialData]:
     
     logger.info(f"Starting batch fetch for {len(tickers)} tickers")
     
-    for ticker in tickers:
-        try:
-            scraper.add_ticker(ticker)
-            data = scraper.storage.get_cached_data(ticker)
-            if data:
-                results.append(data)
-        except ValueError as e:
-            logger.error(f"Invalid ticker {ticker}: {e}")
-        except Exception as e:
-            logger.error(f"Failed to fetch {ticker}: {e}")
+    with scraper.storage.batch():
+        for ticker in tickers:
+            try:
+                scraper.add_ticker(ticker)
+                data = scraper.storage.get_cached_data(ticker)
+                if data:
+                    results.append(data)
+            except ValueError as e:
+                logger.error(f"Invalid ticker {ticker}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to fetch {ticker}: {e}")
     
     logger.info(f"Batch fetch complete: {len(results)}/{len(tickers)} successful")
     return results
@@ -58,6 +61,9 @@ def get_available_features() -> Dict[str, bool]:
         "yahoo_finance": HAS_YFINANCE,
         "gui": HAS_TKINTER,
         "excel_export": HAS_OPENPYXL,
+        "async_http": HAS_AIOHTTP,
+        "vectorized_table": HAS_NUMPY,
+        "fast_html_parser": HAS_LXML or HAS_SELECTOLAX,
         "json_export": True,
         "csv_export": True
     }
@@ -152,26 +158,17 @@ def get_ticker_performance_summary(data_list: List[FinancialData]) -> Dict[str,
     # Extract numeric values where possible
     pe_ratios = []
     prices = []
-    market_caps = []
     
     for data in data_list:
-        # Try to extract P/E ratios
-        try:
-            if data.pe_ratio != "N/A" and data.pe_ratio:
-                pe_val = float(data.pe_ratio.replace('%', ''))
-                if pe_val > 0:  # Valid P/E ratio
-                    pe_ratios.append(pe_val)
-        except (ValueError, AttributeError):
-            pass
+        values = data.numeric()
         
-        # Try to extract prices
-        try:
-            if data.price != "N/A" and data.price:
-                price_val = float(data.price.replace('$', '').replace(',', ''))
-                if price_val > 0:
-                    prices.append(price_val)
-        except (ValueError, AttributeError):
-            pass
+        pe_val = values['pe_ratio']
+        if pe_val is not None and pe_val > 0:  # Valid P/E ratio
+            pe_ratios.append(pe_val)
+        
+        price_val = values['price']
+        if price_val is not None and price_val > 0:
+            prices.append(price_val)
     
     # Calculate statistics
     summary = {
@@ -198,4 +195,49 @@ def get_ticker_performance_summary(data_list: List[FinancialData]) -> Dict[str,
         summary["avg_price"] = sum(prices) / len(prices)
         summary["price_range"] = [min(prices), max(prices)]
     
-    return summary 
\ No newline at end of file
+    return summary
+
+
+def get_table_performance_summary(table: FinancialTable) -> Dict[str, Any]:
+    """
+    Get the same performance summary as get_ticker_performance_summary from a table
+    
+    Use it with scraper.get_table(), which stays in sync with storage, so repeated
+    summaries aggregate the typed columns instead of reading every record.
+    
+    Args:
+        table: FinancialTable to summarize
+        
+    Returns:
+        Dictionary with performance statistics
+    """
+    if not len(table):
+        return {"error": "No data provided"}
+    
+    summary = {
+        "total_tickers": len(table),
+        "sectors": {},
+        "avg_pe_ratio": None,
+        "avg_price": None,
+        "price_range": None,
+        "pe_range": None
+    }
+    
+    # Sector distribution
+    for sector, count in table.value_counts("sector").items():
+        sector = sector if sector != "N/A" else "Unknown"
+        summary["sectors"][sector] = summary["sectors"].get(sector, 0) + count
+    
+    # P/E statistics (only positive P/E ratios are meaningful)
+    pe_stats = table.aggregate("pe_ratio", where=[("pe_ratio", ">", 0)])
+    if pe_stats["count"]:
+        summary["avg_pe_ratio"] = pe_stats["mean"]
+        summary["pe_range"] = [pe_stats["min"], pe_stats["max"]]
+    
+    # Price statistics
+    price_stats = table.aggregate("price", where=[("price", ">", 0)])
+    if price_stats["count"]:
+        summary["avg_price"] = price_stats["mean"]
+        summary["price_range"] = [price_stats["min"], price_stats["max"]]
+    
+    return summary 
@@ -2,37 +2,27 @@
 Compatibility checking for different environments and dependencies
 """
 
-# Platform detection for compatibility
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
+import importlib.util
 
-try:
-    from bs4 import BeautifulSoup
-    HAS_BS4 = True
-except ImportError:
-    HAS_BS4 = False
 
-try:
-    import yfinance as yf
-    HAS_YFINANCE = True
-except ImportError:
-    HAS_YFINANCE = False
+def _has_module(name: str) -> bool:
+    """Check if a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import tkinter as tk
-    from tkinter import ttk, messagebox, filedialog
-    HAS_TKINTER = True
-except ImportError:
-    HAS_TKINTER = False
 
-try:
-    from openpyxl import Workbook
-    HAS_OPENPYXL = True
-except ImportError:
-    HAS_OPENPYXL = False
+# Feature detection only locates the packages; they are imported on first use
+HAS_REQUESTS = _has_module("requests")
+HAS_BS4 = _has_module("bs4")
+HAS_YFINANCE = _has_module("yfinance")
+HAS_AIOHTTP = _has_module("aiohttp")
+HAS_NUMPY = _has_module("numpy")
+HAS_TKINTER = _has_module("tkinter") and _has_module("_tkinter")
+HAS_OPENPYXL = _has_module("openpyxl")
+HAS_LXML = _has_module("lxml")
+HAS_SELECTOLAX = _has_module("selectolax")
 
 def check_web_scraping_support():
     """Check if web scraping is supported"""
@@ -60,6 +50,10 @@ def get_missing_dependencies():
         missing.append("tkinter (python3-tk)")
     if not HAS_OPENPYXL:
         missing.append("openpyxl")
+    if not HAS_AIOHTTP:
+        missing.append("aiohttp")
+    if not HAS_NUMPY:
+        missing.append("numpy")
     
     return missing
 
@@ -75,6 +69,9 @@ def get_available_features():
         "yahoo_finance": HAS_YFINANCE,
         "gui": HAS_TKINTER,
         "excel_export": HAS_OPENPYXL,
+        "async_http": HAS_AIOHTTP,
+        "vectorized_table": HAS_NUMPY,
+        "fast_html_parser": HAS_LXML or HAS_SELECTOLAX,
         "json_export": True,
         "csv_export": True
     }
@@ -87,6 +84,10 @@ def print_dependency_status():
     print(f"  yfinance: {'✓' if HAS_YFINANCE else '✗'}")
     print(f"  tkinter: {'✓' if HAS_TKINTER else '✗'}")
     print(f"  openpyxl: {'✓' if HAS_OPENPYXL else '✗'}")
+    print(f"  aiohttp: {'✓' if HAS_AIOHTTP else '✗'}")
+    print(f"  numpy: {'✓' if HAS_NUMPY else '✗'}")
+    print(f"  lxml: {'✓' if HAS_LXML else '✗'}")
+    print(f"  selectolax: {'✓' if HAS_SELECTOLAX else '✗'}")
     
     missing = get_missing_dependencies()
     if missing:
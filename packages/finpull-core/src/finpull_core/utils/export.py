@@ -9,10 +9,16 @@ from datetime import datetime
 from ..core.data_models import FinancialData
 from .compatibility import HAS_OPENPYXL
 
-if HAS_OPENPYXL:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
+Workbook = Font = PatternFill = Alignment = get_column_letter = None
+
+
+def _import_openpyxl():
+    """Import openpyxl on first use so that importing this module stays cheap"""
+    global Workbook, Font, PatternFill, Alignment, get_column_letter
+    if Workbook is None:
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,7 @@ class ExcelExporter:
     def __init__(self):
         if not HAS_OPENPYXL:
             raise ImportError("openpyxl is required for Excel export functionality")
+        _import_openpyxl()
     
     def export_data(self, data_list: List[FinancialData], filename: Optional[str] = None) -> str:
         """
@@ -131,7 +138,7 @@ class ExcelExporter:
             adjusted_width = min(max(max_length + 2, 12), 50)
             ws.column_dimensions[column_letter].width = adjusted_width
     
-    def _add_summary_sheet(self, wb: Workbook, data_list: List[FinancialData]):
+    def _add_summary_sheet(self, wb: 'Workbook', data_list: List[FinancialData]):
         """Add a summary sheet with basic statistics"""
         ws = wb.create_sheet(title="Summary")
         
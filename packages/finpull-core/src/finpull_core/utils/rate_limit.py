@@ -0,0 +1,145 @@
+"""
+Token-bucket rate limiting shared by every data source manager in the process
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _default_finviz_rate() -> float:
+    """Finviz requests per second, honouring FINPULL_RATE_LIMIT (seconds between requests)"""
+    try:
+        delay = float(os.getenv('FINPULL_RATE_LIMIT', '1.0'))
+    except ValueError:
+        logger.warning("Ignoring invalid FINPULL_RATE_LIMIT value")
+        delay = 1.0
+    return 1.0 / delay if delay > 0 else 0.0
+
+
+# Default (requests per second, burst capacity) for each source
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "finviz": (_default_finviz_rate(), 3),
+    "yahoo": (5.0, 10),
+}
+
+
+class TokenBucket:
+    """Thread- and asyncio-safe token bucket that allows short bursts up to its capacity"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second (0 or less disables limiting)
+            capacity: Maximum number of tokens that can accumulate for a burst
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.acquired = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accumulated since the last update"""
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, borrowing against future refills if necessary
+
+        Returns:
+            Seconds the caller must wait before using the reserved tokens
+        """
+        with self._lock:
+            self.acquired += 1
+            if self.rate <= 0:
+                return 0.0
+            self._refill(time.monotonic())
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+            return wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if they are available right now"""
+        with self._lock:
+            if self.rate > 0:
+                self._refill(time.monotonic())
+                if self.tokens < tokens:
+                    return False
+                self.tokens -= tokens
+            self.acquired += 1
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available, returning the time spent waiting"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wait for tokens without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def configure(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """Change the refill rate and/or burst capacity"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if rate is not None:
+                self.rate = rate
+            if capacity is not None:
+                self.capacity = max(1.0, capacity)
+                self.tokens = min(self.tokens, self.capacity)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the bucket configuration and usage counters"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'available': max(0.0, self.tokens),
+                'acquired': self.acquired,
+                'total_wait': self.waited,
+            }
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str) -> TokenBucket:
+    """Get the process-wide token bucket for a source, creating it on first use"""
+    with _limiters_lock:
+        limiter = _limiters.get(source)
+        if limiter is None:
+            rate, capacity = DEFAULT_RATE_LIMITS.get(source, (0.0, 1))
+            limiter = _limiters[source] = TokenBucket(rate, capacity)
+        return limiter
+
+
+def configure_rate_limit(source: str, rate: Optional[float] = None, capacity: Optional[float] = None):
+    """
+    Configure the shared rate limit of a source for every scraper in the process
+
+    Args:
+        source: Source name ("finviz", "yahoo")
+        rate: Requests per second (0 disables limiting)
+        capacity: Burst size
+    """
+    get_rate_limiter(source).configure(rate, capacity)
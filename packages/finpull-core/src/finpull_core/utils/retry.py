@@ -0,0 +1,232 @@
+"""
+Retry policies with capped exponential backoff, jitter and retry budgets, shared by every
+data source manager in the process
+"""
+
+import random
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limiting and transient server errors (403 means blocked)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RetryLaterError(Exception):
+    """
+    Raised instead of sleeping when retries are deferred to the caller
+
+    The caller (e.g. the refresh engine) should fetch the ticker again with
+    this error as resume once delay seconds have passed. The error carries the
+    state of the fetch so far: the attempts made by each source still to be
+    retried, and the results and final errors of the other sources, so only
+    the sources that failed are asked again.
+    """
+
+    def __init__(self, ticker: str, delay: float, attempt: int, cause: Exception,
+                 source: Optional[str] = None, attempts: Optional[Dict[int, int]] = None,
+                 results: Optional[Dict[int, Any]] = None, errors: Optional[Dict[int, Exception]] = None):
+        on_source = f" on {source}" if source else ""
+        super().__init__(f"Retrying {ticker}{on_source} in {delay:.1f}s after attempt {attempt}: {cause}")
+        self.ticker = ticker
+        self.delay = delay
+        self.attempt = attempt
+        self.cause = cause
+        self.source = source
+        self.attempts = attempts or {}  # source index -> attempts made so far
+        self.results = results or {}    # source index -> data already fetched
+        self.errors = errors or {}      # source index -> error that is not retried
+
+
+def http_status(error: BaseException) -> Optional[int]:
+    """Get the HTTP status of a requests/aiohttp error, if it carries one"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Check whether an error without an HTTP status is a timeout, connection failure or rate limit"""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    # requests and aiohttp connection errors derive from OSError; yfinance has YFRateLimitError
+    return isinstance(error, OSError) or 'RateLimit' in type(error).__name__
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether an error is transient: 429, 5xx, timeouts and connection failures"""
+    status = http_status(error)
+    if status is not None:
+        return status in RETRY_STATUS_CODES
+    return is_transient_error(error)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Get the Retry-After delay of an error response in seconds (delta-seconds or HTTP date)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None)
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried
+
+    Delays grow exponentially from base_delay up to max_delay with full jitter
+    (a uniform delay between 0 and the cap), so clients that failed together
+    do not retry together. A Retry-After header sets the minimum delay; when it
+    asks for more than max_delay the request is not retried.
+
+    Retries draw on a budget: each first attempt deposits budget_ratio tokens,
+    up to budget_reserve, and each retry spends one. A source that keeps failing
+    therefore sees at most budget_ratio extra requests per request once the
+    reserve is spent, instead of max_attempts times the load.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                 budget_ratio: float = 0.2, budget_reserve: float = 10.0):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts: Attempts per request, including the first (1 disables retries)
+            base_delay: Backoff cap for the first retry, in seconds
+            max_delay: Upper bound for any retry delay, in seconds
+            budget_ratio: Retry tokens earned per first attempt
+            budget_reserve: Maximum (and initial) number of retry tokens
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.tokens = budget_reserve
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self.retry_after_honored = 0
+        self.gave_up = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Count a first attempt and deposit its share of the retry budget"""
+        with self._lock:
+            self.requests += 1
+            self.tokens = min(self.budget_reserve, self.tokens + self.budget_ratio)
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retry number attempt (1 for the first retry)"""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Get the delay before retrying a failed request
+
+        Args:
+            attempt: Attempts made so far, including the one that failed
+            error: Exception raised by the failed attempt
+
+        Returns:
+            Seconds to wait before the next attempt, or None if it should not be retried
+        """
+        if not is_retryable(error):
+            return None
+        with self._lock:
+            if attempt >= self.max_attempts:
+                self.gave_up += 1
+                return None
+            server_delay = retry_after(error)
+            if server_delay is not None and server_delay > self.max_delay:
+                self.gave_up += 1
+                return None
+            if self.tokens < 1:
+                self.budget_exhausted += 1
+                return None
+            self.tokens -= 1
+            self.retries += 1
+            delay = self.backoff(attempt)
+            if server_delay is not None:
+                self.retry_after_honored += 1
+                delay = max(delay, server_delay)
+            return delay
+
+    def configure(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                  max_delay: Optional[float] = None, budget_ratio: Optional[float] = None,
+                  budget_reserve: Optional[float] = None):
+        """Change the attempts, backoff and/or budget settings"""
+        with self._lock:
+            if max_attempts is not None:
+                self.max_attempts = max(1, max_attempts)
+            if base_delay is not None:
+                self.base_delay = base_delay
+            if max_delay is not None:
+                self.max_delay = max_delay
+            if budget_ratio is not None:
+                self.budget_ratio = budget_ratio
+            if budget_reserve is not None:
+                self.budget_reserve = budget_reserve
+                self.tokens = min(self.tokens, budget_reserve)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the policy settings and retry counters"""
+        with self._lock:
+            return {
+                'max_attempts': self.max_attempts,
+                'base_delay': self.base_delay,
+                'max_delay': self.max_delay,
+                'budget': round(self.tokens, 2),
+                'requests': self.requests,
+                'retries': self.retries,
+                'retry_after_honored': self.retry_after_honored,
+                'budget_exhausted': self.budget_exhausted,
+                'gave_up': self.gave_up,
+            }
+
+
+_policies: Dict[str, RetryPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_retry_policy(source: str) -> RetryPolicy:
+    """Get the process-wide retry policy for a source, creating it on first use"""
+    with _policies_lock:
+        policy = _policies.get(source)
+        if policy is None:
+            policy = _policies[source] = RetryPolicy()
+        return policy
+
+
+def configure_retry(source: str, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                    max_delay: Optional[float] = None, budget_ratio: Optional[float] = None,
+                    budget_reserve: Optional[float] = None):
+    """
+    Configure the retry policy of a source for every scraper in the process
+
+    Args:
+        source: Source name ("finviz", "yahoo")
+        max_attempts: Attempts per request, including the first (1 disables retries)
+        base_delay: Backoff cap for the first retry, in seconds
+        max_delay: Upper bound for any retry delay, in seconds
+        budget_ratio: Retry tokens earned per first attempt
+        budget_reserve: Maximum number of retry tokens
+    """
+    get_retry_policy(source).configure(max_attempts, base_delay, max_delay, budget_ratio, budget_reserve)
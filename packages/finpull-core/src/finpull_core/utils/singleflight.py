@@ -0,0 +1,127 @@
+"""
+Single-flight coalescing of concurrent calls for the same key
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """An in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class _AsyncCall:
+    """An in-flight coroutine, run as its own task, and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time
+
+    Callers that arrive while a call for the same key is in flight wait for it
+    and receive the same result (or exception) instead of starting their own.
+    Thread-based and asyncio callers are tracked separately, and asyncio calls
+    are only shared within one event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[asyncio.AbstractEventLoop, Dict[Hashable, _AsyncCall]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs), or join the call already running for key
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await fn(*args, **kwargs), or join the awaitable already running for key
+
+        The call runs as its own task that every caller awaits through a shield,
+        so cancelling one caller (e.g. a wait_for timeout) does not cancel the
+        others. The task is only cancelled once no caller is waiting for it.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            call = calls.get(key)
+            if call is None:
+                call = calls[key] = _AsyncCall(asyncio.ensure_future(fn(*args, **kwargs)))
+                call.task.add_done_callback(lambda task: self._async_done(loop, key, call))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done():
+                with self._lock:
+                    call.waiters -= 1
+                    abandoned = call.waiters == 0
+                if abandoned:
+                    call.task.cancel()
+            raise
+
+    def _async_done(self, loop: asyncio.AbstractEventLoop, key: Hashable, call: _AsyncCall):
+        """Forget a finished async call"""
+        with self._lock:
+            calls = self._async_calls.get(loop, {})
+            if calls.get(key) is call:
+                del calls[key]
+                if not calls:
+                    del self._async_calls[loop]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved when every caller was gone
+            call.task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get execution and coalescing counters"""
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls) + sum(len(calls) for calls in self._async_calls.values()),
+            }
@@ -0,0 +1,52 @@
+"""
+Tests for the per-source circuit breaker
+"""
+
+import asyncio
+
+from finpull_core.core.async_sources import AsyncDataSourceManager
+from finpull_core.core.data_models import FinancialData
+from finpull_core.core.health import (
+    CLOSED, HALF_OPEN, SourceHealth, configure_circuit_breaker, get_source_health
+)
+
+
+def test_release_probe_lets_the_next_request_probe():
+    health = SourceHealth("test", failure_threshold=1, cooldown=0)
+    health.record(0.1, ConnectionError("down"))
+    assert health.allow_request()  # cooldown over: this request is the probe
+    assert health.state == HALF_OPEN
+    assert not health.allow_request()
+
+    health.release_probe()
+    assert health.allow_request()
+    health.record(0.1)
+    assert health.state == CLOSED
+
+
+def test_cancelled_probe_does_not_lock_the_source_out():
+    async def slow(ticker):
+        await asyncio.sleep(10)
+        return FinancialData(ticker=ticker)
+
+    slow.__name__ = "_fetch_from_probetest"
+    configure_circuit_breaker("probetest", failure_threshold=1, cooldown=0)
+    health = get_source_health("probetest")
+    health.reset()
+    health.record(0.1, ConnectionError("down"))
+
+    async def run():
+        manager = AsyncDataSourceManager()
+        manager.sources = [slow]
+        task = asyncio.ensure_future(manager._fetch_from_source_async(0, slow, "AAPL"))
+        await asyncio.sleep(0.05)
+        assert health.state == HALF_OPEN
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    assert health.allow_request()
+    health.reset()
@@ -0,0 +1,45 @@
+"""
+Tests for deferred retries across data sources
+"""
+
+import pytest
+
+from finpull_core.core.data_models import FinancialData
+from finpull_core.core.data_sources import DataSourceManager
+from finpull_core.utils.retry import RetryLaterError, configure_retry, get_retry_policy
+
+
+def _source(name, calls, failures=0, **values):
+    def fetch(ticker):
+        calls.append(ticker)
+        if len(calls) <= failures:
+            raise ConnectionError(f"{name} down")
+        return FinancialData(ticker=ticker, **values)
+
+    fetch.__name__ = f"_fetch_from_{name}"
+    return fetch
+
+
+def test_requeued_fetch_only_retries_the_failed_source():
+    configure_retry("retryfirst", max_attempts=3, base_delay=0, budget_reserve=10)
+    configure_retry("retrysecond", max_attempts=3, base_delay=0, budget_reserve=10)
+    first_calls, second_calls = [], []
+    manager = DataSourceManager()
+    manager.sources = [_source("retryfirst", first_calls, failures=1),
+                       _source("retrysecond", second_calls, beta="1.2")]
+    requests = {name: get_retry_policy(name).requests for name in ("retryfirst", "retrysecond")}
+
+    with pytest.raises(RetryLaterError) as info:
+        manager.fetch_data("AAPL", defer_retries=True)
+    error = info.value
+    assert error.source == "retryfirst"
+    assert error.attempts == {0: 1}
+    assert 1 in error.results
+
+    data = manager.fetch_data("AAPL", defer_retries=True, resume=error)
+    assert data.beta == "1.2"
+    assert len(first_calls) == 2
+    assert len(second_calls) == 1
+    # A retry is not a new request for the retry budget
+    assert get_retry_policy("retryfirst").requests == requests["retryfirst"] + 1
+    assert get_retry_policy("retrysecond").requests == requests["retrysecond"] + 1
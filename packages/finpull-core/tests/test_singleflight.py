@@ -0,0 +1,108 @@
+"""
+Tests for coalescing concurrent fetches
+"""
+
+import time
+import asyncio
+import threading
+
+from finpull_core.core.data_models import FinancialData
+from finpull_core.core.data_sources import DataSourceManager
+from finpull_core.utils.singleflight import SingleFlight
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        flight = SingleFlight()
+        leader = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == "done"
+        assert leader.cancelled()
+        assert flight.get_stats() == {'executions': 1, 'coalesced': 1, 'in_flight': 0}
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_abandoned_async_call_is_cancelled():
+    cancelled = []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        flight = SingleFlight()
+        try:
+            await asyncio.wait_for(flight.do_async("AAPL", fetch), 0.01)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.sleep(0)
+        assert flight.get_stats()['in_flight'] == 0
+
+    asyncio.run(run())
+    assert cancelled == [1]
+
+
+def test_managers_do_not_share_fetches():
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_source(ticker):
+        started.set()
+        release.wait(5)
+        return FinancialData(ticker=ticker, company_name="Replay")
+
+    def live_source(ticker):
+        return FinancialData(ticker=ticker, company_name="Live")
+
+    replay, live = DataSourceManager(), DataSourceManager()
+    replay.sources, live.sources = [slow_source], [live_source]
+    results = []
+    thread = threading.Thread(target=lambda: results.append(replay.fetch_data("AAPL")))
+    thread.start()
+    started.wait(5)
+    try:
+        assert live.fetch_data("AAPL").company_name == "Live"
+    finally:
+        release.set()
+        thread.join()
+    assert results[0].company_name == "Replay"
+
+
+def test_coalesced_callers_get_their_own_copy():
+    started = threading.Event()
+    release = threading.Event()
+
+    def source(ticker):
+        started.set()
+        release.wait(5)
+        return FinancialData(ticker=ticker)
+
+    manager = DataSourceManager()
+    manager.sources = [source]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.fetch_data("AAPL"))) for _ in range(2)]
+    threads[0].start()
+    started.wait(5)
+    threads[1].start()
+    while manager.single_flight.get_stats()['coalesced'] == 0:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results[0] is not results[1]
+    assert results[0].ticker == results[1].ticker == "AAPL"
@@ -0,0 +1,54 @@
+"""
+Tests for storage commits and the storage backends
+"""
+
+import sqlite3
+
+import pytest
+
+from finpull_core.core.storage import DataStorage
+
+
+@pytest.mark.parametrize("backend, filename", [
+    ("json", "data.json"), ("journal", "data.json"), ("sqlite", "data.db"),
+])
+def test_failed_commit_is_retried_on_next_flush(tmp_path, backend, filename):
+    path = str(tmp_path / filename)
+    storage = DataStorage(path, backend)
+    commit = storage.backend.commit
+    calls = []
+
+    def failing_once(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return commit(*args)
+
+    storage.backend.commit = failing_once
+    storage.add_ticker("AAPL")
+    assert storage._dirty
+    storage.add_ticker("MSFT")
+    storage.close()
+
+    reopened = DataStorage(path, backend, read_only=True)
+    assert reopened.tickers_list == ["AAPL", "MSFT"]
+    reopened.close()
+
+
+def test_locked_sqlite_database_keeps_pending_changes(tmp_path):
+    path = str(tmp_path / "data.db")
+    storage = DataStorage(path)
+    storage.backend._conn.execute("PRAGMA busy_timeout=0")
+
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+    storage.add_ticker("AAPL")  # database is locked
+    other.rollback()
+    other.close()
+
+    storage.add_ticker("MSFT")
+    storage.close()
+
+    reopened = DataStorage(path, read_only=True)
+    assert reopened.tickers_list == ["AAPL", "MSFT"]
+    reopened.close()
@@ -11,9 +11,8 @@ from finpull_core import (
     batch_fetch_tickers,
 )
 
-# Import additional interfaces
+# Import additional interfaces (the GUI is loaded on first access, see __getattr__)
 from .interfaces.cli import FinancialDataCLI
-from .interfaces.gui import FinancialDataGUI
 
 __all__ = [
     # Core classes (from finpull-core)
@@ -33,6 +32,13 @@ __all__ = [
     "__version__",
 ]
 
+def __getattr__(name):
+    # Importing the GUI loads tkinter, which slows down every CLI command
+    if name == "FinancialDataGUI":
+        from .interfaces.gui import FinancialDataGUI
+        return FinancialDataGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_package_info():
     """Get package information"""
     return {
@@ -14,11 +14,9 @@ HAS_CLI = True
 HAS_GUI = True
 IS_CORE_INSTALLATION = False
 
-# Conditional imports
+# Conditional imports (the GUI pulls in tkinter, so it is imported only when launched)
 if HAS_CLI:
     from .interfaces.cli import FinancialDataCLI
-if HAS_GUI:
-    from .interfaces.gui import FinancialDataGUI
 
 # Setup logging
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -39,8 +37,10 @@ def create_parser():
   finpull show --full        Show all tickers in detail
   finpull refresh            Refresh all tickers
   finpull refresh AAPL       Refresh specific ticker
+  finpull daemon             Keep data fresh, refreshing tickers as they fall due
   finpull export --csv       Export to CSV format
   finpull export data.json   Export to specific file
+  finpull bench -o out.json  Benchmark hot paths, write JSON results
 """
     )
     
@@ -82,12 +82,26 @@ def create_parser():
         refresh_parser = subparsers.add_parser('refresh', help='Refresh data (all by default)')
         refresh_parser.add_argument('tickers', nargs='*', help='Specific ticker(s) to refresh')
         
+        # Daemon command
+        daemon_parser = subparsers.add_parser('daemon', help='Refresh tickers as their data falls due')
+        daemon_parser.add_argument('--interval', type=float, default=60,
+                                   help='Refresh data older than this many minutes (default: 60)')
+        daemon_parser.add_argument('--max-rate', type=float, help='Tickers refreshed per second at most')
+        daemon_parser.add_argument('--workers', type=int, help='Refresh worker pool size')
+        daemon_parser.add_argument('--once', action='store_true',
+                                   help='Refresh what is due now and exit (for cron)')
+        
         # Stats command
         subparsers.add_parser('stats', help='Show statistics')
         
         # Clear command
         clear_parser = subparsers.add_parser('clear', help='Clear all data')
         clear_parser.add_argument('--force', action='store_true', help='Skip confirmation')
+        
+        # Bench command
+        from finpull_core.benchmarks.suite import add_arguments as add_bench_arguments
+        bench_parser = subparsers.add_parser('bench', help='Benchmark parsing, storage and export')
+        add_bench_arguments(bench_parser)
     
     return parser
 
@@ -98,26 +112,35 @@ def handle_command(args):
         print("💡 Install full version: pip install finpull")
         return 1
     
+    if args.command == 'bench':
+        # Runs on synthetic data in a scratch directory, never on the user's storage
+        from finpull_core.benchmarks.suite import run_from_args
+        from .interfaces.gui import build_row
+        return run_from_args(args, row_builder=build_row)
+    
     from finpull_core import FinancialDataScraper
     
-    scraper = FinancialDataScraper()
+    # Commands that only read cached data skip data source setup and build records on demand
+    read_only = args.command in ('show', 'export', 'stats')
+    scraper = FinancialDataScraper(read_only=read_only)
     
     try:
         if args.command == 'add':
             print(f"Adding {len(args.tickers)} ticker(s)...")
             added = 0
-            for i, tk in enumerate(args.tickers, 1):
-                print(f"🔄 [{i}/{len(args.tickers)}] Adding {tk.upper()}...")
-                try:
-                    if scraper.add_ticker(tk):
-                        print(f"✅ [{i}/{len(args.tickers)}] Added {tk.upper()}")
-                        added += 1
-                    else:
-                        print(f"ℹ️  [{i}/{len(args.tickers)}] {tk.upper()} already exists")
-                except ValueError as e:
-                    print(f"❌ [{i}/{len(args.tickers)}] Invalid ticker {tk.upper()}: {e}")
-                except Exception as e:
-                    print(f"❌ [{i}/{len(args.tickers)}] Failed to add {tk.upper()}: {e}")
+            with scraper.storage.batch():
+                for i, tk in enumerate(args.tickers, 1):
+                    print(f"🔄 [{i}/{len(args.tickers)}] Adding {tk.upper()}...")
+                    try:
+                        if scraper.add_ticker(tk):
+                            print(f"✅ [{i}/{len(args.tickers)}] Added {tk.upper()}")
+                            added += 1
+                        else:
+                            print(f"ℹ️  [{i}/{len(args.tickers)}] {tk.upper()} already exists")
+                    except ValueError as e:
+                        print(f"❌ [{i}/{len(args.tickers)}] Invalid ticker {tk.upper()}: {e}")
+                    except Exception as e:
+                        print(f"❌ [{i}/{len(args.tickers)}] Failed to add {tk.upper()}: {e}")
             
             print()
             if added:
@@ -128,14 +151,15 @@ def handle_command(args):
         elif args.command == 'remove':
             print(f"Removing {len(args.tickers)} ticker(s)...")
             removed = 0
-            for i, tk in enumerate(args.tickers, 1):
-                print(f"🔄 [{i}/{len(args.tickers)}] Removing {tk.upper()}...")
-                if scraper.has_ticker(tk):
-                    scraper.remove_ticker(tk)
-                    print(f"✅ [{i}/{len(args.tickers)}] Removed {tk.upper()}")
-                    removed += 1
-                else:
-                    print(f"❌ [{i}/{len(args.tickers)}] {tk.upper()} not found")
+            with scraper.storage.batch():
+                for i, tk in enumerate(args.tickers, 1):
+                    print(f"🔄 [{i}/{len(args.tickers)}] Removing {tk.upper()}...")
+                    if scraper.has_ticker(tk):
+                        scraper.remove_ticker(tk)
+                        print(f"✅ [{i}/{len(args.tickers)}] Removed {tk.upper()}")
+                        removed += 1
+                    else:
+                        print(f"❌ [{i}/{len(args.tickers)}] {tk.upper()} not found")
             
             print()
             if removed:
@@ -144,14 +168,17 @@ def handle_command(args):
                 print("ℹ️  No tickers were removed")
                 
         elif args.command == 'show':
-            cli = FinancialDataCLI()
-            cli.scraper = scraper
+            cli = FinancialDataCLI(scraper)
             
             if args.tickers:
                 # Show specific tickers - automatically add if not present
                 for tk in args.tickers:
                     if not scraper.has_ticker(tk):
                         print(f"🔍 {tk.upper()} not found. Fetching data...")
+                        if scraper.storage.read_only:
+                            # Adding needs write access
+                            scraper = FinancialDataScraper()
+                            cli.scraper = scraper
                         try:
                             scraper.add_ticker(tk)
                             print(f"✅ Added {tk.upper()}")
@@ -270,11 +297,11 @@ def handle_command(args):
                             print(f"❌ {tk.upper()} not tracked")
                             continue
                         print(f"🔄 Refreshing {tk.upper()}...")
-                        try:
-                            scraper.refresh_data(tk)
+                        result = scraper.refresh_data(tk).get_result(tk)
+                        if result and result.success:
                             print(f"✅ Refreshed {tk.upper()}")
-                        except Exception as e:
-                            print(f"❌ Error refreshing {tk.upper()}: {e}")
+                        else:
+                            print(f"❌ Error refreshing {tk.upper()}: {result.error if result else 'unknown error'}")
                 else:
                     # Refresh all
                     ticker_list = scraper.get_ticker_list()
@@ -284,20 +311,60 @@ def handle_command(args):
                         print(f"Refreshing {len(ticker_list)} tickers...")
                         print()
                         
-                        # Show progress for each ticker
-                        for i, tk in enumerate(ticker_list, 1):
-                            print(f"🔄 [{i}/{len(ticker_list)}] Refreshing {tk}...")
-                            try:
-                                scraper.refresh_data(tk)
-                                print(f"✅ [{i}/{len(ticker_list)}] Refreshed {tk}")
-                            except Exception as e:
-                                print(f"❌ [{i}/{len(ticker_list)}] Error refreshing {tk}: {e}")
+                        # Show progress as each ticker completes
+                        done = [0]
+                        
+                        def on_progress(tk, status):
+                            if status == "loading":
+                                return
+                            done[0] += 1
+                            if status == "complete":
+                                print(f"✅ [{done[0]}/{len(ticker_list)}] Refreshed {tk}")
+                            else:
+                                print(f"❌ [{done[0]}/{len(ticker_list)}] Error refreshing {tk}")
+                        
+                        report = scraper.refresh_data(progress_callback=on_progress)
                         
                         print()
-                        print("✅ Refresh complete")
+                        for result in report.results:
+                            if not result.success:
+                                print(f"❌ Error refreshing {result.ticker}: {result.error}")
+                        print(f"✅ Refresh complete: {len(report.successful)} refreshed, "
+                              f"{len(report.failed)} failed ({report.elapsed:.1f}s)")
             except Exception as e:
                 print(f"❌ Refresh error: {e}")
                 
+        elif args.command == 'daemon':
+            from finpull_core.core.scheduler import RefreshScheduler
+            scheduler = RefreshScheduler(scraper, interval=args.interval * 60, max_rate=args.max_rate,
+                                         max_workers=args.workers)
+            stats = scheduler.get_stats()
+            print(f"🕒 Scheduling {stats['queued']} tickers every {args.interval:g} min "
+                  f"({stats['due']} due now), queue: {stats['queue_file']}")
+            market = stats['market']
+            if market is not None and not market['open']:
+                print(f"🌙 {market['exchange']} closed until {market['next_open']}, "
+                      f"refreshing every {stats['current_interval'] / 60:.0f} min meanwhile")
+            
+            def on_report(report):
+                stats = scheduler.get_stats()
+                next_due = f"{stats['next_due_in']:.0f}s" if stats['next_due_in'] is not None else "n/a"
+                print(f"✅ {len(report.successful)} refreshed, {len(report.failed)} failed "
+                      f"({report.elapsed:.1f}s); {stats['due']} still due, next in {next_due}")
+            
+            if args.once:
+                report = scheduler.run_pending()
+                if report is None:
+                    print("ℹ️  Nothing is due")
+                else:
+                    on_report(report)
+            else:
+                print("Press Ctrl+C to stop")
+                try:
+                    scheduler.run_forever(report_callback=on_report)
+                except KeyboardInterrupt:
+                    print("\n🛑 Scheduler stopped, queue saved")
+                
         elif args.command == 'stats':
             stats = scraper.get_stats()
             print("\n📊 FinPull Statistics")
@@ -307,10 +374,14 @@ def handle_command(args):
             print(f"Stale data: {stats['stale_data']}")
             print(f"Storage file: {stats['storage_file']}")
             print(f"File size: {stats['file_size']} bytes")
-            print()
-            print("Data sources:")
-            for i, source in enumerate(stats['data_sources'], 1):
-                print(f"  {i}. {source}")
+            pool = stats.get('connection_pool', {})
+            if pool.get('requests'):
+                print(f"HTTP connections: {pool['connections_opened']} opened, {pool['connections_reused']} reused")
+            if 'data_sources' in stats:
+                print()
+                print("Data sources:")
+                for i, source in enumerate(stats['data_sources'], 1):
+                    print(f"  {i}. {source}")
                 
         elif args.command == 'clear':
             ticker_count = len(scraper.get_ticker_list())
@@ -355,6 +426,7 @@ def main():
             return 0
         elif HAS_GUI:
             try:
+                from .interfaces.gui import FinancialDataGUI
                 gui = FinancialDataGUI()
                 gui.run()
                 return 0
@@ -372,6 +444,7 @@ def main():
             print("💡 Install full version: pip install finpull")
             return 1
         try:
+            from .interfaces.gui import FinancialDataGUI
             gui = FinancialDataGUI()
             gui.run()
             return 0
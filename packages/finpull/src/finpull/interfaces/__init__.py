@@ -1,7 +1,11 @@
 from .cli import FinancialDataCLI
 
-try:
-    from .gui import FinancialDataGUI
-    __all__ = ["FinancialDataCLI", "FinancialDataGUI"]
-except ImportError:
-    __all__ = ["FinancialDataCLI"] 
\ No newline at end of file
+__all__ = ["FinancialDataCLI", "FinancialDataGUI"]
+
+
+def __getattr__(name):
+    # The GUI imports tkinter, so it is only loaded when requested
+    if name == "FinancialDataGUI":
+        from .gui import FinancialDataGUI
+        return FinancialDataGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
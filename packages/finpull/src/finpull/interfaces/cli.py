@@ -2,6 +2,7 @@ import logging
 from typing import List, Optional
 
 from finpull_core import FinancialDataScraper, get_available_features
+from finpull_core.core.numeric import parse_number
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +10,14 @@ logger = logging.getLogger(__name__)
 class FinancialDataCLI:
     """Command-line interface for the financial data scraper"""
     
-    def __init__(self):
-        self.scraper = FinancialDataScraper()
+    def __init__(self, scraper: Optional[FinancialDataScraper] = None):
+        """
+        Initialize the CLI
+        
+        Args:
+            scraper: Scraper to use (default: a new writable one)
+        """
+        self.scraper = scraper if scraper is not None else FinancialDataScraper()
         print("FinPull - Financial Data Scraper")
         print("Type 'help' for available commands")
         print()
@@ -299,11 +306,11 @@ class FinancialDataCLI:
                     print(f"❌ {tk.upper()} not tracked")
                     continue
                 print(f"🔄 Refreshing {tk.upper()}...")
-                try:
-                    self.scraper.refresh_data(tk)
+                result = self.scraper.refresh_data(tk).get_result(tk)
+                if result and result.success:
                     print(f"✅ Refreshed {tk.upper()}")
-                except Exception as e:
-                    print(f"❌ Error refreshing {tk.upper()}: {e}")
+                else:
+                    print(f"❌ Error refreshing {tk.upper()}: {result.error if result else 'unknown error'}")
         else:
             # Refresh all
             ticker_list = self.scraper.get_ticker_list()
@@ -314,17 +321,26 @@ class FinancialDataCLI:
             print(f"Refreshing {len(ticker_list)} tickers...")
             print()
             
-            # Show progress for each ticker
-            for i, tk in enumerate(ticker_list, 1):
-                print(f"🔄 [{i}/{len(ticker_list)}] Refreshing {tk}...")
-                try:
-                    self.scraper.refresh_data(tk)
-                    print(f"✅ [{i}/{len(ticker_list)}] Refreshed {tk}")
-                except Exception as e:
-                    print(f"❌ [{i}/{len(ticker_list)}] Error refreshing {tk}: {e}")
+            # Show progress as each ticker completes
+            done = [0]
+            
+            def on_progress(tk, status):
+                if status == "loading":
+                    return
+                done[0] += 1
+                if status == "complete":
+                    print(f"✅ [{done[0]}/{len(ticker_list)}] Refreshed {tk}")
+                else:
+                    print(f"❌ [{done[0]}/{len(ticker_list)}] Error refreshing {tk}")
+            
+            report = self.scraper.refresh_data(progress_callback=on_progress)
             
             print()
-            print("✅ Refresh complete")
+            for result in report.results:
+                if not result.success:
+                    print(f"❌ Error refreshing {result.ticker}: {result.error}")
+            print(f"✅ Refresh complete: {len(report.successful)} refreshed, "
+                  f"{len(report.failed)} failed ({report.elapsed:.1f}s)")
 
     def _show_all_tickers_summary(self):
         """Show summary table for all tickers"""
@@ -471,36 +487,34 @@ class FinancialDataCLI:
         if value == "N/A" or value is None:
             return "N/A"
         
-        try:
-            num = float(value)
-            if num >= 1e9:
-                return f"${num/1e9:.1f}B"
-            elif num >= 1e6:
-                return f"${num/1e6:.1f}M"
-            else:
-                return f"${num:,.0f}"
-        except:
+        num = parse_number(value)
+        if num is None:
             return str(value)
+        if abs(num) >= 1e12:
+            return f"${num/1e12:.1f}T"
+        elif abs(num) >= 1e9:
+            return f"${num/1e9:.1f}B"
+        elif abs(num) >= 1e6:
+            return f"${num/1e6:.1f}M"
+        else:
+            return f"${num:,.0f}"
     
     def _format_volume(self, value):
         """Format volume numbers for display"""
         if value == "N/A" or value is None:
             return "N/A"
         
-        try:
-            # Remove commas and convert
-            clean_value = str(value).replace(',', '')
-            num = float(clean_value)
-            if num >= 1e9:
-                return f"{num/1e9:.1f}B"
-            elif num >= 1e6:
-                return f"{num/1e6:.1f}M"
-            elif num >= 1e3:
-                return f"{num/1e3:.1f}K"
-            else:
-                return f"{num:,.0f}"
-        except:
+        num = parse_number(value)
+        if num is None:
             return str(value)
+        if num >= 1e9:
+            return f"{num/1e9:.1f}B"
+        elif num >= 1e6:
+            return f"{num/1e6:.1f}M"
+        elif num >= 1e3:
+            return f"{num/1e3:.1f}K"
+        else:
+            return f"{num:,.0f}"
     
     def _handle_export(self):
         """Handle export data command"""
@@ -558,11 +572,19 @@ class FinancialDataCLI:
         print(f"Stale data: {stats['stale_data']}")
         print(f"Storage file: {stats['storage_file']}")
         print(f"File size: {stats['file_size']} bytes")
+        pool = stats.get('connection_pool', {})
+        if pool.get('requests'):
+            print(f"HTTP connections: {pool['connections_opened']} opened, {pool['connections_reused']} reused")
         print()
         
         print("Data sources:")
-        for i, source in enumerate(stats['data_sources'], 1):
+        for i, source in enumerate(stats.get('data_sources', []), 1):
             print(f"  {i}. {source}")
+        for name, health in (stats.get('source_health') or {}).items():
+            if health['requests'] or health['state'] != 'closed':
+                latency = f"{health['latency_ms']:.0f} ms" if health['latency_ms'] is not None else "n/a"
+                print(f"  {name}: {health['state']}, health {health['score']:.0%}, "
+                      f"error rate {health['error_rate']:.0%}, latency {latency}")
         
         # Show feature availability
         features = get_available_features()
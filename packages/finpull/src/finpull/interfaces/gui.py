@@ -3,16 +3,13 @@ Tkinter GUI interface for the financial data scraper
 """
 
 import logging
-from typing import Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from finpull_core import FinancialDataScraper
-from finpull_core.utils.compatibility import HAS_TKINTER
-# Check if we have openpyxl (full package feature)
-try:
-    import openpyxl
-    HAS_OPENPYXL = True
-except ImportError:
-    HAS_OPENPYXL = False
+from finpull_core import FinancialDataScraper, FinancialData
+from finpull_core.core.numeric import FIELD_UNITS, parse_field
+from finpull_core.utils.compatibility import HAS_TKINTER, HAS_OPENPYXL
 
 if HAS_TKINTER:
     import tkinter as tk
@@ -21,6 +18,54 @@ if HAS_TKINTER:
 logger = logging.getLogger(__name__)
 
 
+STATUS_PREFIXES = ('🔄 ', '✅ ', '❌ ')
+
+
+@lru_cache(maxsize=8192)
+def format_timestamp(timestamp: str) -> str:
+    """Format a data timestamp for display (cached: most rows keep their timestamp between refreshes)"""
+    if not timestamp:
+        return "N/A"
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H:%M')
+    except:
+        return timestamp[:16] if len(timestamp) >= 16 else timestamp
+
+
+def build_row(data: FinancialData) -> List[str]:
+    """Build the Treeview values of one ticker, in column order"""
+    return [
+        data.ticker,
+        data.company_name,
+        data.sector,
+        data.price,
+        data.change_5y,
+        data.dividend_yield,
+        data.dividend_ttm,
+        data.eps_ttm,
+        data.eps_next_year,
+        data.eps_next_5y,
+        data.revenue,
+        data.revenue_growth_5y,
+        data.operating_margin,
+        data.profit_margin,
+        data.roa,
+        data.roe,
+        data.roi,
+        data.pe_ratio,
+        data.ps_ratio,
+        data.pb_ratio,
+        data.total_assets,
+        data.total_liabilities,
+        data.market_cap,
+        data.volume,
+        data.avg_volume,
+        data.beta,
+        format_timestamp(data.timestamp)
+    ]
+
+
 class FinancialDataGUI:
     """Tkinter GUI for the financial data scraper"""
     
@@ -34,6 +79,11 @@ class FinancialDataGUI:
         self.ticker_var: Optional[tk.StringVar] = None
         self.status_var: Optional[tk.StringVar] = None
         
+        # Rows on display: ticker -> Treeview item, item -> ticker, ticker -> values shown
+        self._items: Dict[str, str] = {}
+        self._item_tickers: Dict[str, str] = {}
+        self._rows: Dict[str, Tuple[str, ...]] = {}
+        
         self.setup_gui()
     
     def setup_gui(self):
@@ -302,28 +352,29 @@ class FinancialDataGUI:
         already_exists = []
         failed = []
         
-        for ticker in tickers:
-            self.set_status(f"Adding {ticker}...")
-            self.root.update()
+        with self.scraper.storage.batch():
+            for ticker in tickers:
+                self.set_status(f"Adding {ticker}...")
+                self.root.update()
             
-            # Add temporary entry with loading indicator in ticker column
-            temp_values = [f"🔄 {ticker}"] + ["Loading..."] + [""] * 25  # 1 ticker + 1 loading + 25 empty fields
-            temp_item = self.tree.insert("", "end", values=temp_values)
-            self.root.update()
+                # Add temporary entry with loading indicator in ticker column
+                temp_values = [f"🔄 {ticker}"] + ["Loading..."] + [""] * 25  # 1 ticker + 1 loading + 25 empty fields
+                temp_item = self.tree.insert("", "end", values=temp_values)
+                self.root.update()
             
-            try:
-                if self.scraper.add_ticker(ticker):
-                    added.append(ticker)
-                    # Remove temporary entry
-                    self.tree.delete(temp_item)
-                else:
-                    already_exists.append(ticker)
+                try:
+                    if self.scraper.add_ticker(ticker):
+                        added.append(ticker)
+                        # Remove temporary entry
+                        self.tree.delete(temp_item)
+                    else:
+                        already_exists.append(ticker)
+                        # Remove temporary entry
+                        self.tree.delete(temp_item)
+                except Exception as e:
+                    failed.append(f"{ticker}: {str(e)}")
                     # Remove temporary entry
                     self.tree.delete(temp_item)
-            except Exception as e:
-                failed.append(f"{ticker}: {str(e)}")
-                # Remove temporary entry
-                self.tree.delete(temp_item)
         
         # Clear input
         self.ticker_var.set("")
@@ -358,8 +409,7 @@ class FinancialDataGUI:
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        ticker = item['values'][0]
+        ticker = self._ticker_of(selection[0])
         
         # Show loading indicator
         self.update_ticker_status(ticker, "🔄 Loading...")
@@ -367,7 +417,9 @@ class FinancialDataGUI:
         self.root.update()
         
         try:
-            self.scraper.refresh_data(ticker)
+            result = self.scraper.refresh_data(ticker).get_result(ticker)
+            if result and not result.success:
+                raise Exception(result.error)
             self.update_ticker_status(ticker, "✅ Done")
             self.root.after(2000, lambda: self.update_ticker_status(ticker, ""))  # Clear after 2 seconds
             self.refresh_display()
@@ -381,23 +433,30 @@ class FinancialDataGUI:
     
     def update_ticker_status(self, ticker: str, status: str):
         """Update the ticker column to show loading/completion status"""
-        for item in self.tree.get_children():
-            item_data = self.tree.item(item)
-            values = list(item_data['values'])
-            if values[0].replace('🔄 ', '').replace('✅ ', '').replace('❌ ', '') == ticker:
-                # Update the ticker column (first column) with status symbol
-                if status == "🔄 Loading...":
-                    values[0] = f"🔄 {ticker}"
-                elif status == "✅ Done":
-                    values[0] = f"✅ {ticker}"
-                elif status == "❌ Error":
-                    values[0] = f"❌ {ticker}"
-                else:
-                    # Clear status - show just ticker
-                    values[0] = ticker
-                
-                self.tree.item(item, values=values)
-                break
+        item = self._items.get(ticker)
+        if item is None or not self.tree.exists(item):
+            return
+        
+        # Update the ticker column (first column) with status symbol
+        if status == "🔄 Loading...":
+            label = f"🔄 {ticker}"
+        elif status == "✅ Done":
+            label = f"✅ {ticker}"
+        elif status == "❌ Error":
+            label = f"❌ {ticker}"
+        else:
+            # Clear status - show just ticker
+            label = ticker
+        self.tree.set(item, "ticker", label)
+    
+    def _ticker_of(self, item: str) -> str:
+        """Get the ticker of a row, without any status symbol"""
+        ticker = self._item_tickers.get(item)
+        if ticker is None:
+            ticker = str(self.tree.set(item, "ticker"))
+            for prefix in STATUS_PREFIXES:
+                ticker = ticker.replace(prefix, '')
+        return ticker
     
     def remove_selected(self):
         """Remove selected ticker"""
@@ -405,8 +464,7 @@ class FinancialDataGUI:
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        ticker = item['values'][0]
+        ticker = self._ticker_of(selection[0])
         
         if messagebox.askyesno("Confirm", f"Remove {ticker} from tracking?"):
             self.scraper.remove_ticker(ticker)
@@ -420,10 +478,7 @@ class FinancialDataGUI:
             return
         
         # Get all selected tickers
-        tickers = []
-        for item_id in selection:
-            item = self.tree.item(item_id)
-            tickers.append(item['values'][0])
+        tickers = [self._ticker_of(item_id) for item_id in selection]
         
         if len(tickers) == 1:
             message = f"Remove {tickers[0]} from tracking?"
@@ -434,12 +489,13 @@ class FinancialDataGUI:
             removed = []
             failed = []
             
-            for ticker in tickers:
-                try:
-                    self.scraper.remove_ticker(ticker)
-                    removed.append(ticker)
-                except Exception as e:
-                    failed.append(f"{ticker}: {str(e)}")
+            with self.scraper.storage.batch():
+                for ticker in tickers:
+                    try:
+                        self.scraper.remove_ticker(ticker)
+                        removed.append(ticker)
+                    except Exception as e:
+                        failed.append(f"{ticker}: {str(e)}")
             
             self.refresh_display()
             
@@ -455,8 +511,7 @@ class FinancialDataGUI:
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        ticker = item['values'][0]
+        ticker = self._ticker_of(selection[0])
         
         data = self.scraper.get_ticker_data(ticker)
         if not data:
@@ -509,17 +564,17 @@ class FinancialDataGUI:
         for ticker in ticker_list:
             self.update_ticker_status(ticker, "🔄 Loading...")
         
+        def on_progress(ticker, status):
+            # Update UI in main thread
+            if status == "complete":
+                self.root.after(0, lambda t=ticker: self.update_ticker_status(t, "✅ Done"))
+            elif status == "error":
+                self.root.after(0, lambda t=ticker: self.update_ticker_status(t, "❌ Error"))
+        
         def refresh_worker():
             try:
-                # Refresh each ticker individually to show progress
-                for ticker in ticker_list:
-                    try:
-                        self.scraper.refresh_data(ticker)
-                        # Update UI in main thread
-                        self.root.after(0, lambda t=ticker: self.update_ticker_status(t, "✅ Done"))
-                    except Exception as e:
-                        # Update UI in main thread
-                        self.root.after(0, lambda t=ticker: self.update_ticker_status(t, "❌ Error"))
+                # Refresh tickers concurrently, reporting progress as each completes
+                self.scraper.refresh_data(progress_callback=on_progress)
                 
                 # Update UI in main thread
                 self.root.after(0, lambda: self._refresh_complete(len(ticker_list)))
@@ -548,13 +603,9 @@ class FinancialDataGUI:
     
     def _clear_all_status(self):
         """Clear all status indicators from ticker column"""
-        for item in self.tree.get_children():
-            item_data = self.tree.item(item)
-            values = list(item_data['values'])
-            # Remove status symbols from ticker column
-            ticker = values[0].replace('🔄 ', '').replace('✅ ', '').replace('❌ ', '')
-            values[0] = ticker
-            self.tree.item(item, values=values)
+        for ticker, item in self._items.items():
+            if self.tree.exists(item):
+                self.tree.set(item, "ticker", ticker)
     
     def _refresh_error(self, error_msg):
         """Handle refresh error"""
@@ -562,13 +613,9 @@ class FinancialDataGUI:
         self._enable_refresh_button()
         
         # Clear loading indicators and show error for items that were loading
-        for item in self.tree.get_children():
-            item_data = self.tree.item(item)
-            values = list(item_data['values'])
-            if values[0].startswith("🔄 "):  # Only update if it was loading
-                ticker = values[0].replace('🔄 ', '')
-                values[0] = f"❌ {ticker}"
-                self.tree.item(item, values=values)
+        for ticker, item in self._items.items():
+            if self.tree.exists(item) and str(self.tree.set(item, "ticker")).startswith("🔄 "):
+                self.tree.set(item, "ticker", f"❌ {ticker}")
         
         # Clear error indicators after 2 seconds
         self.root.after(2000, self._clear_all_status)
@@ -628,54 +675,48 @@ class FinancialDataGUI:
             messagebox.showerror("Error", f"Cleanup failed: {str(e)}")
     
     def refresh_display(self):
-        """Refresh the data display"""
-        # Clear existing items
-        if self.tree:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Add current data
-            for data in self.scraper.get_all_data():
-                # Format timestamp for display
-                timestamp_display = "N/A"
-                if data.timestamp:
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(data.timestamp.replace('Z', '+00:00'))
-                        timestamp_display = dt.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        timestamp_display = data.timestamp[:16] if len(data.timestamp) >= 16 else data.timestamp
-                
-                values = [
-                    data.ticker,
-                    data.company_name,
-                    data.sector,
-                    data.price,
-                    data.change_5y,
-                    data.dividend_yield,
-                    data.dividend_ttm,
-                    data.eps_ttm,
-                    data.eps_next_year,
-                    data.eps_next_5y,
-                    data.revenue,
-                    data.revenue_growth_5y,
-                    data.operating_margin,
-                    data.profit_margin,
-                    data.roa,
-                    data.roe,
-                    data.roi,
-                    data.pe_ratio,
-                    data.ps_ratio,
-                    data.pb_ratio,
-                    data.total_assets,
-                    data.total_liabilities,
-                    data.market_cap,
-                    data.volume,
-                    data.avg_volume,
-                    data.beta,
-                    timestamp_display
-                ]
-                self.tree.insert("", "end", values=values)
+        """
+        Refresh the data display
+        
+        Only rows of added or removed tickers are inserted or deleted, and only
+        cells whose value changed are updated, so the sort order, selection and
+        scroll position are kept.
+        """
+        if not self.tree:
+            return
+        
+        rows = {data.ticker: tuple(build_row(data)) for data in self.scraper.get_all_data()}
+        columns = self.tree['columns']
+        
+        # Delete rows of tickers that are gone
+        removed = [ticker for ticker in self._items if ticker not in rows]
+        if removed:
+            items = [self._items.pop(ticker) for ticker in removed]
+            for item, ticker in zip(items, removed):
+                self._item_tickers.pop(item, None)
+                self._rows.pop(ticker, None)
+            self.tree.delete(*[item for item in items if self.tree.exists(item)])
+        
+        changed = False
+        for ticker, row in rows.items():
+            item = self._items.get(ticker)
+            if item is None:
+                item = self.tree.insert("", "end", values=row)
+                self._items[ticker] = item
+                self._item_tickers[item] = ticker
+                changed = True
+            else:
+                shown = self._rows.get(ticker, ())
+                # The ticker column is left alone so status symbols stay until cleared
+                for index in range(1, len(row)):
+                    if index >= len(shown) or shown[index] != row[index]:
+                        self.tree.set(item, columns[index], row[index])
+                        changed = True
+            self._rows[ticker] = row
+        
+        # New and changed rows go where the current sort puts them
+        if changed and self.sort_column:
+            self._apply_sort()
         
         self.update_ticker_count()
     
@@ -837,38 +878,41 @@ Built with Python and Tkinter
             self.sort_reverse = False
         
         self.sort_column = column
+        self._apply_sort()
         
-        # Get all items with their values
-        items = []
-        for item in self.tree.get_children():
-            values = self.tree.item(item)['values']
-            items.append((item, values))
-        
-        # Sort items based on column
-        column_index = list(self.tree['columns']).index(column)
+        # Update column header to show sort direction
+        for col in self.tree['columns']:
+            if col == column:
+                direction = ' ↓' if self.sort_reverse else ' ↑'
+                current_text = self.tree.heading(col)['text']
+                # Remove existing sort indicators
+                clean_text = current_text.replace(' ↑', '').replace(' ↓', '')
+                self.tree.heading(col, text=clean_text + direction)
+            else:
+                # Remove sort indicators from other columns
+                current_text = self.tree.heading(col)['text']
+                clean_text = current_text.replace(' ↑', '').replace(' ↓', '')
+                self.tree.heading(col, text=clean_text) 
+    
+    def _apply_sort(self):
+        """Order the rows by the current sort column and direction"""
+        column = self.sort_column
+        items = [(item, self.tree.set(item, column)) for item in self.tree.get_children()]
         
         def sort_key(item):
-            value = item[1][column_index]
+            value = item[1]
             
             # Handle different data types for proper sorting
             if column == 'ticker':
                 # For ticker column, remove status symbols for sorting
                 clean_ticker = str(value).replace('🔄 ', '').replace('✅ ', '').replace('❌ ', '')
                 return clean_ticker.lower()
-            elif column in ['price', 'change_5y', 'dividend_yield', 'dividend_ttm', 'eps_ttm', 
-                         'eps_next_year', 'eps_next_5y', 'revenue', 'revenue_growth_5y', 
-                         'operating_margin', 'profit_margin', 'roa', 'roe', 'roi', 
-                         'pe_ratio', 'ps_ratio', 'pb_ratio', 'total_assets', 'total_liabilities',
-                         'market_cap', 'volume', 'avg_volume', 'beta']:
-                # Numeric columns - extract numbers
-                try:
-                    # Remove currency symbols, commas, and percentage signs
-                    clean_value = str(value).replace('$', '').replace(',', '').replace('%', '').replace('B', '').replace('M', '').replace('K', '')
-                    if clean_value == 'N/A' or clean_value == '':
-                        return float('-inf') if not self.sort_reverse else float('inf')
-                    return float(clean_value)
-                except (ValueError, TypeError):
+            elif column in FIELD_UNITS:
+                # Numeric columns - compare canonical values so 2.9B sorts above 2.9M
+                number = parse_field(column, value)
+                if number is None:
                     return float('-inf') if not self.sort_reverse else float('inf')
+                return number
             elif column == 'timestamp':
                 # Date/time column
                 if value == 'N/A' or value == '':
@@ -880,20 +924,10 @@ Built with Python and Tkinter
         
         items.sort(key=sort_key, reverse=self.sort_reverse)
         
-        # Reorder items in treeview
-        for index, (item, values) in enumerate(items):
-            self.tree.move(item, '', index)
-        
-        # Update column header to show sort direction
-        for col in self.tree['columns']:
-            if col == column:
-                direction = ' ↓' if self.sort_reverse else ' ↑'
-                current_text = self.tree.heading(col)['text']
-                # Remove existing sort indicators
-                clean_text = current_text.replace(' ↑', '').replace(' ↓', '')
-                self.tree.heading(col, text=clean_text + direction)
-            else:
-                # Remove sort indicators from other columns
-                current_text = self.tree.heading(col)['text']
-                clean_text = current_text.replace(' ↑', '').replace(' ↓', '')
-                self.tree.heading(col, text=clean_text) 
\ No newline at end of file
+        # Reorder items in treeview, moving only those out of place
+        current = list(self.tree.get_children())
+        for index, (item, value) in enumerate(items):
+            if current[index] != item:
+                self.tree.move(item, '', index)
+                current.remove(item)
+                current.insert(index, item)